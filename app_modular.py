@@ -2,31 +2,48 @@
 Aplicación principal Flask - Versión Modular
 """
 
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, render_template as flask_render_template, jsonify, request, g
+import click
+import hashlib
 import os
 import logging
-from datetime import datetime
+import time
+from datetime import datetime, timezone
 
 # Importar módulos propios
 from config.development import DevelopmentConfig
-from services.data_service import DataService
-from services.google_sheets_service import GoogleSheetsConnector
-from services.chart_service import ChartGenerator
-
-# Configurar logging
-import os
-os.makedirs('logs', exist_ok=True)
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('logs/app.log'),
-        logging.StreamHandler()
-    ]
+from services.data_service import create_data_service
+from services.google_sheets_service import (
+    DEFAULT_SHEET_ID,
+    CONSUELO_SHEET_ID,
+    CONSUELO_CREDENTIALS_FILE,
+    CONSUELO_CREDENTIALS_ENV_VAR
 )
+from services.connector_registry import registry as connector_registry
+from services.cache_service import ResultCache
+from services.snapshot_store import create_snapshot_store
+from services.sheet_sources import create_sheet_source, save_recorded_values
+from services.refresh_scheduler import RefreshScheduler, SheetJob
+from services.delta_sync import DeltaSync
+from services.survey_service import build_el_consuelo_summary
+from services.query_service import ActivityIndex, parse_query_args
+from services.chart_service import ChartGenerator
+from services import chart_cache as chart_cache_module
+from services.chart_cache import ChartCache
+from services.metrics import SIZE_BUCKETS, metrics, server_timing_header
+from services.json_provider import STREAM_CHUNK_SIZE, FastJSONProvider, dumps_bytes, iter_chunks
+from utils.import_report import format_report, run_import_report
+from utils.logging_utils import configure_logging
 
 logger = logging.getLogger(__name__)
 
+# Versión del formato de las respuestas de las APIs de datos; forma parte del
+# ETag, así que incrementarla al cambiar su estructura invalida las copias de los clientes
+API_FORMAT_VERSION = 2
+
+# Render de plantillas medido como etapa 'render'
+render_template = metrics.timed('render')(flask_render_template)
+
 def create_app(config_class=DevelopmentConfig):
     """Factory function para crear la aplicación Flask"""
     
@@ -34,6 +51,18 @@ def create_app(config_class=DevelopmentConfig):
     # Configurar la aplicación
     app.config.from_object(config_class)
     
+    # Serialización JSON con orjson cuando está disponible
+    if app.config.get('FAST_JSON', True):
+        app.json = FastJSONProvider(app)
+    
+    # Configurar logging (escritura en un hilo aparte)
+    configure_logging(
+        level=app.config.get('LOG_LEVEL', 'INFO'),
+        log_file=app.config.get('LOG_FILE', 'logs/app.log'),
+        rate_limit_burst=app.config.get('LOG_RATE_LIMIT_BURST', 5),
+        rate_limit_seconds=app.config.get('LOG_RATE_LIMIT_SECONDS', 60)
+    )
+    
     # Configuración para producción
     if app.config.get('ENV') == 'production':
         app.config['DEBUG'] = False
@@ -43,9 +72,175 @@ def create_app(config_class=DevelopmentConfig):
         app.config['TESTING'] = False
     
     # Inicializar servicios
-    data_service = DataService()
-    sheets_connector = GoogleSheetsConnector()
+    data_service = create_data_service(app.config)
+    connector_registry.token_refresh_interval = app.config.get('SHEETS_TOKEN_REFRESH_SECONDS', 300)
+    snapshot_store = create_snapshot_store(app.config)
+    sheet_source = create_sheet_source(app.config)
+    connector_registry.configure(snapshot_store=snapshot_store, sheet_source=sheet_source)
+    sheets_connector = connector_registry.get(
+        cache_ttl=app.config.get('SHEETS_CACHE_TTL_SECONDS'),
+        snapshot_store=snapshot_store, sheet_source=sheet_source
+    )
+    
+    def get_consuelo_connector():
+        """Conector compartido con las credenciales de El Consuelo"""
+        return connector_registry.get(
+            credentials_file=CONSUELO_CREDENTIALS_FILE,
+            credentials_env_var=CONSUELO_CREDENTIALS_ENV_VAR,
+            cache_ttl=app.config.get('SHEETS_CACHE_TTL_SECONDS'),
+            snapshot_store=snapshot_store, sheet_source=sheet_source
+        )
     chart_generator = ChartGenerator()
+    chart_cache = ChartCache(
+        max_entries=app.config.get('CHART_CACHE_SIZE', 32),
+        directory=app.config.get('CHART_CACHE_DIR')
+    )
+    chart_renderers = {
+        'participacion': chart_generator.generate_participacion_chart,
+        'diario': chart_generator.generate_diario_chart
+    }
+    
+    # Programador que pre-descarga las hojas fuera de las peticiones
+    intervals = app.config.get('SHEET_REFRESH_INTERVALS', {})
+    refresh_scheduler = RefreshScheduler(
+        jitter_seconds=app.config.get('SCHEDULER_JITTER_SECONDS', 30),
+        max_backoff_seconds=app.config.get('SCHEDULER_MAX_BACKOFF_SECONDS', 1800),
+        processed_cache_size=app.config.get('PROCESSED_CACHE_SIZE', 8)
+    )
+    incremental_sync = app.config.get('INCREMENTAL_SYNC', False)
+    if incremental_sync:
+        activities_processor = DeltaSync(data_service).sync
+    else:
+        activities_processor = data_service.process_raw_data
+    # DeltaSync tiene estado: su resultado no se memoiza por huella
+    refresh_scheduler.add_job(SheetJob(
+        'actividades', DEFAULT_SHEET_ID, lambda: sheets_connector,
+        intervals.get('actividades', 300), processor=activities_processor,
+        cache_results=not incremental_sync
+    ))
+    refresh_scheduler.add_job(SheetJob(
+        'el_consuelo', CONSUELO_SHEET_ID, get_consuelo_connector,
+        intervals.get('el_consuelo', 600), processor=build_el_consuelo_summary
+    ))
+    app.extensions['refresh_scheduler'] = refresh_scheduler
+    
+    def get_chart(chart_type, snapshot):
+        """JSON serializado de un gráfico de actividades para la versión del snapshot"""
+        render = chart_renderers[chart_type]
+        return chart_cache.get_or_render(
+            chart_type, snapshot.fingerprint, lambda: render(snapshot.processed['data'])
+        )
+    
+    def warm_charts(snapshot):
+        """Genera los gráficos de actividades al publicarse datos nuevos"""
+        if snapshot.name != 'actividades':
+            return
+        for chart_type in chart_renderers:
+            get_chart(chart_type, snapshot)
+    
+    refresh_scheduler.add_listener(warm_charts)
+    if app.config.get('SCHEDULER_ENABLED', False):
+        refresh_scheduler.start()
+    
+    # Índices de consultas de /api/data, reconstruidos solo cuando cambian los datos
+    index_cache = ResultCache(max_entries=2)
+    
+    def get_activity_index(snapshot):
+        """Índice en memoria de un snapshot publicado de actividades"""
+        if snapshot is None:
+            return ActivityIndex(data_service.process_raw_data([]))
+        return index_cache.get_or_compute(snapshot.fingerprint, lambda: ActivityIndex(snapshot.processed))
+    
+    def snapshot_etag(snapshot, *variant):
+        """
+        ETag de una respuesta derivada de un snapshot
+        
+        Se basa en la huella del contenido, igual en todos los workers, y en la
+        versión del formato de la API; `variant` distingue respuestas distintas
+        de la misma ruta (p. ej. una consulta o la versión de los gráficos).
+        """
+        digest = hashlib.blake2b(repr((API_FORMAT_VERSION, variant)).encode('utf-8'), digest_size=8).hexdigest()
+        return f"{snapshot.fingerprint}-{digest}"
+    
+    def chart_etag(snapshot, chart_type):
+        """ETag de un gráfico: cambia también con la versión del formato de los gráficos"""
+        return snapshot_etag(snapshot, 'chart', chart_type, chart_cache_module.CHART_FORMAT_VERSION)
+    
+    def with_etag(response, etag, weak=False):
+        """
+        Agrega el ETag y obliga a revalidar en cada uso
+        
+        `weak` se usa en las respuestas que incluyen la hora de publicación del
+        worker: el contenido es equivalente entre workers pero no los bytes.
+        """
+        response.set_etag(etag, weak=weak)
+        response.cache_control.no_cache = True
+        return response
+    
+    # Cuerpos JSON de snapshots ya serializados, por ruta y versión
+    payload_cache = ResultCache(max_entries=app.config.get('PAYLOAD_CACHE_SIZE', 4))
+    stream_chunk_size = app.config.get('STREAM_CHUNK_SIZE', STREAM_CHUNK_SIZE)
+    
+    def snapshot_response(name, etag, build, weak=False):
+        """
+        Respuesta JSON de un snapshot, serializada una sola vez por versión
+        
+        `build` arma el objeto solo si el cuerpo no está en caché; los bytes se
+        transmiten en fragmentos con Content-Length.
+        """
+        body = payload_cache.get_or_compute((name, etag), lambda: dumps_bytes(app.json, build()))
+        response = app.response_class(iter_chunks(body, stream_chunk_size), mimetype='application/json')
+        response.content_length = len(body)
+        return with_etag(response, etag, weak=weak)
+    
+    def not_modified(etag, weak=False):
+        """Respuesta 304 si el cliente ya tiene esta versión (If-None-Match); None si no"""
+        if request.if_none_match and request.if_none_match.contains_weak(etag):
+            return with_etag(app.response_class(status=304), etag, weak=weak)
+        return None
+    
+    # Contadores de las cachés exportados en /metrics
+    metrics.register_cache('processing', refresh_scheduler.processed_cache.stats)
+    metrics.register_cache('index', index_cache.stats)
+    metrics.register_cache('chart', chart_cache.stats)
+    metrics.register_cache('payload', payload_cache.stats)
+    
+    if app.config.get('METRICS_ENABLED', True):
+        server_timing = app.config.get('SERVER_TIMING_ENABLED', True)
+        
+        @app.before_request
+        def start_request_metrics():
+            g.metrics_start = time.perf_counter()
+            g.metrics_token = metrics.begin_request()
+        
+        @app.after_request
+        def record_request_metrics(response):
+            token = g.pop('metrics_token', None)
+            if token is None:
+                return response
+            elapsed = time.perf_counter() - g.metrics_start
+            stages = metrics.end_request(token)
+            endpoint = request.endpoint or 'sin_ruta'
+            metrics.observe('request_duration_seconds', elapsed, {'endpoint': endpoint},
+                            help_text='Duración de las peticiones por ruta')
+            if response.content_length is not None:
+                metrics.observe('response_size_bytes', response.content_length, {'endpoint': endpoint},
+                                buckets=SIZE_BUCKETS, help_text='Tamaño de las respuestas por ruta')
+            if server_timing:
+                response.headers['Server-Timing'] = server_timing_header(stages, elapsed)
+            return response
+        
+        @app.teardown_request
+        def discard_request_metrics(error=None):
+            token = g.pop('metrics_token', None)
+            if token is not None:
+                metrics.end_request(token)
+        
+        @app.route('/metrics')
+        def metrics_endpoint():
+            """Métricas de rendimiento en formato de texto de Prometheus"""
+            return app.response_class(metrics.render_prometheus(),
+                                      mimetype='text/plain; version=0.0.4')
     
     @app.route('/')
     def index():
@@ -84,314 +279,18 @@ def create_app(config_class=DevelopmentConfig):
     
     @app.route('/el-consuelo')
     def el_consuelo():
-        """Ruta para el dashboard del Barrio El Consuelo"""
+        """
+        Ruta para el dashboard del Barrio El Consuelo
+
+        La página se entrega de inmediato; las gráficas se hidratan desde
+        /api/el-consuelo/summary. Solo se usa un resumen ya publicado, sin
+        consultar Google durante la petición.
+        """
         try:
             logger.info("Accediendo al dashboard de El Consuelo")
-            sheet_id = '1265C_6-JZ-ZzeUD4RRZ1cKoVYOVvysztvWLx63dh2TM'
-            credentials_file = 'credentials/credentials_consuelo.json'
-            sheets_connector = GoogleSheetsConnector(credentials_file=credentials_file, credentials_env_var="GOOGLE_CREDENTIALS_CONSUELO_JSON")
-            raw_data = sheets_connector.get_data(sheet_id)
-            num_encuestas = len(raw_data)
-            # Extraer datos para las gráficas de torta
-            sexo_counts = {}
-            nivel_educativo_counts = {}
-            tiempo_reside_counts = {}
-            tiempo_counts = {}  # Inicializar tiempo_counts aquí
-            for row in raw_data:
-                sexo = row.get('Sexo', '').strip()
-                nivel = row.get('Nivel educativo', '').strip()
-                tiempo = row.get('¿Hace cuanto tiempo reside en el barrio?', '').strip()
-                if sexo:
-                    sexo_counts[sexo] = sexo_counts.get(sexo, 0) + 1
-                if nivel:
-                    nivel_educativo_counts[nivel] = nivel_educativo_counts.get(nivel, 0) + 1
-                if tiempo:
-                    tiempo_reside_counts[tiempo] = tiempo_reside_counts.get(tiempo, 0) + 1
-            # Procesar columna O (limpieza general) para gráfica de torta
-            limpieza_col = 'Como calificaria la limpieza general del barrio'
-            limpieza_counts = {}
-            # Procesar solo filas O2 a O440 (registros 1 a 439 en raw_data)
-            for i, row in enumerate(raw_data[0:442], start=2):  # Empezar desde índice 0 (fila O2) hasta 442 (incluye 441)
-                valor = row.get(limpieza_col, '').strip()
-                if valor in ['1', '2', '3', '4', '5']:
-                    limpieza_counts[valor] = limpieza_counts.get(valor, 0) + 1
-                elif valor:
-                    limpieza_counts['No responde'] = limpieza_counts.get('No responde', 0) + 1
-
-            # Si limpieza_counts está vacío, mostrar mensaje de depuración
-            if not limpieza_counts:
-                print('ADVERTENCIA: No se encontraron datos en la columna de limpieza')
-                print('Nombre de columna buscado:', limpieza_col)
-                print('Headers disponibles:', list(raw_data[0].keys()) if raw_data else 'No hay datos')
-
-            # Depuración: imprimir datos de limpieza
-            print("Limpieza counts:", limpieza_counts)
-            print("Limpieza counts keys:", list(limpieza_counts.keys()))
-            print("Limpieza counts values:", list(limpieza_counts.values()))
-            print("Total de filas procesadas (O2-O440):", len(raw_data[0:442]))
-            print("Total de registros en raw_data:", len(raw_data))
-            print("Rango procesado: desde índice 0 hasta", len(raw_data[0:442]), "CORREGIDO - 439 REGISTROS - FORZADO")
-            
-            # Procesar columna P (frecuencia residuos) para gráfica de barras
-            residuos_col = '¿Con qué frecuencia observa residuos en las calles o zonas comunes?'
-            residuos_counts = {}
-            # Procesar solo filas P2 a P440 (registros 1 a 439 en raw_data)
-            for i, row in enumerate(raw_data[0:442], start=2):  # Empezar desde índice 0 (fila P2) hasta 442 (incluye 441)
-                valor = row.get(residuos_col, '').strip()
-                if valor:
-                    residuos_counts[valor] = residuos_counts.get(valor, 0) + 1
-            
-            print(f"Residuos counts: {residuos_counts}")
-            print(f"Residuos counts keys: {list(residuos_counts.keys())}")
-            print(f"Residuos counts values: {list(residuos_counts.values())}")
-            print(f"Total de filas procesadas para residuos: {len(raw_data[0:442])}")
-            
-            # Procesar columna Q (afecta imagen del barrio) para gráfica de barras
-            imagen_col = '¿Considera que la acumulación de residuos afecta la imagen del barrio?'
-            # Procesar columna Q (afecta imagen del barrio) para gráfica de barras
-            for i, row in enumerate(raw_data[0:442], start=2):  # Empezar desde índice 0 (fila Q2) hasta 442 (incluye 441)
-                valor = row.get(imagen_col, '').strip()
-                if valor:
-                    tiempo_counts[valor] = tiempo_counts.get(valor, 0) + 1
-            
-            print(f"Imagen counts: {tiempo_counts}")
-            print(f"Imagen counts keys: {list(tiempo_counts.keys())}")
-            print(f"Imagen counts values: {list(tiempo_counts.values())}")
-            print(f"Total de filas procesadas para imagen: {len(raw_data[0:442])}")
-            
-            # Procesar columna R (residuos y seguridad) para gráfica de barras
-            seguridad_col = '¿Considera que el tema de residuos esta relacionado con el tema de seguridad del barrio?'
-            seguridad_counts = {}
-            # Procesar columna R (residuos y seguridad) para gráfica de barras
-            for i, row in enumerate(raw_data[0:442], start=2):  # Empezar desde índice 0 (fila R2) hasta 442 (incluye 441)
-                valor = row.get(seguridad_col, '').strip()
-                if valor:
-                    seguridad_counts[valor] = seguridad_counts.get(valor, 0) + 1
-            
-            print(f"Seguridad counts: {seguridad_counts}")
-            print(f"Seguridad counts keys: {list(seguridad_counts.keys())}")
-            print(f"Seguridad counts values: {list(seguridad_counts.values())}")
-            print(f"Total de filas procesadas para seguridad: {len(raw_data[0:442])}")
-            
-            # Procesar columna S (afecta calidad de vida) para gráfica de barras
-            calidad_vida_col = '¿Considera que la acumulación de residuos afecta su calidad de vida?'
-            calidad_vida_counts = {}
-            # Procesar solo filas S2 a S440 (registros 1 a 439 en raw_data)
-            for i, row in enumerate(raw_data[0:442], start=2):  # Empezar desde índice 0 (fila S2) hasta 442 (incluye 441)
-                valor = row.get(calidad_vida_col, '').strip()
-                if valor:
-                    calidad_vida_counts[valor] = calidad_vida_counts.get(valor, 0) + 1
-            
-            print(f"Calidad de vida counts: {calidad_vida_counts}")
-            print(f"Calidad de vida counts keys: {list(calidad_vida_counts.keys())}")
-            print(f"Calidad de vida counts values: {list(calidad_vida_counts.values())}")
-            print(f"Total de filas procesadas para calidad de vida: {len(raw_data[0:442])}")
-            
-            # Procesar columna T (separación de residuos) para gráfica de barras
-            separacion_col = '¿Separa los residuos en su casa (orgánicos, reciclables, no reciclables)?'
-            separacion_counts = {}
-            # Procesar solo filas T2 a T440 (registros 1 a 439 en raw_data)
-            for i, row in enumerate(raw_data[0:442], start=2):  # Empezar desde índice 0 (fila T2) hasta 442 (incluye 441)
-                valor = row.get(separacion_col, '').strip()
-                if valor:
-                    separacion_counts[valor] = separacion_counts.get(valor, 0) + 1
-            
-            print(f"Separación counts: {separacion_counts}")
-            print(f"Separación counts keys: {list(separacion_counts.keys())}")
-            print(f"Separación counts values: {list(separacion_counts.values())}")
-            print(f"Total de filas procesadas para separación: {len(raw_data[0:442])}")
-            
-            # Procesar columna U (conoce horario recolección) para gráfica de barras
-            horario_col = '¿Conoce el horario de recolección de residuos en el barrio?'
-            horario_counts = {}
-            # Procesar solo filas U2 a U440 (registros 1 a 439 en raw_data)
-            for i, row in enumerate(raw_data[0:442], start=2):  # Empezar desde índice 0 (fila U2) hasta 442 (incluye 441)
-                valor = row.get(horario_col, '').strip()
-                if valor:
-                    horario_counts[valor] = horario_counts.get(valor, 0) + 1
-            
-            print(f"Horario counts: {horario_counts}")
-            print(f"Horario counts keys: {list(horario_counts.keys())}")
-            print(f"Horario counts values: {list(horario_counts.values())}")
-            print(f"Total de filas procesadas para horario: {len(raw_data[0:442])}")
-            
-            # Procesar columna V (saca residuos en horarios) para gráfica de barras
-            saca_horarios_col = '¿Saca los residuos en los horarios establecidos?'
-            saca_horarios_counts = {}
-            # Procesar solo filas V2 a V440 (registros 1 a 439 en raw_data)
-            for i, row in enumerate(raw_data[0:442], start=2):  # Empezar desde índice 0 (fila V2) hasta 442 (incluye 441)
-                valor = row.get(saca_horarios_col, '').strip()
-                if valor:
-                    saca_horarios_counts[valor] = saca_horarios_counts.get(valor, 0) + 1
-            
-            print(f"Saca horarios counts: {saca_horarios_counts}")
-            print(f"Saca horarios counts keys: {list(saca_horarios_counts.keys())}")
-            print(f"Saca horarios counts values: {list(saca_horarios_counts.values())}")
-            print(f"Total de filas procesadas para saca horarios: {len(raw_data[0:442])}")
-            
-            # Procesar columna W (entrega a recuperador) para gráfica de barras
-            recuperador_col = '¿Entrega sus residuos aprovechables a un recuperador de oficio?'
-            recuperador_counts = {}
-            # Procesar solo filas W2 a W440 (registros 1 a 439 en raw_data)
-            for i, row in enumerate(raw_data[0:442], start=2):  # Empezar desde índice 0 (fila W2) hasta 442 (incluye 441)
-                valor = row.get(recuperador_col, '').strip()
-                if valor:
-                    recuperador_counts[valor] = recuperador_counts.get(valor, 0) + 1
-            
-            print(f"Recuperador counts: {recuperador_counts}")
-            print(f"Recuperador counts keys: {list(recuperador_counts.keys())}")
-            print(f"Recuperador counts values: {list(recuperador_counts.values())}")
-            print(f"Total de filas procesadas para recuperador: {len(raw_data[0:442])}")
-            
-            # Procesar columna X (lugar de disposición) para gráfica de barras
-            lugar_col = '¿En que lugar dispone los residuos?'
-            lugar_counts = {}
-            # Procesar solo filas X2 a X440 (registros 1 a 439 en raw_data)
-            for i, row in enumerate(raw_data[0:442], start=2):  # Empezar desde índice 0 (fila X2) hasta 442 (incluye 441)
-                valor = row.get(lugar_col, '').strip()
-                if valor:
-                    lugar_counts[valor] = lugar_counts.get(valor, 0) + 1
-            
-            print(f"Lugar counts: {lugar_counts}")
-            print(f"Lugar counts keys: {list(lugar_counts.keys())}")
-            print(f"Lugar counts values: {list(lugar_counts.values())}")
-            print(f"Total de filas procesadas para lugar: {len(raw_data[0:442])}")
-            
-            # Procesar columna Y (calificación del servicio) para gráfica de barras
-            servicio_col = '¿Cómo calificaría la operación del servicio de aseo de Promoambiental Distrito S.A.S?'
-            servicio_counts = {}
-            # Procesar solo filas Y2 a Y440 (registros 1 a 439 en raw_data)
-            for i, row in enumerate(raw_data[0:442], start=2):  # Empezar desde índice 0 (fila Y2) hasta 442 (incluye 441)
-                valor = row.get(servicio_col, '').strip()
-                if valor:
-                    servicio_counts[valor] = servicio_counts.get(valor, 0) + 1
-            
-            print(f"Servicio counts: {servicio_counts}")
-            print(f"Servicio counts keys: {list(servicio_counts.keys())}")
-            print(f"Servicio counts values: {list(servicio_counts.values())}")
-            print(f"Total de filas procesadas para servicio: {len(raw_data[0:442])}")
-            
-            # Procesar columna Z (frecuencia camión recolector) para gráfica de barras
-            frecuencia_camion_col = '¿Con qué frecuencia pasa el camión recolector de residuos?'
-            frecuencia_camion_counts = {}
-            # Procesar solo filas Z2 a Z440 (registros 1 a 439 en raw_data)
-            for i, row in enumerate(raw_data[0:442], start=2):  # Empezar desde índice 0 (fila Z2) hasta 442 (incluye 441)
-                valor = row.get(frecuencia_camion_col, '').strip()
-                if valor:
-                    frecuencia_camion_counts[valor] = frecuencia_camion_counts.get(valor, 0) + 1
-            
-            print(f"Frecuencia camión counts: {frecuencia_camion_counts}")
-            print(f"Frecuencia camión counts keys: {list(frecuencia_camion_counts.keys())}")
-            print(f"Frecuencia camión counts values: {list(frecuencia_camion_counts.values())}")
-            print(f"Total de filas procesadas para frecuencia camión: {len(raw_data[0:442])}")
-            
-            # Procesar columna AA (participación en campañas) para gráfica de barras
-            participacion_col = '¿Ha participado en alguna campaña de limpieza o educación ambiental en su barrio?'
-            participacion_counts = {}
-            # Procesar solo filas AA2 a AA440 (registros 1 a 439 en raw_data)
-            for i, row in enumerate(raw_data[0:442], start=2):  # Empezar desde índice 0 (fila AA2) hasta 442 (incluye 441)
-                valor = row.get(participacion_col, '').strip()
-                if valor:
-                    participacion_counts[valor] = participacion_counts.get(valor, 0) + 1
-            
-            print(f"Participación counts: {participacion_counts}")
-            print(f"Participación counts keys: {list(participacion_counts.keys())}")
-            print(f"Participación counts values: {list(participacion_counts.values())}")
-            print(f"Total de filas procesadas para participación: {len(raw_data[0:442])}")
-            
-            # Procesar columna AB (iniciativas comunitarias) para gráfica de barras
-            iniciativas_col = ' ¿Le gustaría participar en iniciativas comunitarias de limpieza?'
-            iniciativas_counts = {}
-            # Procesar solo filas AB2 a AB440 (registros 1 a 439 en raw_data)
-            for i, row in enumerate(raw_data[0:442], start=2):  # Empezar desde índice 0 (fila AB2) hasta 442 (incluye 441)
-                valor = row.get(iniciativas_col, '').strip()
-                if valor:
-                    iniciativas_counts[valor] = iniciativas_counts.get(valor, 0) + 1
-            
-            print(f"Iniciativas counts: {iniciativas_counts}")
-            print(f"Iniciativas counts keys: {list(iniciativas_counts.keys())}")
-            print(f"Iniciativas counts values: {list(iniciativas_counts.values())}")
-            print(f"Total de filas procesadas para iniciativas: {len(raw_data[0:442])}")
-            
-            # Procesar columna AC (educación ambiental) para gráfica de barras
-            educacion_col = '¿Considera que hace falta más educación ambiental en el barrio?'
-            educacion_counts = {}
-            # Procesar solo filas AC2 a AC440 (registros 1 a 439 en raw_data)
-            for i, row in enumerate(raw_data[0:442], start=2):  # Empezar desde índice 0 (fila AC2) hasta 442 (incluye 441)
-                valor = row.get(educacion_col, '').strip()
-                if valor:
-                    educacion_counts[valor] = educacion_counts.get(valor, 0) + 1
-            
-            print(f"Educación counts: {educacion_counts}")
-            print(f"Educación counts keys: {list(educacion_counts.keys())}")
-            print(f"Educación counts values: {list(educacion_counts.values())}")
-            print(f"Total de filas procesadas para educación: {len(raw_data[0:442])}")
-            
-            # Procesar columna AD (sabe punto crítico) para gráfica de barras
-            punto_critico_col = '¿Sabe que es un punto critico?'
-            punto_critico_counts = {}
-            # Procesar solo filas AD2 a AD440 (registros 1 a 439 en raw_data)
-            for i, row in enumerate(raw_data[0:442], start=2):  # Empezar desde índice 0 (fila AD2) hasta 442 (incluye 441)
-                valor = row.get(punto_critico_col, '').strip()
-                if valor:
-                    punto_critico_counts[valor] = punto_critico_counts.get(valor, 0) + 1
-            
-            print(f"Punto crítico counts: {punto_critico_counts}")
-            print(f"Punto crítico counts keys: {list(punto_critico_counts.keys())}")
-            print(f"Punto crítico counts values: {list(punto_critico_counts.values())}")
-            print(f"Total de filas procesadas para punto crítico: {len(raw_data[0:442])}")
-            
-            # Procesar columna AE (identifica puntos críticos) para gráfica de barras
-            identifica_col = '¿Identifica puntos críticos en el barrio?'
-            identifica_counts = {}
-            # Procesar solo filas AE2 a AE440 (registros 1 a 439 en raw_data)
-            for i, row in enumerate(raw_data[0:442], start=2):  # Empezar desde índice 0 (fila AE2) hasta 442 (incluye 441)
-                valor = row.get(identifica_col, '').strip()
-                if valor:
-                    identifica_counts[valor] = identifica_counts.get(valor, 0) + 1
-            
-            print(f"Identifica counts: {identifica_counts}")
-            print(f"Identifica counts keys: {list(identifica_counts.keys())}")
-            print(f"Identifica counts values: {list(identifica_counts.values())}")
-            print(f"Total de filas procesadas para identifica: {len(raw_data[0:442])}")
-            
-            # Procesar columna AF (tiempo puntos críticos) para gráfica de barras
-            tiempo_puntos_col = '¿Cada cuanto tiempo ve estos puntos en el barrio?'
-            tiempo_puntos_counts = {}
-            # Procesar solo filas AF2 a AF440 (registros 1 a 439 en raw_data)
-            for i, row in enumerate(raw_data[0:442], start=2):  # Empezar desde índice 0 (fila AF2) hasta 442 (incluye 441)
-                valor = row.get(tiempo_puntos_col, '').strip()
-                if valor:
-                    tiempo_puntos_counts[valor] = tiempo_puntos_counts.get(valor, 0) + 1
-            
-            print(f"Tiempo puntos counts: {tiempo_puntos_counts}")
-            print(f"Tiempo puntos counts keys: {list(tiempo_puntos_counts.keys())}")
-            print(f"Tiempo puntos counts values: {list(tiempo_puntos_counts.values())}")
-            print(f"Total de filas procesadas para tiempo puntos: {len(raw_data[0:442])}")
-            
-            return render_template('pages/el_consuelo.html', 
-                                num_encuestas=num_encuestas,
-                                sexo_counts=sexo_counts,
-                                nivel_educativo_counts=nivel_educativo_counts,
-                                tiempo_reside_counts=tiempo_reside_counts,
-                                limpieza_counts=limpieza_counts,
-                                residuos_counts=residuos_counts,
-                                tiempo_counts=tiempo_counts,
-                                seguridad_counts=seguridad_counts,
-                                calidad_vida_counts=calidad_vida_counts,
-                                separacion_counts=separacion_counts,
-                                horario_counts=horario_counts,
-                                saca_horarios_counts=saca_horarios_counts,
-                                recuperador_counts=recuperador_counts,
-                                lugar_counts=lugar_counts,
-                                servicio_counts=servicio_counts,
-                                frecuencia_camion_counts=frecuencia_camion_counts,
-                                participacion_counts=participacion_counts,
-                                iniciativas_counts=iniciativas_counts,
-                                educacion_counts=educacion_counts,
-                                punto_critico_counts=punto_critico_counts,
-                                identifica_counts=identifica_counts,
-                                tiempo_puntos_counts=tiempo_puntos_counts)
+            snapshot = refresh_scheduler.get('el_consuelo')
+            num_encuestas = snapshot.processed['num_encuestas'] if snapshot is not None else None
+            return render_template('pages/el_consuelo.html', num_encuestas=num_encuestas)
         except Exception as e:
             logger.error(f"Error en dashboard de El Consuelo: {str(e)}")
             return render_template('error.html', error=str(e)), 500
@@ -408,40 +307,81 @@ def create_app(config_class=DevelopmentConfig):
     
     @app.route('/api/data')
     def get_data():
-        """API para obtener datos"""
+        """
+        API para obtener datos
+
+        Sin parámetros retorna todos los registros. Acepta `page`, `page_size`
+        o `cursor` para paginar, `fields` (separados por coma) para proyectar
+        columnas, `entidad` (repetible) y `fecha_desde`/`fecha_hasta` para
+        filtrar; en ese caso la respuesta incluye `total` y `next_cursor`.
+        `statistics` corresponde siempre a todos los registros, no al
+        subconjunto filtrado. Lleva ETag de la versión de los datos y
+        responde 304 a If-None-Match.
+        """
         try:
             logger.info("Solicitando datos desde API")
             
-            # Obtener datos de Google Sheets
-            raw_data = sheets_connector.get_data()
-            
-            # Depuración: imprimir headers y primeros valores de la columna O
-            if raw_data:
-                headers = list(raw_data[0].keys())
-                print('Headers:')
-                for idx, h in enumerate(headers):
-                    print(f'{idx}: {repr(h)}')
-                if len(headers) > 14:
-                    col_o = headers[14]
-                    print(f'Columna O (índice 14): {repr(col_o)}')
-                    print('Primeros 10 valores de columna O:')
-                    for row in raw_data[:10]:
-                        print(row.get(col_o, ''))
-            
-            # Procesar datos usando el servicio
-            processed_data = data_service.process_raw_data(raw_data)
-            
-            # Preparar respuesta
-            response = {
-                'data': [record['original'] for record in processed_data['data']],
-                'statistics': processed_data['statistics'],
-                'validation': processed_data['validation'],
-                'last_update': datetime.now().isoformat(),
-                'columns_order': list(processed_data['data'][0]['original'].keys()) if processed_data['data'] else []
-            }
-            
-            logger.info(f"Datos obtenidos exitosamente: {len(response['data'])} registros")
-            return jsonify(response)
+            try:
+                query = parse_query_args(
+                    request.args,
+                    default_page_size=app.config.get('API_DEFAULT_PAGE_SIZE', 100),
+                    max_page_size=app.config.get('API_MAX_PAGE_SIZE', 1000)
+                )
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            
+            # Snapshot publicado; si el cliente ya tiene esta versión no se procesa nada
+            snapshot = refresh_scheduler.current('actividades')
+            etag = None
+            if snapshot is not None:
+                etag = snapshot_etag(snapshot, sorted(query.items())) if query is not None else snapshot_etag(snapshot)
+                # last_update es la hora de publicación en este worker: ETag débil
+                cached = not_modified(etag, weak=True)
+                if cached is not None:
+                    return cached
+            last_update = (snapshot.published_at if snapshot is not None else datetime.now()).isoformat()
+            
+            if query is not None:
+                index = get_activity_index(snapshot)
+                try:
+                    result = index.query(**query)
+                except ValueError as e:
+                    return jsonify({'error': str(e)}), 400
+                result['statistics'] = index.statistics
+                result['last_update'] = last_update
+                logger.info(f"Consulta de datos: {len(result['data'])} de {result['total']} registros")
+                response = jsonify(result)
+                return with_etag(response, etag, weak=True) if etag else response
+            
+            def build_response():
+                if snapshot is not None:
+                    raw_data, processed_data = snapshot.raw, snapshot.processed
+                else:
+                    raw_data, processed_data = [], data_service.process_raw_data([])
+                
+                # Depuración: headers y primeros valores de la columna O (limitado por llamada)
+                if raw_data and logger.isEnabledFor(logging.DEBUG):
+                    headers = list(raw_data[0].keys())
+                    logger.debug(f"Headers: {list(enumerate(headers))}")
+                    if len(headers) > 14:
+                        col_o = headers[14]
+                        logger.debug(f"Columna O (índice 14) {col_o!r}, primeros 10 valores: "
+                                     f"{[row.get(col_o, '') for row in raw_data[:10]]}")
+                
+                return {
+                    'data': [record['original'] for record in processed_data['data']],
+                    'statistics': processed_data['statistics'],
+                    'validation': processed_data['validation'],
+                    'last_update': last_update,
+                    'columns_order': list(processed_data['data'][0]['original'].keys()) if processed_data['data'] else []
+                }
+            
+            if snapshot is None:
+                return jsonify(build_response())
+            
+            logger.info(f"Datos obtenidos exitosamente: {len(snapshot.processed['data'])} registros")
+            # Cuerpo serializado una vez por versión de los datos
+            return snapshot_response('api_data', etag, build_response, weak=True)
             
         except Exception as e:
             logger.error(f"Error obteniendo datos: {str(e)}")
@@ -453,8 +393,11 @@ def create_app(config_class=DevelopmentConfig):
         try:
             logger.info("Refrescando datos")
             
-            # Forzar actualización de datos
-            sheets_connector.refresh_cache()
+            # Forzar actualización de datos; si falla se sigue sirviendo el snapshot anterior
+            if refresh_scheduler.refresh('actividades') is None:
+                error = refresh_scheduler.status()['actividades']['last_error']
+                logger.error(f"No se pudieron refrescar los datos: {error}")
+                return jsonify({'success': False, 'error': error or 'No se pudieron obtener los datos'}), 502
             
             return jsonify({'success': True, 'message': 'Datos actualizados correctamente'})
             
@@ -462,20 +405,39 @@ def create_app(config_class=DevelopmentConfig):
             logger.error(f"Error refrescando datos: {str(e)}")
             return jsonify({'error': str(e)}), 500
     
+    @app.route('/api/sheets/stats')
+    def sheets_stats():
+        """API con los contadores de descargas, cachés y el estado del programador"""
+        fetches = {}
+        for connector in connector_registry.connectors():
+            fetches[connector.credentials_env_var] = connector.get_fetch_stats()
+        return jsonify({
+            'fetches': fetches,
+            'scheduler': refresh_scheduler.status(),
+            'processing_cache': refresh_scheduler.processed_cache.stats(),
+            'index_cache': index_cache.stats(),
+            'chart_cache': chart_cache.stats(),
+            'payload_cache': payload_cache.stats()
+        })
+    
     @app.route('/api/charts/participacion')
     def get_participacion_chart():
         """API para obtener gráfico de participación"""
         try:
             logger.info("Generando gráfico de participación")
             
-            # Obtener datos
-            raw_data = sheets_connector.get_data()
-            processed_data = data_service.process_raw_data(raw_data)
+            snapshot = refresh_scheduler.current('actividades')
+            if snapshot is None:
+                return jsonify({})
             
-            # Generar gráfico
-            chart_data = chart_generator.generate_participacion_chart(processed_data['data'])
+            etag = chart_etag(snapshot, 'participacion')
+            cached = not_modified(etag)
+            if cached is not None:
+                return cached
             
-            return jsonify(chart_data)
+            # Gráfico ya serializado para esta versión de los datos
+            body = get_chart('participacion', snapshot)
+            return with_etag(app.response_class(body, mimetype='application/json'), etag)
             
         except Exception as e:
             logger.error(f"Error generando gráfico de participación: {str(e)}")
@@ -487,14 +449,18 @@ def create_app(config_class=DevelopmentConfig):
         try:
             logger.info("Generando gráfico diario")
             
-            # Obtener datos
-            raw_data = sheets_connector.get_data()
-            processed_data = data_service.process_raw_data(raw_data)
+            snapshot = refresh_scheduler.current('actividades')
+            if snapshot is None:
+                return jsonify({})
             
-            # Generar gráfico
-            chart_data = chart_generator.generate_diario_chart(processed_data['data'])
+            etag = chart_etag(snapshot, 'diario')
+            cached = not_modified(etag)
+            if cached is not None:
+                return cached
             
-            return jsonify(chart_data)
+            # Gráfico ya serializado para esta versión de los datos
+            body = get_chart('diario', snapshot)
+            return with_etag(app.response_class(body, mimetype='application/json'), etag)
             
         except Exception as e:
             logger.error(f"Error generando gráfico diario: {str(e)}")
@@ -504,14 +470,69 @@ def create_app(config_class=DevelopmentConfig):
     def api_el_consuelo_data():
         """API para obtener datos de encuestas de El Consuelo"""
         try:
-            sheet_id = '1265C_6-JZ-ZzeUD4RRZ1cKoVYOVvysztvWLx63dh2TM'
-            credentials_file = 'credentials/credentials_consuelo.json'
-            sheets_connector = GoogleSheetsConnector(credentials_file=credentials_file, credentials_env_var="GOOGLE_CREDENTIALS_CONSUELO_JSON")
-            raw_data = sheets_connector.get_data(sheet_id)
-            return jsonify({'data': raw_data, 'total': len(raw_data)})
+            snapshot = refresh_scheduler.current('el_consuelo')
+            if snapshot is None:
+                return jsonify({'data': [], 'total': 0})
+            etag = snapshot_etag(snapshot)
+            cached = not_modified(etag)
+            if cached is not None:
+                return cached
+            raw_data = snapshot.raw
+            return snapshot_response('el_consuelo_data', etag,
+                                     lambda: {'data': list(raw_data), 'total': len(raw_data)})
         except Exception as e:
             return jsonify({'error': str(e), 'data': []}), 500
     
+    @app.route('/api/el-consuelo/summary')
+    def api_el_consuelo_summary():
+        """
+        API con los conteos precalculados de la encuesta de El Consuelo
+
+        El resumen se calcula una vez por versión de los datos; la respuesta
+        lleva ETag (huella del contenido) y Last-Modified para peticiones
+        condicionales.
+        """
+        try:
+            snapshot = refresh_scheduler.current('el_consuelo')
+            if snapshot is None:
+                return jsonify({'error': 'No hay datos de El Consuelo disponibles'}), 503
+            etag = snapshot_etag(snapshot)
+            cached = not_modified(etag)
+            if cached is not None:
+                cached.last_modified = snapshot.published_at.astimezone(timezone.utc)
+                return cached
+            summary = snapshot.processed
+            if not summary['limpieza_counts']:
+                logger.warning(f"No se encontraron datos en la columna de limpieza; headers disponibles: "
+                               f"{list(snapshot.raw[0].keys())}")
+            response = with_etag(jsonify(summary), etag)
+            response.last_modified = snapshot.published_at.astimezone(timezone.utc)
+            return response.make_conditional(request)
+        except Exception as e:
+            logger.error(f"Error obteniendo resumen de El Consuelo: {str(e)}")
+            return jsonify({'error': str(e)}), 500
+    
+    @app.cli.command('import-report')
+    @click.option('--target', default='app_modular', help='Módulo a importar')
+    @click.option('--top', default=15, help='Número de paquetes a mostrar')
+    def import_report(target, top):
+        """Muestra el tiempo de importación de la aplicación (-X importtime)"""
+        click.echo(format_report(run_import_report(target, top=top)))
+    
+    @app.cli.command('record-sheets')
+    @click.option('--dir', 'directory', default=None, help='Directorio de destino (por defecto SHEETS_FIXTURE_DIR)')
+    @click.option('--format', 'fmt', default='json', type=click.Choice(['json', 'csv', 'parquet']))
+    def record_sheets(directory, fmt):
+        """Graba los valores de cada hoja para reproducirlos sin conexión (SHEETS_SOURCE='recorded')"""
+        directory = directory or app.config.get('SHEETS_FIXTURE_DIR', 'data/fixtures')
+        for job in refresh_scheduler.jobs():
+            values = job.connector_factory().source.get_all_values(job.sheet_id)
+            if not values:
+                click.echo(f"{job.name}: sin datos")
+                continue
+            path = save_recorded_values(directory, job.sheet_id, values, fmt)
+            click.echo(f"{job.name}: {len(values) - 1} filas en {path}")
+    
     @app.errorhandler(404)
     def not_found(error):
         """Manejo de error 404"""
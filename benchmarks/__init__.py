@@ -0,0 +1,3 @@
+"""
+Suite de rendimiento con hojas sintéticas (sin conexión a Google Sheets)
+"""
@@ -0,0 +1,118 @@
+"""
+Comparación de la serialización de /api/data
+
+Mide, sobre la respuesta completa de /api/data armada con hojas sintéticas:
+
+- jsonify: DefaultJSONProvider de Flask (módulo json estándar)
+- orjson: FastJSONProvider
+- serializado: cuerpo ya serializado para la versión (acierto de la caché
+  de payloads) transmitido en fragmentos
+
+    python -m benchmarks.json_bench --sizes 1000,10000,100000
+"""
+
+import argparse
+import os
+import sys
+from typing import Any, Dict, List, Optional
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from benchmarks.suite import RESULTS_DIR, _metadata, measure, save_results
+from benchmarks.synthetic import activity_values
+from services.cache_service import ResultCache
+from services.data_service import DataService
+from services.json_provider import FastJSONProvider, dumps_bytes, iter_chunks
+from services.sheet_table import SheetTable
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+
+
+def api_data_payload(rows: int) -> Dict[str, Any]:
+    """Respuesta completa de /api/data para una hoja sintética de `rows` filas"""
+    processed = DataService().process_raw_data(SheetTable.from_values(activity_values(rows)).rows())
+    return {
+        'data': [record['original'] for record in processed['data']],
+        'statistics': processed['statistics'],
+        'validation': processed['validation'],
+        'last_update': '2025-01-01T00:00:00',
+        'columns_order': list(processed['data'][0]['original'].keys()) if processed['data'] else []
+    }
+
+
+def build_cases(payload: Dict[str, Any]) -> List:
+    """Casos a medir: (nombre, función que produce la respuesta completa)"""
+    app = Flask(__name__)
+    default = DefaultJSONProvider(app)
+    fast = FastJSONProvider(app)
+    payload_cache = ResultCache(max_entries=1)
+    payload_cache.get_or_compute('api_data', lambda: dumps_bytes(fast, payload))
+
+    def consume(response) -> int:
+        return sum(len(chunk) for chunk in response.response)
+
+    def preserialized():
+        body = payload_cache.get_or_compute('api_data', lambda: dumps_bytes(fast, payload))
+        response = app.response_class(iter_chunks(body), mimetype='application/json')
+        response.content_length = len(body)
+        return consume(response)
+
+    with app.app_context():
+        return [
+            ('jsonify', lambda: consume(default.response(payload))),
+            ('orjson', lambda: consume(fast.response(payload))),
+            ('serializado', preserialized),
+        ]
+
+
+def run(sizes=DEFAULT_SIZES, repeat: int = 5, memory: bool = True) -> Dict[str, Any]:
+    """Mide los tres caminos para cada tamaño"""
+    results = []
+    for rows in sizes:
+        payload = api_data_payload(rows)
+        for name, func in build_cases(payload):
+            measured = measure(func, repeat=repeat, memory=memory)
+            measured.update({
+                'case': name,
+                'rows': rows,
+                'bytes': func(),
+                'rows_per_second': rows / measured['best_seconds'] if measured['best_seconds'] else None
+            })
+            results.append(measured)
+    return {'meta': _metadata(sizes, repeat), 'results': results}
+
+
+def format_results(report: Dict[str, Any]) -> str:
+    """Tabla con el tiempo de cada camino y su aceleración frente a jsonify"""
+    baseline = {r['rows']: r['best_seconds'] for r in report['results'] if r['case'] == 'jsonify'}
+    lines = [f"{'caso':12} {'filas':>9} {'mejor ms':>10} {'MB':>7} {'x jsonify':>10} {'pico MB':>9}"]
+    for result in report['results']:
+        speedup = baseline[result['rows']] / result['best_seconds'] if result['best_seconds'] else float('inf')
+        peak = result.get('peak_memory_mb')
+        lines.append(
+            f"{result['case']:12} {result['rows']:>9} {result['best_seconds'] * 1000:>10.2f} "
+            f"{result['bytes'] / 1e6:>7.2f} {speedup:>10.1f} {('%.1f' % peak) if peak is not None else '-':>9}"
+        )
+    return '\n'.join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Comparación de la serialización JSON de /api/data')
+    parser.add_argument('--sizes', default=','.join(str(size) for size in DEFAULT_SIZES))
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--no-memory', action='store_true', help='No medir el pico de memoria')
+    parser.add_argument('--output', default=None, help='Archivo JSON de resultados')
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+    report = run(sizes, repeat=args.repeat, memory=not args.no_memory)
+    path = save_results(report, args.output or os.path.join(
+        RESULTS_DIR, f"json-{report['meta'].get('commit') or 'local'}.json"))
+    print(format_results(report))
+    print(f"Resultados guardados en {path}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
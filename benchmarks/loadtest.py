@@ -0,0 +1,354 @@
+"""
+Prueba de carga HTTP de la aplicación con datos sin conexión
+
+Arranca `create_app()` con la fuente de snapshots grabados (hojas sintéticas
+o las de SHEETS_FIXTURE_DIR), la sirve con el servidor de Werkzeug en un
+hilo y recorre las rutas con la concurrencia indicada. Reporta p50/p95/p99,
+rendimiento y tasa de errores por ruta en JSON comparable entre commits:
+
+    python -m benchmarks.loadtest --concurrency 8 --duration 30
+    python -m benchmarks.loadtest --compare benchmarks/results/loadtest-abc1234.json
+
+Para dimensionar workers e hilos de gunicorn, levantar la aplicación con
+gunicorn sobre los mismos fixtures y apuntar la prueba a su URL:
+
+    python -m benchmarks.loadtest --write-fixtures data/fixtures
+    SHEETS_SOURCE=recorded gunicorn wsgi:app -w 4 --threads 4
+    python -m benchmarks.loadtest --url http://127.0.0.1:8000 --concurrency 32
+"""
+
+import argparse
+import http.client
+import json
+import logging
+import math
+import os
+import platform
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from benchmarks.suite import RESULTS_DIR, _git_commit
+from benchmarks.synthetic import activity_values, survey_values
+
+DEFAULT_ROUTES = (
+    '/',
+    '/san-bernardo',
+    '/el-consuelo',
+    '/api/data',
+    '/api/charts/participacion',
+    '/api/charts/diario'
+)
+
+
+def write_fixtures(directory: str, activity_rows: int = 5000, survey_rows: int = 1000) -> str:
+    """
+    Graba hojas sintéticas con los IDs de las hojas de la aplicación
+
+    Returns:
+        Directorio de los fixtures
+    """
+    from services.google_sheets_service import CONSUELO_SHEET_ID, DEFAULT_SHEET_ID
+    from services.sheet_sources import save_recorded_values
+
+    save_recorded_values(directory, DEFAULT_SHEET_ID, activity_values(activity_rows))
+    save_recorded_values(directory, CONSUELO_SHEET_ID, survey_values(survey_rows))
+    return directory
+
+
+def offline_config(fixture_dir: str):
+    """Configuración de desarrollo que lee las hojas de los fixtures, sin programador"""
+    from config.development import DevelopmentConfig
+
+    class LoadTestConfig(DevelopmentConfig):
+        DEBUG = False
+        SHEETS_SOURCE = 'recorded'
+        SHEETS_FIXTURE_DIR = fixture_dir
+        SNAPSHOT_BACKEND = 'memory'
+        SCHEDULER_ENABLED = False
+        LOG_LEVEL = 'WARNING'
+        LOG_FILE = None
+
+    return LoadTestConfig
+
+
+class AppServer:
+    """
+    Aplicación de `create_app()` servida con Werkzeug en un hilo
+
+    Args:
+        config_class: Configuración de la aplicación
+        host: Interfaz de escucha
+        port: Puerto; 0 elige uno libre
+    """
+
+    def __init__(self, config_class, host: str = '127.0.0.1', port: int = 0):
+        from werkzeug.serving import make_server
+        from app_modular import create_app
+
+        self.app = create_app(config_class)
+        self.app.config['DEBUG'] = False
+        logging.getLogger('werkzeug').setLevel(logging.WARNING)
+        self._server = make_server(host, port, self.app, threaded=True)
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self._server.host}:{self._server.port}"
+
+    def start(self) -> 'AppServer':
+        self._thread = threading.Thread(target=self._server.serve_forever, name='loadtest-server', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+class _Client:
+    """Conexión HTTP persistente de un worker de la prueba"""
+
+    def __init__(self, base_url: str, timeout: float):
+        parts = urlsplit(base_url)
+        self.prefix = parts.path.rstrip('/')
+        self.connection = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=timeout)
+
+    def get(self, route: str) -> Tuple[int, int]:
+        """Hace la petición y retorna (estado, bytes del cuerpo)"""
+        try:
+            self.connection.request('GET', self.prefix + route)
+            response = self.connection.getresponse()
+            body = response.read()
+            return response.status, len(body)
+        except (OSError, http.client.HTTPException):
+            self.connection.close()
+            raise
+
+    def close(self):
+        self.connection.close()
+
+
+def percentile(sorted_values: List[float], q: float) -> Optional[float]:
+    """Percentil por rango más cercano de una lista ordenada"""
+    if not sorted_values:
+        return None
+    rank = min(max(math.ceil(q * len(sorted_values) / 100), 1), len(sorted_values))
+    return sorted_values[rank - 1]
+
+
+def run_load(base_url: str, routes=DEFAULT_ROUTES, concurrency: int = 8, duration: Optional[float] = 10,
+             requests_per_route: Optional[int] = None, warmup: int = 1, timeout: float = 30) -> Dict[str, Any]:
+    """
+    Recorre las rutas con `concurrency` workers
+
+    Args:
+        base_url: URL de la aplicación
+        routes: Rutas a probar (se reparten en turno rotativo)
+        concurrency: Workers simultáneos, cada uno con su conexión
+        duration: Segundos de prueba (si no se indica `requests_per_route`)
+        requests_per_route: Peticiones por ruta; tiene prioridad sobre `duration`
+        warmup: Peticiones por ruta antes de medir (llenan cachés)
+        timeout: Tiempo máximo por petición
+
+    Returns:
+        Dict con 'routes' (resumen por ruta) y 'total'
+    """
+    routes = list(routes)
+    warm_client = _Client(base_url, timeout)
+    for route in routes:
+        for _ in range(warmup):
+            try:
+                warm_client.get(route)
+            except (OSError, http.client.HTTPException):
+                pass
+    warm_client.close()
+
+    samples: Dict[str, List[Tuple[float, int, int]]] = {route: [] for route in routes}
+    lock = threading.Lock()
+    total = len(routes) * requests_per_route if requests_per_route else None
+    counter = [0]
+    deadline = time.perf_counter() + duration if not requests_per_route else None
+
+    def next_route() -> Optional[str]:
+        with lock:
+            index = counter[0]
+            if total is not None and index >= total:
+                return None
+            counter[0] += 1
+        if deadline is not None and time.perf_counter() >= deadline:
+            return None
+        return routes[index % len(routes)]
+
+    def worker():
+        client = _Client(base_url, timeout)
+        local = []
+        while True:
+            route = next_route()
+            if route is None:
+                break
+            start = time.perf_counter()
+            try:
+                status, size = client.get(route)
+            except (OSError, http.client.HTTPException):
+                status, size = 0, 0
+            local.append((route, time.perf_counter() - start, status, size))
+        client.close()
+        with lock:
+            for route, elapsed, status, size in local:
+                samples[route].append((elapsed, status, size))
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, name=f'loadtest-{i}') for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+
+    summary = {route: summarize_route(route_samples, wall) for route, route_samples in samples.items()}
+    everything = [sample for route_samples in samples.values() for sample in route_samples]
+    return {'routes': summary, 'total': summarize_route(everything, wall), 'wall_seconds': wall}
+
+
+def summarize_route(samples: List[Tuple[float, int, int]], wall_seconds: float) -> Dict[str, Any]:
+    """Latencias en ms, rendimiento y errores de una ruta (errores: sin respuesta o estado >= 400)"""
+    latencies = sorted(elapsed * 1000 for elapsed, _, _ in samples)
+    errors = sum(1 for _, status, _ in samples if status == 0 or status >= 400)
+    count = len(samples)
+    return {
+        'requests': count,
+        'errors': errors,
+        'error_rate': errors / count if count else 0.0,
+        'throughput_rps': count / wall_seconds if wall_seconds else 0.0,
+        'p50_ms': percentile(latencies, 50),
+        'p95_ms': percentile(latencies, 95),
+        'p99_ms': percentile(latencies, 99),
+        'max_ms': latencies[-1] if latencies else None,
+        'mean_bytes': sum(size for _, _, size in samples) / count if count else 0
+    }
+
+
+def compare_reports(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = 0.10) -> List[Dict]:
+    """
+    Compara el p95 y la tasa de errores por ruta con un reporte de referencia
+
+    Hay regresión si el p95 aumenta más de `threshold` (relativo) o si la
+    tasa de errores aumenta.
+    """
+    previous = baseline.get('routes', {})
+    comparison = []
+    for route, result in current.get('routes', {}).items():
+        before = previous.get(route)
+        if not before or not before.get('p95_ms') or result.get('p95_ms') is None:
+            continue
+        change = result['p95_ms'] / before['p95_ms'] - 1
+        comparison.append({
+            'route': route,
+            'baseline_p95_ms': before['p95_ms'],
+            'current_p95_ms': result['p95_ms'],
+            'change': change,
+            'regression': change > threshold or result['error_rate'] > before['error_rate']
+        })
+    return comparison
+
+
+def format_report(report: Dict[str, Any], comparison: Optional[List[Dict]] = None) -> str:
+    """Tabla legible del reporte para la consola"""
+    meta = report['meta']
+    lines = [f"Commit {meta.get('commit') or '-'} - {meta['target']} - concurrencia {meta['concurrency']}"]
+    lines.append(f"{'ruta':28} {'pet.':>7} {'err %':>6} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    rows = list(report['routes'].items()) + [('TOTAL', report['total'])]
+    for route, result in rows:
+        lines.append(
+            f"{route:28} {result['requests']:>7} {result['error_rate'] * 100:>6.1f} {result['throughput_rps']:>8.1f} "
+            f"{_ms(result['p50_ms']):>8} {_ms(result['p95_ms']):>8} {_ms(result['p99_ms']):>8}"
+        )
+    if comparison:
+        lines.append('')
+        lines.append('p95 comparado con la referencia:')
+        for item in comparison:
+            flag = '  REGRESIÓN' if item['regression'] else ''
+            lines.append(f"  {item['route']:28} {item['change'] * 100:+7.1f}%{flag}")
+    return '\n'.join(lines)
+
+
+def _ms(value: Optional[float]) -> str:
+    return f"{value:.1f}" if value is not None else '-'
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Prueba de carga HTTP con datos sin conexión')
+    parser.add_argument('--url', default=None, help='URL de una aplicación ya en ejecución (p. ej. gunicorn)')
+    parser.add_argument('--fixtures', default=None, help='Directorio de snapshots grabados; por defecto hojas sintéticas')
+    parser.add_argument('--rows', type=int, default=5000, help='Filas de la hoja sintética de actividades')
+    parser.add_argument('--routes', default=','.join(DEFAULT_ROUTES), help='Rutas separadas por comas')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=10, help='Segundos de prueba')
+    parser.add_argument('--requests', type=int, default=None, help='Peticiones por ruta (en lugar de --duration)')
+    parser.add_argument('--warmup', type=int, default=1, help='Peticiones por ruta antes de medir')
+    parser.add_argument('--output', default=None, help='Archivo JSON de resultados')
+    parser.add_argument('--compare', default=None, help='Reporte JSON de referencia')
+    parser.add_argument('--threshold', type=float, default=0.10, help='Aumento relativo del p95 considerado regresión')
+    parser.add_argument('--write-fixtures', default=None, metavar='DIR',
+                        help='Solo grabar las hojas sintéticas en DIR y salir')
+    args = parser.parse_args(argv)
+
+    if args.write_fixtures:
+        write_fixtures(args.write_fixtures, activity_rows=args.rows, survey_rows=max(args.rows // 5, 1))
+        print(f"Fixtures grabados en {args.write_fixtures}")
+        return 0
+
+    routes = [route.strip() for route in args.routes.split(',') if route.strip()]
+    server = None
+    base_url = args.url
+    if base_url is None:
+        fixture_dir = args.fixtures or write_fixtures(
+            tempfile.mkdtemp(prefix='loadtest-fixtures-'), activity_rows=args.rows,
+            survey_rows=max(args.rows // 5, 1)
+        )
+        server = AppServer(offline_config(fixture_dir)).start()
+        base_url = server.url
+    try:
+        result = run_load(base_url, routes, concurrency=args.concurrency, duration=args.duration,
+                          requests_per_route=args.requests, warmup=args.warmup)
+    finally:
+        if server is not None:
+            server.stop()
+
+    report = {
+        'meta': {
+            'commit': _git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'target': args.url or 'werkzeug (en proceso)',
+            'rows': None if args.url or args.fixtures else args.rows,
+            'concurrency': args.concurrency,
+            'duration': None if args.requests else args.duration,
+            'requests_per_route': args.requests
+        },
+        **result
+    }
+    path = args.output or os.path.join(RESULTS_DIR, f"loadtest-{report['meta']['commit'] or 'local'}.json")
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    comparison = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            comparison = compare_reports(json.load(f), report, args.threshold)
+    print(format_report(report, comparison))
+    print(f"Resultados guardados en {path}")
+    return 1 if comparison and any(item['regression'] for item in comparison) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,251 @@
+"""
+Suite de rendimiento del procesamiento de datos y de los gráficos
+
+Mide cada etapa sobre hojas sintéticas servidas por un conector falso y
+guarda el tiempo, el rendimiento (filas/s) y el pico de memoria en JSON:
+
+    python -m benchmarks.suite --sizes 1000,10000,100000
+    python -m benchmarks.suite --compare benchmarks/results/abc1234.json
+"""
+
+import argparse
+import gc
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from benchmarks.synthetic import FakeSheetsConnector, activity_values, survey_values
+from services.chart_service import ChartGenerator
+from services.data_service import DataService
+from services.survey_service import build_el_consuelo_summary
+from utils.data_utils import validate_required_fields
+from utils.date_utils import date_normalizer, parse_date
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+RESULTS_DIR = os.path.join('benchmarks', 'results')
+
+ACTIVITIES_SHEET = 'actividades'
+SURVEY_SHEET = 'el_consuelo'
+DATE_COLUMN = 'Fecha final de ejecución'
+
+
+def _normalize_date_target() -> Tuple[str, Callable[[str], Optional[str]]]:
+    """DataManager.normalize_date, o el normalizador al que delega si DataManager no se puede importar"""
+    try:
+        from services.data_manager_legacy import DataManager
+        return 'DataManager.normalize_date', DataManager().normalize_date
+    except Exception:
+        return 'date_normalizer.normalize', date_normalizer.normalize
+
+
+def build_cases(connector: FakeSheetsConnector) -> List[Tuple[str, str, Callable[[], Any]]]:
+    """
+    Casos de la suite: (nombre, hoja, función sin argumentos a medir)
+
+    Los datos de entrada se preparan aquí, fuera de la medición.
+    """
+    data_service = DataService()
+    chart_generator = ChartGenerator()
+    activities, _ = connector.get_sheet_data(ACTIVITIES_SHEET)
+    surveys, _ = connector.get_sheet_data(SURVEY_SHEET)
+    records = list(activities)
+    processed = data_service.process_raw_data(records)['data']
+    dates = [str(value).strip() for value in activities.table.column(DATE_COLUMN)]
+    normalize_name, normalize = _normalize_date_target()
+
+    return [
+        ('fetch_sheet', ACTIVITIES_SHEET, lambda: connector._fetch_sheet_data(ACTIVITIES_SHEET)),
+        ('process_raw_data', ACTIVITIES_SHEET, lambda: data_service.process_raw_data(records)),
+        ('validate_required_fields', ACTIVITIES_SHEET,
+         lambda: validate_required_fields(records, data_service.required_fields)),
+        ('parse_date', ACTIVITIES_SHEET, lambda: [parse_date(value) for value in dates]),
+        (normalize_name, ACTIVITIES_SHEET, lambda: [normalize(value) for value in dates]),
+        ('el_consuelo_summary', SURVEY_SHEET, lambda: build_el_consuelo_summary(surveys)),
+        ('generate_participacion_chart', ACTIVITIES_SHEET,
+         lambda: chart_generator.generate_participacion_chart(processed)),
+        ('generate_diario_chart', ACTIVITIES_SHEET,
+         lambda: chart_generator.generate_diario_chart(processed)),
+    ]
+
+
+def measure(func: Callable[[], Any], repeat: int = 3, memory: bool = True) -> Dict[str, Any]:
+    """
+    Mide una función: mejor y media de `repeat` ejecuciones y, aparte, el pico de memoria
+
+    El pico se toma en una ejecución adicional con tracemalloc, para que su
+    sobrecosto no afecte los tiempos.
+    """
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    result = {'best_seconds': min(times), 'mean_seconds': sum(times) / len(times)}
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            func()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        result['peak_memory_mb'] = peak / (1024 * 1024)
+    return result
+
+
+def run_suite(sizes=DEFAULT_SIZES, repeat: int = 3, memory: bool = True,
+              cases: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Ejecuta la suite para cada tamaño de hoja
+
+    Args:
+        sizes: Número de filas de las hojas sintéticas
+        repeat: Ejecuciones medidas por caso
+        memory: Si se mide el pico de memoria
+        cases: Nombres de los casos a ejecutar; None para todos
+
+    Returns:
+        Dict con 'meta' (commit, versión de Python, fecha) y 'results'
+    """
+    results = []
+    for rows in sizes:
+        connector = FakeSheetsConnector({
+            ACTIVITIES_SHEET: activity_values(rows),
+            SURVEY_SHEET: survey_values(rows)
+        })
+        for name, sheet, func in build_cases(connector):
+            if cases and name not in cases:
+                continue
+            measured = measure(func, repeat=repeat, memory=memory)
+            measured.update({
+                'case': name,
+                'sheet': sheet,
+                'rows': rows,
+                'rows_per_second': rows / measured['best_seconds'] if measured['best_seconds'] else None
+            })
+            results.append(measured)
+            logging.getLogger(__name__).info(
+                f"{name} ({rows} filas): {measured['best_seconds'] * 1000:.1f} ms"
+            )
+        del connector
+    return {'meta': _metadata(sizes, repeat), 'results': results}
+
+
+def _metadata(sizes, repeat: int) -> Dict[str, Any]:
+    return {
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'sizes': list(sizes),
+        'repeat': repeat
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        completed = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                                   capture_output=True, text=True, check=True)
+        return completed.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def save_results(report: Dict[str, Any], path: Optional[str] = None) -> str:
+    """Guarda el reporte en JSON; por defecto en benchmarks/results/<commit>.json"""
+    if path is None:
+        path = os.path.join(RESULTS_DIR, f"{report['meta'].get('commit') or 'local'}.json")
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    return path
+
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = 0.10) -> List[Dict]:
+    """
+    Compara dos reportes caso por caso (mismo caso y tamaño)
+
+    Args:
+        baseline: Reporte de referencia
+        current: Reporte nuevo
+        threshold: Aumento relativo del mejor tiempo a partir del cual hay regresión
+
+    Returns:
+        Lista de dicts con 'case', 'rows', 'baseline_seconds', 'current_seconds',
+        'change' (relativo) y 'regression'
+    """
+    previous = {(r['case'], r['rows']): r for r in baseline.get('results', [])}
+    comparison = []
+    for result in current.get('results', []):
+        before = previous.get((result['case'], result['rows']))
+        if before is None or not before['best_seconds']:
+            continue
+        change = result['best_seconds'] / before['best_seconds'] - 1
+        comparison.append({
+            'case': result['case'],
+            'rows': result['rows'],
+            'baseline_seconds': before['best_seconds'],
+            'current_seconds': result['best_seconds'],
+            'change': change,
+            'regression': change > threshold
+        })
+    return comparison
+
+
+def format_results(report: Dict[str, Any], comparison: Optional[List[Dict]] = None) -> str:
+    """Tabla legible de los resultados para la consola"""
+    lines = [f"Commit {report['meta'].get('commit') or '-'} - Python {report['meta']['python']}"]
+    lines.append(f"{'caso':32} {'filas':>9} {'mejor ms':>10} {'filas/s':>12} {'pico MB':>9}")
+    for result in report['results']:
+        peak = result.get('peak_memory_mb')
+        lines.append(
+            f"{result['case']:32} {result['rows']:>9} {result['best_seconds'] * 1000:>10.1f} "
+            f"{(result['rows_per_second'] or 0):>12.0f} {('%.1f' % peak) if peak is not None else '-':>9}"
+        )
+    if comparison:
+        lines.append('')
+        lines.append('Comparación con la referencia:')
+        for item in comparison:
+            flag = '  REGRESIÓN' if item['regression'] else ''
+            lines.append(f"  {item['case']:32} {item['rows']:>9} {item['change'] * 100:+7.1f}%{flag}")
+    return '\n'.join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Suite de rendimiento con hojas sintéticas')
+    parser.add_argument('--sizes', default=','.join(str(size) for size in DEFAULT_SIZES),
+                        help='Filas de las hojas separadas por comas (p. ej. 1000,10000,1000000)')
+    parser.add_argument('--repeat', type=int, default=3, help='Ejecuciones medidas por caso')
+    parser.add_argument('--cases', default='', help='Casos a ejecutar separados por comas')
+    parser.add_argument('--no-memory', action='store_true', help='No medir el pico de memoria')
+    parser.add_argument('--output', default=None, help='Archivo JSON de resultados')
+    parser.add_argument('--compare', default=None, help='Reporte JSON de referencia')
+    parser.add_argument('--threshold', type=float, default=0.10, help='Aumento relativo considerado regresión')
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+    cases = [case.strip() for case in args.cases.split(',') if case.strip()] or None
+    report = run_suite(sizes, repeat=args.repeat, memory=not args.no_memory, cases=cases)
+    path = save_results(report, args.output)
+
+    comparison = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            comparison = compare_results(json.load(f), report, args.threshold)
+    print(format_results(report, comparison))
+    print(f"Resultados guardados en {path}")
+    return 1 if comparison and any(item['regression'] for item in comparison) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,160 @@
+"""
+Hojas sintéticas y conector falso para medir el rendimiento sin red
+
+Las hojas se generan como la salida de `get_all_values()` (encabezados más
+filas de texto) con una semilla fija, de modo que dos ejecuciones con el
+mismo tamaño producen exactamente los mismos datos.
+"""
+
+import random
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from services.cache_service import SingleFlight
+from services.sheet_table import SheetTable
+from services.survey_service import EL_CONSUELO_SURVEY, RATING_VALUES
+
+ACTIVITY_HEADERS = [
+    'Entidad',
+    'Actividad',
+    'Fecha final de ejecución',
+    'Población impactada',
+    'Resumen de actividades',
+    'Descripción de los compromisos',
+    'Barrio',
+    'Responsable'
+]
+
+ENTIDADES = [
+    'Alcaldía Local de Santa Fe', 'Secretaría de Salud', 'Secretaría de Integración Social',
+    'IDRD', 'Policía Nacional', 'UAESP', 'Secretaría de Educación', 'IDPAC',
+    'Secretaría de Ambiente', 'Secretaría de Seguridad'
+]
+
+BARRIOS = ['El Consuelo', 'Las Cruces', 'La Perseverancia', 'Santa Fe', 'Lourdes', 'Girardot']
+
+MESES = ['enero', 'febrero', 'marzo', 'abril', 'mayo', 'junio', 'julio', 'agosto',
+         'septiembre', 'octubre', 'noviembre', 'diciembre']
+
+# Respuestas posibles de las preguntas de El Consuelo que no son calificaciones
+SURVEY_OPTIONS = {
+    'Sexo': ['Mujer', 'Hombre', 'Otro'],
+    'Nivel educativo': ['Primaria', 'Bachillerato', 'Técnico', 'Profesional', 'Posgrado'],
+    '¿Hace cuanto tiempo reside en el barrio?': ['Menos de 1 año', '1 a 5 años', 'Más de 5 años'],
+}
+DEFAULT_OPTIONS = ['Sí', 'No', 'A veces', 'Siempre', 'Nunca', '']
+
+
+def _date_text(rng: random.Random, day: date) -> str:
+    """Fecha en alguno de los formatos que aparecen en las hojas reales"""
+    choice = rng.random()
+    if choice < 0.45:
+        return f"{day.day:02d}/{day.month:02d}/{day.year}"
+    if choice < 0.75:
+        return day.isoformat()
+    if choice < 0.85:
+        return f"{day.day} de {MESES[day.month - 1]} de {day.year}"
+    if choice < 0.9:
+        return f"{day.day:02d}/{day.month:02d}/{day.year % 100:02d}"
+    if choice < 0.95:
+        return ''
+    return 'sin fecha'
+
+
+def _population_text(rng: random.Random) -> str:
+    choice = rng.random()
+    if choice < 0.7:
+        return str(rng.randint(1, 500))
+    if choice < 0.85:
+        return f"{rng.randint(1, 9)},{rng.randint(0, 999):03d}"
+    if choice < 0.95:
+        return ''
+    return 'N/A'
+
+
+def activity_values(rows: int, seed: int = 42) -> List[List[str]]:
+    """
+    Hoja de actividades sintética
+
+    Args:
+        rows: Número de filas de datos (sin contar los encabezados)
+        seed: Semilla del generador
+
+    Returns:
+        Matriz de valores como la de `get_all_values()`
+    """
+    rng = random.Random(seed)
+    start = date(2024, 3, 1)
+    values = [list(ACTIVITY_HEADERS)]
+    for i in range(rows):
+        day = start + timedelta(days=rng.randrange(600))
+        entidad = rng.choice(ENTIDADES) if rng.random() > 0.02 else ''
+        values.append([
+            entidad,
+            f"Actividad {i % 250}",
+            _date_text(rng, day),
+            _population_text(rng),
+            f"Jornada de {rng.choice(['limpieza', 'salud', 'seguridad', 'cultura'])} en el barrio",
+            f"Compromiso {i % 40}",
+            rng.choice(BARRIOS),
+            f"Responsable {i % 75}"
+        ])
+    return values
+
+
+def survey_values(rows: int, seed: int = 7) -> List[List[str]]:
+    """
+    Hoja de encuestas de El Consuelo sintética con las columnas de EL_CONSUELO_SURVEY
+    """
+    rng = random.Random(seed)
+    headers = ['Marca temporal'] + list(dict.fromkeys(question.column for question in EL_CONSUELO_SURVEY))
+    choices = []
+    for column in headers[1:]:
+        if column in SURVEY_OPTIONS:
+            choices.append(SURVEY_OPTIONS[column])
+        elif any(q.column == column and q.normalizer is not None for q in EL_CONSUELO_SURVEY):
+            choices.append(list(RATING_VALUES) + ['NS/NR', ''])
+        else:
+            choices.append(DEFAULT_OPTIONS)
+    values = [headers]
+    for i in range(rows):
+        values.append([f"{(i % 28) + 1}/05/2025 10:{i % 60:02d}:00"] + [rng.choice(c) for c in choices])
+    return values
+
+
+class FakeSheetsConnector:
+    """
+    Conector con la misma interfaz de lectura que GoogleSheetsConnector
+
+    Sirve matrices de valores en memoria por ID de hoja y arma las filas con
+    SheetTable, igual que el conector real después de `get_all_values()`.
+    """
+
+    def __init__(self, sheets: Optional[Dict[str, List[List[str]]]] = None):
+        self.sheets = dict(sheets or {})
+        self._flight = SingleFlight()
+
+    def add_sheet(self, sheet_id: str, values: List[List[str]]):
+        self.sheets[sheet_id] = values
+
+    def connect(self) -> bool:
+        return True
+
+    def is_connected(self) -> bool:
+        return True
+
+    def get_sheet_data(self, sheet_id: str) -> Tuple[Optional[List[Dict]], Optional[List[str]]]:
+        return self._flight.do(sheet_id, lambda: self._fetch_sheet_data(sheet_id))
+
+    def _fetch_sheet_data(self, sheet_id: str) -> Tuple[Optional[List[Dict]], Optional[List[str]]]:
+        values = self.sheets.get(sheet_id)
+        if not values:
+            return None, None
+        return SheetTable.from_values(values).rows(), list(values[0])
+
+    def get_data(self, sheet_id: str = None) -> List[Dict]:
+        data, _ = self.get_sheet_data(sheet_id)
+        return data or []
+
+    def get_fetch_stats(self) -> Dict:
+        return self._flight.stats()
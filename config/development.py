@@ -1,5 +1,7 @@
 # Configuración para desarrollo
 
+import os
+
 class DevelopmentConfig:
     DEBUG = True
     SECRET_KEY = 'dev-secret-key-change-in-production'
@@ -16,6 +18,57 @@ class DevelopmentConfig:
     DEFAULT_SHEET_ID = 'your-sheet-id-here'
     DEFAULT_SHEET_NAME = 'Datos'
     
+    # Configuración de caché de Google Sheets
+    REFRESH_INTERVAL_HOURS = 1
+    SHEETS_CACHE_TTL_SECONDS = REFRESH_INTERVAL_HOURS * 3600
+    SHEETS_TOKEN_REFRESH_SECONDS = 300
+    
+    # Fuente de los valores de las hojas: 'google', 'recorded' (snapshots grabados) o 'http' (servidor local)
+    SHEETS_SOURCE = os.environ.get('SHEETS_SOURCE', 'google')
+    SHEETS_FIXTURE_DIR = 'data/fixtures'
+    SHEETS_HTTP_URL = 'http://127.0.0.1:8765'
+    
+    # Snapshots compartidos entre workers: 'memory', 'file' o 'redis'
+    SNAPSHOT_BACKEND = 'memory'
+    SNAPSHOT_DIR = 'cache/snapshots'
+    REDIS_URL = 'redis://localhost:6379/0'
+    
+    # Programador de actualización en segundo plano
+    SCHEDULER_ENABLED = True
+    SCHEDULER_JITTER_SECONDS = 30
+    SCHEDULER_MAX_BACKOFF_SECONDS = 1800
+    SHEET_REFRESH_INTERVALS = {
+        'actividades': 300,
+        'el_consuelo': 600
+    }
+    # Reprocesar solo las filas agregadas o modificadas
+    INCREMENTAL_SYNC = True
+    # Motor de procesamiento de actividades: 'python' (por filas) o 'pandas' (por columnas);
+    # con INCREMENTAL_SYNC procesa la carga inicial y las filas cambiadas
+    DATA_ENGINE = 'python'
+    # Resultados procesados memorizados por huella de los datos
+    PROCESSED_CACHE_SIZE = 8
+    
+    # Gráficos serializados en caché (CHART_CACHE_DIR=None: solo en memoria)
+    CHART_CACHE_SIZE = 32
+    CHART_CACHE_DIR = None
+    
+    # Métricas de rendimiento en /metrics y encabezado Server-Timing
+    METRICS_ENABLED = True
+    SERVER_TIMING_ENABLED = True
+    
+    # Serialización JSON con orjson y cuerpos de /api/data serializados una vez por versión
+    FAST_JSON = True
+    PAYLOAD_CACHE_SIZE = 4
+    STREAM_CHUNK_SIZE = 256 * 1024
+    
+    # Paginación de /api/data
+    API_DEFAULT_PAGE_SIZE = 100
+    API_MAX_PAGE_SIZE = 1000
+    
     # Configuración de logging
     LOG_LEVEL = 'DEBUG'
-    LOG_FILE = 'logs/app.log' 
\ No newline at end of file
+    LOG_FILE = 'logs/app.log'
+    # Mensajes de depuración repetidos permitidos por punto de llamada y ventana
+    LOG_RATE_LIMIT_BURST = 5
+    LOG_RATE_LIMIT_SECONDS = 60 
\ No newline at end of file
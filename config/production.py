@@ -15,9 +15,59 @@ class ProductionConfig:
     SPREADSHEET_ID = os.environ.get('SPREADSHEET_ID', '1BxiMVs0XRA5nFMdKvBdBZjgmUUqptlbs74OgvE2upms')
     SPREADSHEET_CONSOLO_ID = os.environ.get('SPREADSHEET_CONSOLO_ID', '1BxiMVs0XRA5nFMdKvBdBZjgmUUqptlbs74OgvE2upms')
     
+    # Configuración de caché de Google Sheets
+    REFRESH_INTERVAL_HOURS = float(os.environ.get('REFRESH_INTERVAL_HOURS', 1))
+    SHEETS_CACHE_TTL_SECONDS = REFRESH_INTERVAL_HOURS * 3600
+    SHEETS_TOKEN_REFRESH_SECONDS = 300
+    
+    # Fuente de los valores de las hojas: 'google', 'recorded' (snapshots grabados) o 'http' (servidor local)
+    SHEETS_SOURCE = os.environ.get('SHEETS_SOURCE', 'google')
+    SHEETS_FIXTURE_DIR = os.environ.get('SHEETS_FIXTURE_DIR', 'data/fixtures')
+    SHEETS_HTTP_URL = os.environ.get('SHEETS_HTTP_URL', 'http://127.0.0.1:8765')
+    
+    # Snapshots compartidos entre workers: 'memory', 'file' o 'redis'
+    SNAPSHOT_BACKEND = os.environ.get('SNAPSHOT_BACKEND', 'file')
+    SNAPSHOT_DIR = os.environ.get('SNAPSHOT_DIR', 'cache/snapshots')
+    REDIS_URL = os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
+    
+    # Programador de actualización en segundo plano
+    SCHEDULER_ENABLED = os.environ.get('SCHEDULER_ENABLED', 'true').lower() == 'true'
+    SCHEDULER_JITTER_SECONDS = 30
+    SCHEDULER_MAX_BACKOFF_SECONDS = 1800
+    SHEET_REFRESH_INTERVALS = {
+        'actividades': 300,
+        'el_consuelo': 600
+    }
+    # Reprocesar solo las filas agregadas o modificadas
+    INCREMENTAL_SYNC = True
+    # Motor de procesamiento de actividades: 'python' (por filas) o 'pandas' (por columnas);
+    # con INCREMENTAL_SYNC procesa la carga inicial y las filas cambiadas
+    DATA_ENGINE = os.environ.get('DATA_ENGINE', 'python')
+    # Resultados procesados memorizados por huella de los datos
+    PROCESSED_CACHE_SIZE = 8
+    
+    # Gráficos serializados en caché (CHART_CACHE_DIR=None: solo en memoria)
+    CHART_CACHE_SIZE = 32
+    CHART_CACHE_DIR = os.environ.get('CHART_CACHE_DIR', 'cache/charts')
+    
+    # Métricas de rendimiento en /metrics y encabezado Server-Timing
+    METRICS_ENABLED = True
+    SERVER_TIMING_ENABLED = os.environ.get('SERVER_TIMING_ENABLED', 'true').lower() == 'true'
+    
+    # Serialización JSON con orjson y cuerpos de /api/data serializados una vez por versión
+    FAST_JSON = os.environ.get('FAST_JSON', 'true').lower() == 'true'
+    PAYLOAD_CACHE_SIZE = 4
+    STREAM_CHUNK_SIZE = 256 * 1024
+    
+    # Paginación de /api/data
+    API_DEFAULT_PAGE_SIZE = 100
+    API_MAX_PAGE_SIZE = 1000
+    
     # Configuración de logging
-    LOG_LEVEL = 'INFO'
+    LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
     LOG_FILE = 'logs/app.log'
+    LOG_RATE_LIMIT_BURST = int(os.environ.get('LOG_RATE_LIMIT_BURST', 5))
+    LOG_RATE_LIMIT_SECONDS = 60
     
     # Configuración de seguridad
     SESSION_COOKIE_SECURE = True
@@ -0,0 +1,277 @@
+"""
+Servicio de caché en memoria para datos de Google Sheets
+"""
+
+import threading
+import time
+import logging
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class CacheEntry:
+    """Valor almacenado en caché junto con el instante en que se obtuvo"""
+
+    def __init__(self, value: Any, fetched_at: float):
+        self.value = value
+        self.fetched_at = fetched_at
+
+    def age(self, now: Optional[float] = None) -> float:
+        """Segundos transcurridos desde que se obtuvo el valor"""
+        return (now if now is not None else time.monotonic()) - self.fetched_at
+
+
+class SheetCache:
+    """
+    Caché por ID de hoja con TTL y stale-while-revalidate
+
+    Mientras la entrada está vigente se sirve desde memoria. Cuando vence el
+    TTL se sigue entregando la copia anterior de inmediato y se lanza una
+    única actualización en segundo plano para esa llave.
+
+    Cada llave tiene una generación que aumenta al invalidarla: una carga
+    iniciada antes de invalidate() o clear() descarta su resultado en lugar
+    de volver a guardar el valor que se acaba de eliminar.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[str, CacheEntry] = {}
+        self._refreshing = set()
+        self._generations: Dict[str, int] = {}
+        self._epoch = 0
+        self._lock = threading.Lock()
+
+    def _generation(self, key: str):
+        """Generación actual de una llave (llamar con el lock tomado)"""
+        return self._epoch, self._generations.get(key, 0)
+
+    def _store_if_current(self, key: str, value: Any, generation) -> bool:
+        """Guarda el valor si la llave no se invalidó desde que empezó la carga"""
+        with self._lock:
+            if self._generation(key) != generation:
+                logger.debug(f"Se descarta la carga de {key}: la llave se invalidó mientras se cargaba")
+                return False
+            self._entries[key] = CacheEntry(value, time.monotonic())
+            return True
+
+    def get_or_load(self, key: str, loader: Callable[[], Any]) -> Any:
+        """
+        Obtiene el valor de la llave, cargándolo con `loader` si hace falta
+
+        Args:
+            key: Llave de la caché (ID de la hoja)
+            loader: Función sin argumentos que obtiene el valor; si retorna
+                None el resultado no se guarda en caché
+
+        Returns:
+            Valor en caché (posiblemente vencido) o el recién cargado
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            generation = self._generation(key)
+            if entry is not None:
+                if entry.age() >= self.ttl_seconds and key not in self._refreshing:
+                    self._refreshing.add(key)
+                    threading.Thread(
+                        target=self._refresh,
+                        args=(key, loader, generation),
+                        name=f"sheet-cache-refresh-{key}",
+                        daemon=True
+                    ).start()
+                return entry.value
+
+        # Sin copia previa: carga síncrona
+        value = loader()
+        if value is not None:
+            self._store_if_current(key, value, generation)
+        return value
+
+    def _refresh(self, key: str, loader: Callable[[], Any], generation):
+        """
+        Actualiza una llave vencida en segundo plano
+        """
+        try:
+            value = loader()
+            if value is not None:
+                self._store_if_current(key, value, generation)
+        except Exception as e:
+            logger.error(f"Error refrescando caché de {key}: {str(e)}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Retorna el valor en caché sin disparar cargas, o None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry.value if entry is not None else None
+
+    def set(self, key: str, value: Any):
+        """Guarda un valor en caché con la marca de tiempo actual"""
+        with self._lock:
+            self._entries[key] = CacheEntry(value, time.monotonic())
+
+    def is_fresh(self, key: str) -> bool:
+        """Indica si la llave existe y no ha vencido su TTL"""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and entry.age() < self.ttl_seconds
+
+    def invalidate(self, key: str):
+        """Elimina una llave de la caché"""
+        with self._lock:
+            self._entries.pop(key, None)
+            self._generations[key] = self._generations.get(key, 0) + 1
+
+    def clear(self):
+        """Elimina todas las llaves de la caché"""
+        with self._lock:
+            self._entries.clear()
+            self._generations.clear()
+            self._epoch += 1
+
+
+class _InFlightCall:
+    """Llamada en curso compartida por los hilos que esperan su resultado"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Agrupa llamadas concurrentes con la misma llave en una sola ejecución
+
+    El primer hilo ejecuta la función; los que llegan mientras sigue en curso
+    esperan y reciben el mismo resultado (o la misma excepción).
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, _InFlightCall] = {}
+        self._lock = threading.Lock()
+        self.issued = 0
+        self.coalesced = 0
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """
+        Ejecuta `fn` una sola vez por llave entre los llamadores concurrentes
+
+        Args:
+            key: Llave de agrupación (ID de la hoja)
+            fn: Función sin argumentos a ejecutar
+
+        Returns:
+            Resultado de la ejecución compartida
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = _InFlightCall()
+                self._calls[key] = call
+                self.issued += 1
+                leader = True
+            else:
+                self.coalesced += 1
+                leader = False
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+        return call.result
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Retorna los contadores de llamadas emitidas y agrupadas
+        """
+        with self._lock:
+            total = self.issued + self.coalesced
+            return {
+                'issued': self.issued,
+                'coalesced': self.coalesced,
+                'in_flight': len(self._calls),
+                'fan_in_ratio': (total / self.issued) if self.issued else 0.0
+            }
+
+
+class ResultCache:
+    """
+    Caché LRU acotada de resultados derivados, llave = huella de los datos
+
+    Se usa para no repetir el procesamiento de un mismo snapshot: las
+    peticiones concurrentes de una llave ausente comparten un único cálculo.
+    """
+
+    def __init__(self, max_entries: int = 8):
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[Any, Any]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, key: Any, compute: Callable[[], Any]) -> Any:
+        """
+        Retorna el resultado de la llave, calculándolo con `compute` si falta
+
+        Args:
+            key: Llave del resultado (p. ej. (nombre, huella del snapshot))
+            compute: Función sin argumentos que calcula el resultado
+
+        Returns:
+            Resultado en caché o recién calculado
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+        return self._flight.do(key, lambda: self._compute(key, compute))
+
+    def _compute(self, key: Any, compute: Callable[[], Any]) -> Any:
+        with self._lock:
+            if key in self._entries:
+                return self._entries[key]
+        value = compute()
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        """Elimina todos los resultados"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Retorna los contadores de aciertos y fallos de la caché
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': (self.hits / total) if total else 0.0
+            }
@@ -0,0 +1,153 @@
+"""
+Caché de gráficos serializados (JSON de Plotly listo para responder)
+"""
+
+import hashlib
+import json
+import os
+import threading
+import logging
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Versión del formato de los gráficos; incrementar al cambiar cómo se generan
+# (chart_generator, figure_builder) para no servir gráficos viejos desde disco
+CHART_FORMAT_VERSION = 4
+
+
+class ChartCache:
+    """
+    Caché LRU de gráficos ya serializados
+
+    La llave es (tipo de gráfico, parámetros, versión de los datos, versión del
+    formato) y el valor
+    son los bytes de la respuesta JSON, de modo que servir un gráfico en caché
+    es una copia de bytes. Opcionalmente persiste cada gráfico en disco para
+    que un worker nuevo no tenga que volver a generarlo.
+    """
+
+    def __init__(self, max_entries: int = 32, directory: Optional[str] = None,
+                 max_disk_entries: int = 128):
+        self.max_entries = max_entries
+        self.directory = directory
+        self.max_disk_entries = max_disk_entries
+        self._entries: 'OrderedDict[Tuple, bytes]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def make_key(chart_type: str, data_version: str, params: Optional[Dict[str, Any]] = None) -> Tuple:
+        """Construye la llave de un gráfico"""
+        return (chart_type, tuple(sorted((params or {}).items())), data_version, CHART_FORMAT_VERSION)
+
+    def get_or_render(self, chart_type: str, data_version: str, render: Callable[[], Dict],
+                      params: Optional[Dict[str, Any]] = None) -> bytes:
+        """
+        Retorna el gráfico serializado, generándolo con `render` si no está en caché
+
+        Args:
+            chart_type: Tipo de gráfico (p. ej. 'participacion')
+            data_version: Versión o huella de los datos del gráfico
+            render: Función sin argumentos que retorna el dict del gráfico
+            params: Parámetros adicionales del gráfico
+
+        Returns:
+            bytes: Cuerpo JSON de la respuesta
+        """
+        key = self.make_key(chart_type, data_version, params)
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return body
+
+        body = self._load_from_disk(key)
+        if body is not None:
+            with self._lock:
+                self.disk_hits += 1
+        else:
+            with self._lock:
+                self.misses += 1
+            body = json.dumps(render()).encode('utf-8')
+            self._save_to_disk(key, body)
+
+        self._store(key, body)
+        return body
+
+    def _store(self, key: Tuple, body: bytes):
+        with self._lock:
+            self._entries[key] = body
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _path(self, key: Tuple) -> str:
+        digest = hashlib.blake2b(repr(key).encode('utf-8'), digest_size=16).hexdigest()
+        return os.path.join(self.directory, f"{key[0]}-{digest}.json")
+
+    def _load_from_disk(self, key: Tuple) -> Optional[bytes]:
+        if not self.directory:
+            return None
+        try:
+            with open(self._path(key), 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.error(f"Error leyendo gráfico en caché: {str(e)}")
+            return None
+
+    def _save_to_disk(self, key: Tuple, body: bytes):
+        if not self.directory:
+            return
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(body)
+            os.replace(tmp_path, path)
+            self._prune_disk()
+        except OSError as e:
+            logger.error(f"Error guardando gráfico en caché: {str(e)}")
+
+    def _prune_disk(self):
+        """Elimina los gráficos más antiguos si se supera el máximo en disco"""
+        files = [
+            os.path.join(self.directory, name)
+            for name in os.listdir(self.directory) if name.endswith('.json')
+        ]
+        if len(files) <= self.max_disk_entries:
+            return
+        files.sort(key=os.path.getmtime)
+        for path in files[:len(files) - self.max_disk_entries]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def clear(self):
+        """Elimina los gráficos en memoria (los de disco se conservan)"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Retorna los contadores de la caché de gráficos
+        """
+        with self._lock:
+            total = self.hits + self.disk_hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_ratio': ((self.hits + self.disk_hits) / total) if total else 0.0
+            }
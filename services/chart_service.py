@@ -1,10 +1,11 @@
-import plotly.graph_objects as go
-import plotly.express as px
 from collections import Counter, defaultdict
 from datetime import datetime
 from typing import List, Dict, Optional
-import pandas as pd
 from config.development import DevelopmentConfig
+# Las figuras se arman como dicts planos con la plantilla de plotly exportada a
+# JSON: generar un gráfico no importa plotly
+from services import figure_builder as fb
+from services.metrics import metrics
 
 class ChartGenerator:
     """
@@ -37,6 +38,7 @@ class ChartGenerator:
             'descripcion': 'Descripción de los compromisos'
         }
     
+    @metrics.timed('chart_participacion')
     def generate_participacion_chart(self, data: List[Dict]) -> Dict:
         """
         Genera el gráfico de participación por entidad
@@ -66,7 +68,7 @@ class ChartGenerator:
                 colors.append(self.colors['default'])  # Verde para otras entidades
         
         # Crear gráfico de pie
-        fig = go.Figure(data=[go.Pie(
+        fig = fb.figure([fb.pie_trace(
             labels=entities,
             values=percentages,
             hole=0.4,
@@ -78,19 +80,18 @@ class ChartGenerator:
                          'Actividades: %{customdata}<br>' +
                          '<extra></extra>',
             customdata=[entity_counts[entity] for entity in entities]
-        )])
-        
-        fig.update_layout(
+        )], dict(
             showlegend=False,
             margin=dict(l=0, r=0, t=0, b=0),
             height=400
-        )
+        ))
         
         return {
-            'chart_json': fig.to_json(),
+            'chart_json': fb.to_json(fig),
             'top_entities': self._get_top_entities(entity_counts)
         }
     
+    @metrics.timed('chart_diario')
     def generate_diario_chart(self, data: List[Dict]) -> Dict:
         """
         Genera el gráfico de barras diarias
@@ -137,28 +138,26 @@ class ChartGenerator:
                 colors.append(self.colors['default'])  # Color por defecto
         
         # Crear gráfico de barras
-        fig = go.Figure(data=[go.Bar(
+        fig = fb.figure([fb.bar_trace(
             x=dates,
             y=counts,
-            marker_color=colors,
+            marker=dict(color=colors),
             hovertemplate='<b>Fecha: %{x}</b><br>' +
                          'Actividades: %{y}<br>' +
                          '<extra></extra>'
-        )])
-        
-        fig.update_layout(
-            title='Actividades por Día',
-            xaxis_title='Fecha',
-            yaxis_title='Número de Actividades',
+        )], dict(
+            title=fb.title('Actividades por Día'),
+            xaxis=dict(title=fb.title('Fecha')),
+            yaxis=dict(title=fb.title('Número de Actividades')),
             height=400,
             margin=dict(l=50, r=50, t=50, b=50)
-        )
+        ))
         
         # Crear leyenda personalizada por mes
         legend_data = self._create_month_legend(sorted_dates)
         
         return {
-            'chart_json': fig.to_json(),
+            'chart_json': fb.to_json(fig),
             'legend_data': legend_data
         }
     
@@ -237,25 +236,23 @@ class ChartGenerator:
         counts = [monthly_counts[month] for month in sorted_months]
         
         # Crear gráfico de barras
-        fig = go.Figure(data=[go.Bar(
+        fig = fb.figure([fb.bar_trace(
             x=months,
             y=counts,
-            marker_color=self.colors['default'],
+            marker=dict(color=self.colors['default']),
             hovertemplate='<b>Mes: %{x}</b><br>' +
                          'Actividades: %{y}<br>' +
                          '<extra></extra>'
-        )])
-        
-        fig.update_layout(
-            title=f'Actividades Mensuales - {entity}',
-            xaxis_title='Mes',
-            yaxis_title='Número de Actividades',
+        )], dict(
+            title=fb.title(f'Actividades Mensuales - {entity}'),
+            xaxis=dict(title=fb.title('Mes')),
+            yaxis=dict(title=fb.title('Número de Actividades')),
             height=300,
             margin=dict(l=50, r=50, t=50, b=50)
-        )
+        ))
         
         return {
-            'chart_json': fig.to_json(),
+            'chart_json': fb.to_json(fig),
             'activities_without_dates': entity_data.get('activities_without_dates', [])
         }
     
@@ -0,0 +1,132 @@
+"""
+Registro de conectores de Google Sheets compartidos por todo el proceso
+"""
+
+import threading
+import logging
+from typing import Dict, Optional, Tuple
+
+from services.google_sheets_service import GoogleSheetsConnector
+
+logger = logging.getLogger(__name__)
+
+# Marca de argumento omitido en get(): usar el almacén o la fuente del registro
+_DEFAULT = object()
+
+
+class ConnectorRegistry:
+    """
+    Mantiene un conector autorizado por fuente de credenciales
+
+    Las rutas piden prestado el conector en lugar de crear uno nuevo, de modo
+    que las credenciales se leen y se autorizan una sola vez por proceso. Un
+    hilo en segundo plano renueva los tokens antes de que venzan.
+    """
+
+    def __init__(self, token_refresh_interval: float = 300, snapshot_store=None, sheet_source=None):
+        self.token_refresh_interval = token_refresh_interval
+        # Almacén de snapshots compartido que reciben los conectores nuevos
+        self.snapshot_store = snapshot_store
+        # Fuente de valores compartida (None: Google Sheets con las credenciales de cada conector)
+        self.sheet_source = sheet_source
+        self._connectors: Dict[Tuple[Optional[str], Optional[str], int, int], GoogleSheetsConnector] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._refresh_thread = None
+
+    def get(self, credentials_file: str = None, credentials_env_var: str = None,
+            cache_ttl: float = None, snapshot_store=_DEFAULT, sheet_source=_DEFAULT) -> GoogleSheetsConnector:
+        """
+        Retorna el conector asociado a la fuente de credenciales, creándolo si no existe
+
+        Args:
+            credentials_file: Archivo de credenciales de servicio
+            credentials_env_var: Variable de entorno con el JSON de credenciales
+            cache_ttl: TTL de caché usado solo al crear el conector
+            snapshot_store: Almacén de snapshots (por defecto el del registro)
+            sheet_source: Fuente de valores (por defecto la del registro)
+
+        Returns:
+            GoogleSheetsConnector compartido
+        """
+        with self._lock:
+            if snapshot_store is _DEFAULT:
+                snapshot_store = self.snapshot_store
+            if sheet_source is _DEFAULT:
+                sheet_source = self.sheet_source
+            # La fuente y el almacén forman parte de la clave: un conector nunca
+            # lee de una fuente distinta a la que se le pidió
+            key = (credentials_file, credentials_env_var, id(snapshot_store), id(sheet_source))
+            connector = self._connectors.get(key)
+            if connector is None:
+                connector = GoogleSheetsConnector(
+                    credentials_file=credentials_file,
+                    credentials_env_var=credentials_env_var,
+                    cache_ttl=cache_ttl,
+                    snapshot_store=snapshot_store,
+                    source=sheet_source
+                )
+                self._connectors[key] = connector
+                logger.info(f"Conector de Google Sheets registrado para {key[:2]}")
+            self._ensure_refresh_thread()
+            return connector
+
+    def configure(self, snapshot_store=None, sheet_source=None):
+        """
+        Instala el almacén y la fuente por defecto y descarta los conectores anteriores
+
+        Los conectores ya creados conservan su fuente y su caché, así que se
+        eliminan para que las siguientes llamadas a get() usen los nuevos.
+        """
+        with self._lock:
+            self.snapshot_store = snapshot_store
+            self.sheet_source = sheet_source
+            self._connectors.clear()
+
+    def connectors(self):
+        """Retorna la lista de conectores registrados"""
+        with self._lock:
+            return list(self._connectors.values())
+
+    def _ensure_refresh_thread(self):
+        """Inicia el hilo de renovación de tokens (llamar con el lock tomado)"""
+        if self.token_refresh_interval <= 0:
+            return
+        if self._refresh_thread is None or not self._refresh_thread.is_alive():
+            self._stop.clear()
+            self._refresh_thread = threading.Thread(
+                target=self._refresh_loop,
+                name="sheets-token-refresh",
+                daemon=True
+            )
+            self._refresh_thread.start()
+
+    def _refresh_loop(self):
+        """Renueva periódicamente los tokens de los conectores registrados"""
+        while not self._stop.wait(self.token_refresh_interval):
+            for connector in self.connectors():
+                try:
+                    connector.refresh_token(margin_seconds=2 * self.token_refresh_interval)
+                except Exception as e:
+                    logger.error(f"Error renovando token de Google Sheets: {str(e)}")
+
+    def shutdown(self):
+        """Detiene el hilo de renovación de tokens"""
+        self._stop.set()
+
+    def clear(self):
+        """Elimina todos los conectores registrados"""
+        with self._lock:
+            self._connectors.clear()
+
+
+# Registro compartido por el proceso
+registry = ConnectorRegistry()
+
+
+def get_connector(credentials_file: str = None, credentials_env_var: str = None,
+                  cache_ttl: float = None) -> GoogleSheetsConnector:
+    """
+    Obtiene un conector compartido del registro del proceso
+    """
+    return registry.get(credentials_file, credentials_env_var, cache_ttl)
@@ -1,7 +1,11 @@
-import re
+import logging
 from datetime import datetime
 from typing import List, Dict, Optional, Tuple
 from config import Config
+from services.delta_sync import sheet_fingerprint
+from utils.date_utils import date_normalizer
+
+logger = logging.getLogger(__name__)
 
 class DataManager:
     """
@@ -12,6 +16,7 @@ class DataManager:
         self.data = None
         self.last_update = None
         self.columns_order = None
+        self._fingerprint = None
         self.homicide_reset_date = Config.HOMICIDE_RESET_DATE
         self.homicide_reset_code = Config.HOMICIDE_RESET_CODE
     
@@ -20,112 +25,7 @@ class DataManager:
         Normaliza diferentes formatos de fecha a formato ISO (YYYY-MM-DD)
         Maneja múltiples formatos comunes en español
         """
-        if not date_str or str(date_str).strip() == '':
-            return None
-        
-        date_str = str(date_str).strip()
-        
-        # Si ya es un formato ISO válido, retornarlo
-        if re.match(r'^\d{4}-\d{2}-\d{2}$', date_str):
-            return date_str
-        
-        # Mapeo de meses en español
-        meses_es = {
-            'enero': 1, 'febrero': 2, 'marzo': 3, 'abril': 4, 'mayo': 5, 'junio': 6,
-            'julio': 7, 'agosto': 8, 'septiembre': 9, 'octubre': 10, 'noviembre': 11, 'diciembre': 12,
-            'ene': 1, 'feb': 2, 'mar': 3, 'abr': 4, 'may': 5, 'jun': 6,
-            'jul': 7, 'ago': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dic': 12
-        }
-        
-        try:
-            # Formato: DD/MM/YYYY o DD-MM-YYYY
-            if re.match(r'^\d{1,2}[/-]\d{1,2}[/-]\d{4}$', date_str):
-                if '/' in date_str:
-                    day, month, year = date_str.split('/')
-                else:
-                    day, month, year = date_str.split('-')
-                return f"{year}-{int(month):02d}-{int(day):02d}"
-            
-            # Formato: YYYY/MM/DD o YYYY-MM-DD
-            elif re.match(r'^\d{4}[/-]\d{1,2}[/-]\d{1,2}$', date_str):
-                if '/' in date_str:
-                    year, month, day = date_str.split('/')
-                else:
-                    year, month, day = date_str.split('-')
-                return f"{year}-{int(month):02d}-{int(day):02d}"
-            
-            # Formato: DD de Mes de YYYY (ej: "15 de marzo de 2024")
-            elif re.match(r'^\d{1,2}\s+de\s+[a-zA-Záéíóúñ]+\s+de\s+\d{4}$', date_str, re.IGNORECASE):
-                match = re.match(r'^(\d{1,2})\s+de\s+([a-zA-Záéíóúñ]+)\s+de\s+(\d{4})$', date_str, re.IGNORECASE)
-                if match:
-                    day, month_name, year = match.groups()
-                    month_name = month_name.lower()
-                    if month_name in meses_es:
-                        month = meses_es[month_name]
-                        return f"{year}-{month:02d}-{int(day):02d}"
-            
-            # Formato: Mes DD, YYYY (ej: "marzo 15, 2024")
-            elif re.match(r'^[a-zA-Záéíóúñ]+\s+\d{1,2},\s*\d{4}$', date_str, re.IGNORECASE):
-                match = re.match(r'^([a-zA-Záéíóúñ]+)\s+(\d{1,2}),\s*(\d{4})$', date_str, re.IGNORECASE)
-                if match:
-                    month_name, day, year = match.groups()
-                    month_name = month_name.lower()
-                    if month_name in meses_es:
-                        month = meses_es[month_name]
-                        return f"{year}-{month:02d}-{int(day):02d}"
-            
-            # Formato: DD Mes YYYY (ej: "15 marzo 2024")
-            elif re.match(r'^\d{1,2}\s+[a-zA-Záéíóúñ]+\s+\d{4}$', date_str, re.IGNORECASE):
-                match = re.match(r'^(\d{1,2})\s+([a-zA-Záéíóúñ]+)\s+(\d{4})$', date_str, re.IGNORECASE)
-                if match:
-                    day, month_name, year = match.groups()
-                    month_name = month_name.lower()
-                    if month_name in meses_es:
-                        month = meses_es[month_name]
-                        return f"{year}-{month:02d}-{int(day):02d}"
-            
-            # Formato: DD/MM/YY (año de 2 dígitos)
-            elif re.match(r'^\d{1,2}/\d{1,2}/\d{2}$', date_str):
-                day, month, year = date_str.split('/')
-                # Asumir años 20xx para años de 2 dígitos
-                full_year = f"20{year}" if int(year) < 50 else f"19{year}"
-                return f"{full_year}-{int(month):02d}-{int(day):02d}"
-            
-            # Formato: DD.MM.YYYY (con puntos)
-            elif re.match(r'^\d{1,2}\.\d{1,2}\.\d{4}$', date_str):
-                day, month, year = date_str.split('.')
-                return f"{year}-{int(month):02d}-{int(day):02d}"
-            
-            # Formato: DD/MM/YYYY con espacios
-            elif re.match(r'^\d{1,2}\s*/\s*\d{1,2}\s*/\s*\d{4}$', date_str):
-                parts = re.split(r'\s*/\s*', date_str)
-                day, month, year = parts
-                return f"{year}-{int(month):02d}-{int(day):02d}"
-            
-            # Intentar parsear con datetime.strptime para otros formatos
-            else:
-                # Lista de formatos comunes a intentar
-                formats = [
-                    '%d/%m/%Y', '%d-%m-%Y', '%Y/%m/%d', '%Y-%m-%d',
-                    '%d/%m/%y', '%d-%m-%y', '%Y/%m/%d', '%Y-%m-%d',
-                    '%d %B %Y', '%d %b %Y', '%B %d, %Y', '%b %d, %Y',
-                    '%d.%m.%Y', '%d.%m.%y', '%Y.%m.%d'
-                ]
-                
-                for fmt in formats:
-                    try:
-                        parsed_date = datetime.strptime(date_str, fmt)
-                        return parsed_date.strftime('%Y-%m-%d')
-                    except ValueError:
-                        continue
-            
-            # Si no se pudo parsear, retornar None
-            print(f"⚠️ No se pudo normalizar la fecha: '{date_str}'")
-            return None
-            
-        except Exception as e:
-            print(f"❌ Error normalizando fecha '{date_str}': {e}")
-            return None
+        return date_normalizer.normalize(date_str)
     
     def process_sheet_data(self, data: List[Dict]) -> List[Dict]:
         """
@@ -134,35 +34,25 @@ class DataManager:
         if not data:
             return data
         
-        processed_data = []
-        fechas_procesadas = 0
-        fechas_originales = 0
+        # Normalizar la columna de fecha final de ejecución en un solo paso
+        fecha_key = Config.IMPORTANT_COLUMNS['fecha_ejecucion']
+        processed_data = [row.copy() for row in data]
+        rows_with_date = [row for row in processed_data if fecha_key in row]
+        originales = [row[fecha_key] for row in rows_with_date]
+        normalizadas = date_normalizer.normalize_column(originales)
         
-        for i, row in enumerate(data):
-            processed_row = row.copy()
-            
-            # Normalizar la columna de fecha final de ejecución
-            fecha_key = Config.IMPORTANT_COLUMNS['fecha_ejecucion']
-            if fecha_key in processed_row:
-                fecha_original = processed_row[fecha_key]
-                fecha_normalizada = self.normalize_date(fecha_original)
-                processed_row[fecha_key] = fecha_normalizada
-                
-                # Contar fechas procesadas
-                if fecha_original and str(fecha_original).strip() != '':
-                    fechas_originales += 1
-                    if fecha_normalizada:
-                        fechas_procesadas += 1
-                        print(f"✅ Fecha {i+1}: '{fecha_original}' → '{fecha_normalizada}'")
-                    else:
-                        print(f"❌ Fecha {i+1}: '{fecha_original}' → No se pudo normalizar")
-            
-            processed_data.append(processed_row)
+        fechas_originales = 0
+        fechas_procesadas = 0
+        for row, fecha_original, fecha_normalizada in zip(rows_with_date, originales, normalizadas):
+            row[fecha_key] = fecha_normalizada
+            # Contar fechas procesadas
+            if fecha_original and str(fecha_original).strip() != '':
+                fechas_originales += 1
+                if fecha_normalizada:
+                    fechas_procesadas += 1
         
-        print(f"\n📊 Resumen de procesamiento de fechas:")
-        print(f"   Total de fechas originales: {fechas_originales}")
-        print(f"   Fechas normalizadas exitosamente: {fechas_procesadas}")
-        print(f"   Fechas que fallaron: {fechas_originales - fechas_procesadas}")
+        logger.info(f"Fechas normalizadas: {fechas_procesadas} de {fechas_originales} "
+                    f"({fechas_originales - fechas_procesadas} fallaron); por formato: {date_normalizer.stats()}")
         
         return processed_data
     
@@ -170,21 +60,22 @@ class DataManager:
         """
         Actualiza los datos y verifica si hubo cambios
         """
-        processed_data = self.process_sheet_data(new_data)
-        
-        # Verificar si hubo cambios
+        # Verificar si hubo cambios comparando la huella de la hoja cruda
+        fingerprint = sheet_fingerprint(new_data, columns_order)
         data_changed = (
-            self.data != processed_data or 
+            self._fingerprint != fingerprint or 
             self.columns_order != columns_order
         )
         
         if data_changed:
+            processed_data = self.process_sheet_data(new_data)
             self.data = processed_data
             self.columns_order = columns_order
+            self._fingerprint = fingerprint
             self.last_update = datetime.now()
-            print(f"Datos actualizados: {len(processed_data)} registros (cambio detectado)")
+            logger.info(f"Datos actualizados: {len(processed_data)} registros (cambio detectado)")
         else:
-            print("No hubo cambios en los datos de Google Sheets")
+            logger.info("No hubo cambios en los datos de Google Sheets")
         
         return data_changed
     
@@ -2,15 +2,19 @@
 Servicio para manejo de datos
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 import logging
 
-from utils.data_utils import clean_numeric_value, clean_text_value, validate_required_fields
-from utils.date_utils import parse_date, is_valid_date
+from utils.data_utils import clean_numeric_value, clean_text_value
+from utils.date_utils import DATE_FORMATS, parse_date, is_valid_date
+from services.metrics import metrics
 
 logger = logging.getLogger(__name__)
 
+# Prefijo de los errores de campos requeridos faltantes
+MISSING_FIELD_PREFIX = "Campo faltante: "
+
 class DataService:
     """Servicio para procesamiento y validación de datos"""
     
@@ -21,11 +25,18 @@ class DataService:
             'Fecha final de ejecución',
             'Población impactada'
         ]
+        # Llaves de columnas resueltas por conjunto de encabezados
+        self._plans: Dict[tuple, Tuple] = {}
     
+    @metrics.timed('process')
     def process_raw_data(self, raw_data: List[Dict]) -> Dict[str, Any]:
         """
         Procesa datos crudos y los valida
         
+        Validación, limpieza de población, revisión de fechas y estadísticas
+        se hacen en una sola pasada; los encabezados se normalizan una vez por
+        hoja y cada fila se resuelve con las llaves ya calculadas.
+        
         Args:
             raw_data: Datos crudos de Google Sheets
             
@@ -33,8 +44,22 @@ class DataService:
             Dict con datos procesados y estadísticas
         """
         try:
-            # Validar campos requeridos
-            validation = validate_required_fields(raw_data, self.required_fields)
+            validation = {
+                'valid': True,
+                'missing_fields': [],
+                'invalid_records': [],
+                'total_records': len(raw_data)
+            }
+            if not raw_data:
+                validation['valid'] = False
+                validation['missing_fields'] = self.required_fields
+            else:
+                # Campos requeridos ausentes en los encabezados
+                required_keys = self._column_plan(raw_data[0])[0]
+                for field, key in required_keys:
+                    if key is None:
+                        validation['missing_fields'].append(field)
+                        validation['valid'] = False
             
             if not validation['valid']:
                 logger.warning(f"Campos faltantes: {validation['missing_fields']}")
@@ -49,8 +74,10 @@ class DataService:
                 'valid_dates': 0,
                 'invalid_dates': 0
             }
+            invalid_records = validation['invalid_records']
+            prefix_length = len(MISSING_FIELD_PREFIX)
             
-            for record in raw_data:
+            for index, record in enumerate(raw_data):
                 processed_record = self._process_record(record)
                 processed_data.append(processed_record)
                 
@@ -65,6 +92,10 @@ class DataService:
                         stats['invalid_dates'] += 1
                 else:
                     stats['invalid_records'] += 1
+                    invalid_records.append({
+                        'index': index,
+                        'missing_fields': [error[prefix_length:] for error in processed_record['errors']]
+                    })
             
             return {
                 'data': processed_data,
@@ -77,34 +108,46 @@ class DataService:
             logger.error(f"Error procesando datos: {str(e)}")
             raise
     
+    def _column_plan(self, record: Dict) -> Tuple:
+        """
+        Resuelve una vez por conjunto de encabezados las llaves reales de las columnas
+        
+        Returns:
+            Tupla (pares (campo requerido, llave o None), llave de población, llave de fecha)
+        """
+        keys = tuple(record)
+        plan = self._plans.get(keys)
+        if plan is None:
+            # Normalizar claves del registro
+            record_keys = {k.strip(): k for k in keys}
+            plan = (
+                [(field, record_keys.get(field)) for field in self.required_fields],
+                record_keys.get('Población impactada'),
+                record_keys.get('Fecha final de ejecución')
+            )
+            if len(self._plans) >= 32:
+                self._plans.clear()
+            self._plans[keys] = plan
+        return plan
+    
     def _process_record(self, record: Dict) -> Dict:
         """
         Procesa un registro individual
         """
-        processed = {
+        required_keys, pop_key, date_key = self._column_plan(record)
+        # Validar campos requeridos
+        errors = [
+            f"{MISSING_FIELD_PREFIX}{field}"
+            for field, key in required_keys
+            if key is None or not record[key]
+        ]
+        return {
             'original': record,
-            'is_valid': True,
-            'has_valid_date': False,
-            'population_impacted': 0,
-            'errors': []
+            'is_valid': not errors,
+            'has_valid_date': is_valid_date(record[date_key] if date_key else ''),
+            'population_impacted': clean_numeric_value(record[pop_key] if pop_key else 0),
+            'errors': errors
         }
-        # Normalizar claves del registro
-        record_keys = {k.strip(): k for k in record.keys()}
-        # Procesar población impactada
-        pop_key = record_keys.get('Población impactada', None)
-        population = record.get(pop_key, 0) if pop_key else 0
-        processed['population_impacted'] = clean_numeric_value(population)
-        # Procesar fecha
-        date_key = record_keys.get('Fecha final de ejecución', None)
-        date_str = record.get(date_key, '') if date_key else ''
-        processed['has_valid_date'] = is_valid_date(date_str)
-        # Validar campos requeridos
-        for field in self.required_fields:
-            key = record_keys.get(field, None)
-            if not key or not record.get(key):
-                processed['errors'].append(f"Campo faltante: {field}")
-                processed['is_valid'] = False
-        return processed
     
     def get_entity_statistics(self, data: List[Dict]) -> Dict[str, Any]:
         """
@@ -175,4 +218,166 @@ class DataService:
         for date_key in date_stats:
             date_stats[date_key]['entities'] = list(date_stats[date_key]['entities'])
         
-        return date_stats 
\ No newline at end of file
+        return date_stats
+
+
+class VectorizedDataService(DataService):
+    """
+    Motor por columnas de DataService sobre un DataFrame de pandas
+    
+    Revisa campos requeridos, limpia la población y valida fechas con
+    operaciones vectorizadas; el resultado es idéntico al del motor por filas.
+    """
+    
+    @metrics.timed('process')
+    def process_raw_data(self, raw_data: List[Dict]) -> Dict[str, Any]:
+        """
+        Procesa datos crudos y los valida por columnas
+        
+        Si las filas no comparten encabezados se usa el motor por filas.
+        """
+        if not raw_data:
+            return super().process_raw_data(raw_data)
+        table = getattr(raw_data, 'table', None)
+        first_keys = raw_data[0].keys()
+        if table is None and any(record.keys() != first_keys for record in raw_data):
+            return super().process_raw_data(raw_data)
+        
+        try:
+            import pandas as pd
+            
+            records = list(raw_data)
+            required_keys, pop_key, date_key = self._column_plan(records[0])
+            keys = {key for _, key in required_keys if key is not None}
+            keys.update(key for key in (pop_key, date_key) if key is not None)
+            if table is not None:
+                frame = pd.DataFrame({key: pd.Series(table.column(key), dtype=object) for key in keys})
+            else:
+                frame = pd.DataFrame({key: pd.Series([record[key] for record in records], dtype=object)
+                                      for key in keys})
+            
+            validation = {
+                'valid': True,
+                'missing_fields': [],
+                'invalid_records': [],
+                'total_records': len(records)
+            }
+            missing_columns = []
+            for field, key in required_keys:
+                if key is None:
+                    validation['missing_fields'].append(field)
+                    validation['valid'] = False
+                    missing_columns.append((field, None))
+                else:
+                    column = frame[key]
+                    missing_columns.append((field, (column.isna() | (column == '')).to_numpy()))
+            if not validation['valid']:
+                logger.warning(f"Campos faltantes: {validation['missing_fields']}")
+            
+            population = self._clean_numeric_column(frame[pop_key]) if pop_key else [0.0] * len(records)
+            valid_dates = self._valid_date_column(frame[date_key]) if date_key else [False] * len(records)
+            
+            # Errores por fila: solo se arman listas para las filas con faltantes
+            errors_by_row = {}
+            for field, mask in missing_columns:
+                error = f"{MISSING_FIELD_PREFIX}{field}"
+                rows = range(len(records)) if mask is None else mask.nonzero()[0].tolist()
+                for index in rows:
+                    errors_by_row.setdefault(index, []).append(error)
+            
+            processed_data = []
+            stats = {
+                'total_records': len(records),
+                'valid_records': 0,
+                'invalid_records': 0,
+                'total_population': 0,
+                'valid_dates': 0,
+                'invalid_dates': 0
+            }
+            prefix_length = len(MISSING_FIELD_PREFIX)
+            for index, (record, population_impacted, has_valid_date) in enumerate(
+                    zip(records, population, valid_dates)):
+                errors = errors_by_row.get(index, [])
+                processed_data.append({
+                    'original': record,
+                    'is_valid': not errors,
+                    'has_valid_date': has_valid_date,
+                    'population_impacted': population_impacted,
+                    'errors': errors
+                })
+                if errors:
+                    stats['invalid_records'] += 1
+                    validation['invalid_records'].append({
+                        'index': index,
+                        'missing_fields': [error[prefix_length:] for error in errors]
+                    })
+                else:
+                    stats['valid_records'] += 1
+                    stats['total_population'] += population_impacted
+                    if has_valid_date:
+                        stats['valid_dates'] += 1
+                    else:
+                        stats['invalid_dates'] += 1
+            
+            return {
+                'data': processed_data,
+                'validation': validation,
+                'statistics': stats,
+                'processed_at': datetime.now().isoformat()
+            }
+            
+        except Exception as e:
+            logger.error(f"Error procesando datos por columnas: {str(e)}")
+            raise
+    
+    @staticmethod
+    def _clean_numeric_column(column) -> List[float]:
+        """clean_numeric_value aplicado a toda la columna"""
+        import pandas as pd
+        
+        is_text = column.map(lambda value: isinstance(value, str)).to_numpy(dtype=bool)
+        text = column[is_text].astype(object)
+        cleaned = text.str.replace(r'[^\d.,]', '', regex=True).str.replace(',', '.', regex=False)
+        numbers = pd.to_numeric(cleaned, errors='coerce')
+        result = pd.Series(0.0, index=column.index, dtype=float)
+        result[is_text] = numbers.fillna(0.0).to_numpy(dtype=float)
+        # Lo que pandas no reconoce (o los valores no textuales) se revisa con la función original
+        recheck = ~is_text
+        recheck[is_text] = (numbers.isna() & (cleaned != '')).to_numpy(dtype=bool)
+        for index in recheck.nonzero()[0]:
+            result.iat[index] = clean_numeric_value(column.iat[index])
+        return result.tolist()
+    
+    @staticmethod
+    def _valid_date_column(column) -> List[bool]:
+        """is_valid_date aplicado a toda la columna con formatos explícitos"""
+        import pandas as pd
+        
+        text = column.where(column.map(lambda value: isinstance(value, str)), '').astype(object)
+        valid = pd.Series(False, index=column.index)
+        for fmt in DATE_FORMATS:
+            pending = ~valid
+            if not pending.any():
+                break
+            parsed = pd.to_datetime(text[pending], format=fmt, errors='coerce')
+            valid[pending] = parsed.notna()
+        # Fechas que pandas no acepta pero strptime sí (p. ej. fuera de rango)
+        unresolved = (~valid) & (text != '')
+        if unresolved.any():
+            checked = {value: is_valid_date(value) for value in text[unresolved].unique()}
+            valid[unresolved] = text[unresolved].map(checked)
+        return valid.astype(bool).tolist()
+
+
+def create_data_service(config) -> DataService:
+    """
+    Crea el servicio de datos según DATA_ENGINE ('python' o 'pandas')
+    """
+    engine = (config.get('DATA_ENGINE') or 'python').lower()
+    if engine == 'pandas':
+        try:
+            import pandas  # noqa: F401
+            return VectorizedDataService()
+        except ImportError:
+            logger.warning("pandas no está instalado; se usa el motor por filas")
+    return DataService()
@@ -0,0 +1,214 @@
+"""
+Sincronización incremental de hojas mediante huellas por fila
+"""
+
+import hashlib
+import logging
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from services.data_service import DataService, MISSING_FIELD_PREFIX
+
+logger = logging.getLogger(__name__)
+
+FIELD_SEPARATOR = '\x1f'
+
+
+def _values_fingerprint(values) -> str:
+    content = FIELD_SEPARATOR.join(str(value) for value in values)
+    return hashlib.blake2b(content.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def row_fingerprint(row: Dict) -> str:
+    """
+    Calcula el hash del contenido de una fila
+    """
+    return _values_fingerprint(row.values())
+
+
+def row_fingerprints(data: List[Dict]) -> List[str]:
+    """
+    Calcula el hash de cada fila; sobre una SheetTable recorre las columnas
+    sin construir los diccionarios de las filas
+    """
+    table = getattr(data, 'table', None)
+    if table is not None:
+        return [_values_fingerprint(values) for values in table.iter_row_values()]
+    return [row_fingerprint(row) for row in data]
+
+
+def sheet_fingerprint(data: List[Dict], headers: Optional[List[str]] = None) -> str:
+    """
+    Calcula una huella de toda la hoja a partir de las huellas de sus filas
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    if headers is None and data:
+        headers = list(data[0].keys())
+    digest.update(FIELD_SEPARATOR.join(headers or []).encode('utf-8'))
+    for fingerprint in row_fingerprints(data):
+        digest.update(fingerprint.encode('ascii'))
+    return digest.hexdigest()
+
+
+class DeltaSync:
+    """
+    Mantiene el resultado procesado de una hoja y lo actualiza por diferencias
+
+    Las filas se identifican por su posición (las hojas de respuestas de
+    formularios solo crecen al final). En cada sincronización se comparan
+    las huellas de las filas, se reprocesan solo las agregadas o modificadas
+    y se ajustan las estadísticas con la contribución de cada fila.
+
+    Las sincronizaciones se serializan con un lock: pueden llegar a la vez
+    desde el hilo del programador y desde una petición (/api/refresh).
+    """
+
+    def __init__(self, data_service: DataService = None, change_log_size: int = 50):
+        self.data_service = data_service or DataService()
+        self.version = 0
+        self.change_log = deque(maxlen=change_log_size)
+        self._headers: List[str] = []
+        self._hashes: List[str] = []
+        self._processed: List[Dict] = []
+        self._stats = self._empty_statistics()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _empty_statistics() -> Dict[str, Any]:
+        return {
+            'total_records': 0,
+            'valid_records': 0,
+            'invalid_records': 0,
+            'total_population': 0,
+            'valid_dates': 0,
+            'invalid_dates': 0
+        }
+
+    def _apply(self, record: Dict, sign: int):
+        """Suma (sign=1) o resta (sign=-1) la contribución de un registro a las estadísticas"""
+        stats = self._stats
+        stats['total_records'] += sign
+        if record['is_valid']:
+            stats['valid_records'] += sign
+            stats['total_population'] += sign * record['population_impacted']
+            if record['has_valid_date']:
+                stats['valid_dates'] += sign
+            else:
+                stats['invalid_dates'] += sign
+        else:
+            stats['invalid_records'] += sign
+
+    def _reset(self):
+        self._hashes = []
+        self._processed = []
+        self._stats = self._empty_statistics()
+
+    def sync(self, raw_data: List[Dict]) -> Dict[str, Any]:
+        """
+        Sincroniza la hoja y retorna el resultado procesado versionado
+
+        Args:
+            raw_data: Registros crudos de Google Sheets
+
+        Returns:
+            Dict con la misma forma que DataService.process_raw_data más
+            'version' y 'changes' (filas agregadas, modificadas y eliminadas)
+        """
+        with self._lock:
+            return self._sync(raw_data)
+
+    def _sync(self, raw_data: List[Dict]) -> Dict[str, Any]:
+        """Sincronización con el lock tomado"""
+        headers = list(raw_data[0].keys()) if raw_data else []
+        if headers != self._headers:
+            # Un cambio de encabezados invalida todas las filas
+            self._reset()
+            self._headers = headers
+
+        new_hashes = row_fingerprints(raw_data)
+        old_count = len(self._hashes)
+        new_count = len(new_hashes)
+
+        # Filas eliminadas al final de la hoja
+        for index in range(new_count, old_count):
+            self._apply(self._processed[index], -1)
+        del self._processed[new_count:]
+
+        modified = []
+        for index in range(min(old_count, new_count)):
+            if new_hashes[index] != self._hashes[index]:
+                modified.append(index)
+        appended = list(range(old_count, new_count))
+
+        # Las filas nuevas o cambiadas se procesan en un solo lote con el motor
+        # configurado (por filas o por columnas con pandas)
+        if old_count == 0:
+            records = self._process_records(raw_data)
+        else:
+            records = self._process_records([raw_data[index] for index in modified + appended])
+        for index, record in zip(modified, records):
+            self._apply(self._processed[index], -1)
+            self._processed[index] = record
+            self._apply(record, 1)
+        for record in records[len(modified):]:
+            self._processed.append(record)
+            self._apply(record, 1)
+
+        self._hashes = new_hashes
+        changes = {
+            'appended': len(appended),
+            'modified': len(modified),
+            'deleted': max(old_count - new_count, 0)
+        }
+        if self.version == 0 or any(changes.values()):
+            self.version += 1
+            self.change_log.append(dict(changes, version=self.version, synced_at=datetime.now().isoformat()))
+            logger.info(f"Sincronización incremental v{self.version}: {changes}")
+
+        return {
+            'data': list(self._processed),
+            'validation': self._build_validation(),
+            'statistics': dict(self._stats),
+            'processed_at': datetime.now().isoformat(),
+            'version': self.version,
+            'changes': changes
+        }
+
+    def _process_records(self, rows: List[Dict]) -> List[Dict]:
+        """Procesa un lote de filas con el motor del servicio de datos"""
+        if not len(rows):
+            return []
+        return self.data_service.process_raw_data(rows)['data']
+
+    def _build_validation(self) -> Dict[str, Any]:
+        """
+        Construye el resultado de validación a partir de los registros procesados
+        """
+        required_fields = self.data_service.required_fields
+        validation = {
+            'valid': True,
+            'missing_fields': [],
+            'invalid_records': [],
+            'total_records': len(self._processed)
+        }
+        if not self._processed:
+            validation['valid'] = False
+            validation['missing_fields'] = required_fields
+            return validation
+
+        normalized_headers = {h.strip() for h in self._headers}
+        for field in required_fields:
+            if field not in normalized_headers:
+                validation['missing_fields'].append(field)
+                validation['valid'] = False
+
+        prefix_length = len(MISSING_FIELD_PREFIX)
+        for index, record in enumerate(self._processed):
+            if record['errors']:
+                validation['invalid_records'].append({
+                    'index': index,
+                    'missing_fields': [error[prefix_length:] for error in record['errors']]
+                })
+        return validation
@@ -0,0 +1,136 @@
+"""
+Constructor ligero de figuras de Plotly como diccionarios planos
+
+Genera directamente el JSON que produciría `go.Figure(...).to_json()` para
+los gráficos de torta y barras del tablero, sin la validación ni la
+construcción de objetos de plotly.graph_objects.
+"""
+
+import json
+import logging
+import os
+from importlib import metadata
+from typing import Any, Dict, List, Optional
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depende del entorno
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# Plantilla por defecto de plotly exportada a JSON, para no importar plotly al
+# generar la primera figura de cada worker (regenerar con export_default_template)
+TEMPLATE_PATH = os.path.join(os.path.dirname(__file__), 'plotly_template.json')
+
+_templates: Dict[str, Optional[Dict]] = {}
+
+
+def default_template() -> Optional[Dict]:
+    """
+    Plantilla por defecto de plotly (la que agrega `fig.to_json()`)
+
+    Se lee una sola vez por proceso del JSON incluido en el repositorio; si
+    falta, las figuras se generan sin plantilla y Plotly.js aplica sus
+    valores por defecto.
+
+    Raises:
+        RuntimeError: Si la plantilla se exportó con una versión de plotly
+            distinta de la instalada
+    """
+    if 'default' not in _templates:
+        try:
+            with open(TEMPLATE_PATH, encoding='utf-8') as f:
+                document = json.load(f)
+            template = document['template']
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"No se pudo leer la plantilla de plotly, las figuras se generan sin plantilla: {e}")
+            template = None
+        else:
+            check_template_version(document.get('plotly_version'))
+        _templates['default'] = template
+    return _templates['default']
+
+
+def check_template_version(exported_version: Optional[str]):
+    """
+    Verifica que la plantilla corresponda a la versión instalada de plotly
+
+    Sin plotly instalado no hay con qué comparar y se acepta la plantilla.
+
+    Raises:
+        RuntimeError: Si las versiones no coinciden
+    """
+    try:
+        installed_version = metadata.version('plotly')
+    except metadata.PackageNotFoundError:
+        return
+    if installed_version != exported_version:
+        raise RuntimeError(
+            f"La plantilla {TEMPLATE_PATH} se exportó con plotly {exported_version} pero está instalado "
+            f"plotly {installed_version}; regenerarla con figure_builder.export_default_template()"
+        )
+
+
+def export_default_template(path: str = TEMPLATE_PATH) -> str:
+    """
+    Exporta la plantilla por defecto de la versión instalada de plotly
+
+    Returns:
+        Ruta del archivo escrito
+    """
+    import plotly
+    import plotly.io as pio
+
+    name = pio.templates.default
+    document = {
+        'plotly_version': plotly.__version__,
+        'name': name,
+        'template': pio.templates[name].to_plotly_json() if name else None
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(document, f, ensure_ascii=False, indent=1, sort_keys=True)
+        f.write('\n')
+    _templates.pop('default', None)
+    return path
+
+
+def pie_trace(labels: List, values: List, **props) -> Dict[str, Any]:
+    """Traza de torta con las propiedades indicadas (mismos nombres que go.Pie)"""
+    trace = {'labels': list(labels), 'values': list(values)}
+    trace.update(props)
+    trace['type'] = 'pie'
+    return trace
+
+
+def bar_trace(x: List, y: List, **props) -> Dict[str, Any]:
+    """Traza de barras con las propiedades indicadas (mismos nombres que go.Bar)"""
+    trace = {'x': list(x), 'y': list(y)}
+    trace.update(props)
+    trace['type'] = 'bar'
+    return trace
+
+
+def title(text: str) -> Dict[str, str]:
+    """Título en la forma que usa el esquema de Plotly"""
+    return {'text': text}
+
+
+def figure(data: List[Dict], layout: Optional[Dict] = None) -> Dict[str, Any]:
+    """
+    Figura completa con la plantilla por defecto en el layout
+    """
+    layout = dict(layout or {})
+    template = default_template()
+    if template is not None:
+        layout['template'] = template
+    return {'data': data, 'layout': layout}
+
+
+def to_json(fig: Dict[str, Any]) -> str:
+    """
+    Serializa la figura con orjson si está disponible
+    """
+    if orjson is not None:
+        return orjson.dumps(fig).decode('utf-8')
+    return json.dumps(fig, separators=(',', ':'))
@@ -1,133 +1,209 @@
-import os
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
+import logging
 from typing import Optional, Tuple, List, Dict
 from config.development import DevelopmentConfig
 from datetime import datetime
-import json  # <-- Agregado para parsear JSON desde variable de entorno
+
+from services.cache_service import SheetCache, SingleFlight
+from services.snapshot_store import SnapshotStore, build_snapshot, snapshot_age, snapshot_table
+from services.sheet_table import SheetTable
+from services.sheet_sources import GspreadSource, SheetSource
+from services.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Hoja de actividades por defecto (archivo config.py original)
+DEFAULT_SHEET_ID = '1v4duGwbae0AAHPAEXsGZPZqWI35JkgHyhHg4yHTIpPU'
+
+# Hoja de encuestas de El Consuelo y sus credenciales
+CONSUELO_SHEET_ID = '1265C_6-JZ-ZzeUD4RRZ1cKoVYOVvysztvWLx63dh2TM'
+CONSUELO_CREDENTIALS_FILE = 'credentials/credentials_consuelo.json'
+CONSUELO_CREDENTIALS_ENV_VAR = 'GOOGLE_CREDENTIALS_CONSUELO_JSON'
 
 class GoogleSheetsConnector:
     """
     Clase para manejar la conexión y obtención de datos de Google Sheets
     """
     
-    def __init__(self, credentials_file: str = None, credentials_env_var: str = None):
+    def __init__(self, credentials_file: str = None, credentials_env_var: str = None, cache_ttl: float = None,
+                 snapshot_store: SnapshotStore = None, refresh_lock_ttl: float = 60,
+                 source: SheetSource = None):
         self.credentials_file = credentials_file or DevelopmentConfig.GOOGLE_SHEETS_CREDENTIALS_FILE
         self.credentials_env_var = credentials_env_var or "GOOGLE_CREDENTIALS_JSON"
         self.scopes = DevelopmentConfig.GOOGLE_SHEETS_SCOPES
-        self.client = None
-        self._cache = None
-        self._last_update = None
+        # Fuente de los valores: Google Sheets por defecto, o snapshots grabados / servidor local
+        self.source = source or GspreadSource(self.credentials_file, self.credentials_env_var, self.scopes)
+        if cache_ttl is None:
+            cache_ttl = DevelopmentConfig.SHEETS_CACHE_TTL_SECONDS
+        self._cache = SheetCache(cache_ttl)
+        self._flight = SingleFlight()
+        self._last_update = {}
+        # Almacén compartido entre workers (opcional)
+        self.snapshot_store = snapshot_store
+        self.refresh_lock_ttl = refresh_lock_ttl
     
     def connect(self) -> bool:
         """
-        Conectar a Google Sheets usando credenciales de servicio
+        Conectar la fuente de datos (Google Sheets usando credenciales de servicio)
         """
-        try:
-            print(f"Intentando conectar a Google Sheets...")
-            print(f"Archivo de credenciales: {self.credentials_file}")
-            print(f"Scopes: {self.scopes}")
-            
-            # Detectar si estamos en Railway
-            running_on_railway = os.environ.get("RAILWAY_STATIC_URL") or os.environ.get("RAILWAY_ENVIRONMENT")
-            credentials_json = os.environ.get(self.credentials_env_var)
-            if running_on_railway:
-                if not credentials_json:
-                    print(f"❌ ERROR: No se encontró la variable de entorno {self.credentials_env_var} en Railway. Por favor, configúrala con el JSON de credenciales.")
-                    return False
-                print(f"Usando credenciales desde variable de entorno {self.credentials_env_var} (Railway)")
-                creds_dict = json.loads(credentials_json)
-                creds = ServiceAccountCredentials.from_json_keyfile_dict(
-                    creds_dict, self.scopes
-                )
-            else:
-                if credentials_json:
-                    print(f"Usando credenciales desde variable de entorno {self.credentials_env_var}")
-                    creds_dict = json.loads(credentials_json)
-                    creds = ServiceAccountCredentials.from_json_keyfile_dict(
-                        creds_dict, self.scopes
-                    )
-                else:
-                    pass
-                    if not os.path.exists(self.credentials_file):
-                        print(f"❌ ERROR: El archivo de credenciales no existe: {self.credentials_file}")
-                        return False
-                    creds = ServiceAccountCredentials.from_json_keyfile_name(
-                        self.credentials_file, self.scopes
-                    )
-            self.client = gspread.authorize(creds)
-            print(f"✅ Conexión exitosa a Google Sheets")
-            return True
-        except Exception as e:
-            print(f"❌ Error conectando a Google Sheets: {e}")
-            return False
+        return self.source.connect()
+    
+    @property
+    def client(self):
+        """Cliente de gspread cuando la fuente es Google Sheets"""
+        return getattr(self.source, 'client', None)
     
     def get_data(self, sheet_id: str = None) -> List[Dict]:
         """
         Obtener datos de Google Sheets con caché
+        
+        Las lecturas dentro del TTL se sirven desde memoria; una vez vencido
+        se retorna la copia anterior mientras se refresca en segundo plano.
         """
         if sheet_id is None:
-            # Usar el sheet_id del archivo config.py original
-            sheet_id = '1v4duGwbae0AAHPAEXsGZPZqWI35JkgHyhHg4yHTIpPU'
+            sheet_id = DEFAULT_SHEET_ID
         
-        data, headers = self.get_sheet_data(sheet_id)
+        data = self._cache.get_or_load(sheet_id, lambda: self._load_sheet(sheet_id))
+        return data or []
+    
+    def reload(self, sheet_id: str = None, max_age: float = None) -> Optional[List[Dict]]:
+        """
+        Descarga la hoja sin pasar por la caché en memoria y la actualiza
+        
+        Args:
+            sheet_id: ID de la hoja (por defecto la de actividades)
+            max_age: Antigüedad máxima aceptada de un snapshot compartido
+            
+        Returns:
+            Lista de registros o None si hubo error
+        """
+        sheet_id = sheet_id or DEFAULT_SHEET_ID
+        data = self._load_sheet(sheet_id, max_age=max_age)
         if data:
-            self._cache = data
-            self._last_update = datetime.now()
+            self._cache.set(sheet_id, data)
+        return data
+    
+    def _load_sheet(self, sheet_id: str, max_age: float = None) -> Optional[List[Dict]]:
+        """
+        Descarga la hoja y registra la hora de actualización
+        
+        Con un almacén compartido, solo el worker que obtiene el candado de
+        actualización descarga la hoja; los demás reutilizan su snapshot.
+        """
+        if max_age is None:
+            max_age = self._cache.ttl_seconds
+        store = self.snapshot_store
+        if store is None:
+            data, headers = self.get_sheet_data(sheet_id)
+            if data:
+                self._last_update[sheet_id] = datetime.now()
+                return data
+            return None
+        
+        snapshot = store.load(sheet_id)
+        if snapshot and snapshot.get('columns') and snapshot_age(snapshot) < max_age:
+            return self._use_snapshot(sheet_id, snapshot)
+        
+        if not store.acquire_refresh_lock(sheet_id, self.refresh_lock_ttl):
+            # Otro worker está descargando la hoja
+            if snapshot and snapshot.get('columns'):
+                return self._use_snapshot(sheet_id, snapshot)
+            snapshot = store.wait_for(sheet_id, timeout=self.refresh_lock_ttl)
+            return self._use_snapshot(sheet_id, snapshot) if snapshot else None
+        
+        try:
+            data, headers = self.get_sheet_data(sheet_id)
+            if not data:
+                return self._use_snapshot(sheet_id, snapshot) if snapshot else None
+            snapshot = build_snapshot(data.table)
+            store.save(sheet_id, snapshot)
+            self._last_update[sheet_id] = datetime.fromtimestamp(snapshot['fetched_at'])
             return data
-        return []
+        finally:
+            store.release_refresh_lock(sheet_id)
+    
+    def _use_snapshot(self, sheet_id: str, snapshot: Dict) -> Optional[List[Dict]]:
+        """
+        Registra la hora de un snapshot compartido y retorna sus filas
+        """
+        self._last_update[sheet_id] = datetime.fromtimestamp(snapshot['fetched_at'])
+        rows = snapshot_table(snapshot).rows()
+        return rows or None
     
-    def refresh_cache(self):
+    def get_last_update(self, sheet_id: str = None) -> Optional[datetime]:
         """
-        Refrescar el caché de datos
+        Retorna la hora de la última descarga exitosa de la hoja
         """
-        self._cache = None
-        self._last_update = None
+        return self._last_update.get(sheet_id or DEFAULT_SHEET_ID)
     
+    def refresh_cache(self, sheet_id: str = None):
+        """
+        Refrescar el caché de datos de una hoja
+        """
+        sheet_id = sheet_id or DEFAULT_SHEET_ID
+        self._cache.invalidate(sheet_id)
+        self._last_update.pop(sheet_id, None)
+        if self.snapshot_store is not None:
+            self.snapshot_store.delete(sheet_id)
+    
+    def refresh_token(self, margin_seconds: float = 600) -> bool:
+        """
+        Renueva el token de acceso si está vencido o por vencer
+        
+        Args:
+            margin_seconds: Anticipación con la que se renueva el token
+            
+        Returns:
+            bool: True si la fuente queda con credenciales válidas
+        """
+        return self.source.refresh_token(margin_seconds)
+    
+    @metrics.timed('sheets_fetch')
     def get_sheet_data(self, sheet_id: str) -> Tuple[Optional[List[Dict]], Optional[List[str]]]:
         """
         Obtener datos de Google Sheets
+        Las descargas concurrentes de la misma hoja se agrupan en una sola
         Retorna: (datos, orden_columnas) o (None, None) si hay error
         """
+        return self._flight.do(sheet_id, lambda: self._fetch_sheet_data(sheet_id))
+    
+    def get_fetch_stats(self) -> Dict:
+        """
+        Retorna los contadores de descargas emitidas y agrupadas
+        """
+        return self._flight.stats()
+    
+    def _fetch_sheet_data(self, sheet_id: str) -> Tuple[Optional[List[Dict]], Optional[List[str]]]:
+        """
+        Descarga la hoja desde Google Sheets
+        Los datos se retornan como vista de filas sobre una SheetTable columnar
+        """
         try:
-            if not self.client:
-                if not self.connect():
-                    print("No se pudo conectar a Google Sheets")
-                    return None, None
-            
-            # Abrir la hoja de cálculo
-            sheet = self.client.open_by_key(sheet_id).sheet1
-            
-            # Obtener todos los valores
-            all_values = sheet.get_all_values()
+            # Obtener todos los valores de la primera hoja
+            all_values = self.source.get_all_values(sheet_id)
+            if all_values is None:
+                logger.error("No se pudo conectar a Google Sheets")
+                return None, None
             
             if not all_values:
-                print("La hoja está vacía")
+                logger.warning(f"La hoja {sheet_id} está vacía")
                 return None, None
             
             # La primera fila contiene los encabezados
             headers = all_values[0]
-            print(f"Encabezados de la hoja: {headers}")
-            # Crear lista de diccionarios con los datos
-            data = []
-            for row in all_values[1:]:  # Saltar la fila de encabezados
-                # Asegurar que la fila tenga la misma longitud que los encabezados
-                while len(row) < len(headers):
-                    row.append('')
-                
-                # Crear diccionario con encabezados como claves
-                row_dict = dict(zip(headers, row))
-                data.append(row_dict)
+            logger.debug(f"Encabezados de la hoja {sheet_id}: {headers}")
+            # Crear la tabla columnar; las filas se completan con '' hasta el ancho de los encabezados
+            data = SheetTable.from_values(all_values).rows()
             
-            print(f"Datos obtenidos de Google Sheets: {len(data)} registros")
+            logger.info(f"Datos obtenidos de Google Sheets: {len(data)} registros")
             return data, headers
             
         except Exception as e:
-            print(f"Error obteniendo datos de Google Sheets: {e}")
+            logger.error(f"Error obteniendo datos de Google Sheets: {e}")
+            self.source.forget(sheet_id)
             return None, None
     
     def is_connected(self) -> bool:
         """
         Verifica si hay una conexión activa
         """
-        return self.client is not None 
\ No newline at end of file
+        return self.source.is_connected() 
\ No newline at end of file
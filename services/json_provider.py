@@ -0,0 +1,84 @@
+"""
+Proveedor JSON de Flask con orjson
+
+Serializa las respuestas con orjson cuando está instalado y conserva el
+comportamiento de DefaultJSONProvider: claves ordenadas, fechas en formato
+HTTP, dataclasses, UUID y objetos con __html__. A diferencia del proveedor
+por defecto, los caracteres no ASCII se envían en UTF-8 en lugar de
+escaparse. Sin orjson, o con un objeto que orjson no admite, se usa el
+módulo json estándar.
+"""
+
+import logging
+from typing import Any, Iterator
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depende del entorno
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# Tamaño de los fragmentos al transmitir cuerpos ya serializados
+STREAM_CHUNK_SIZE = 256 * 1024
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    DefaultJSONProvider que usa orjson para serializar
+    """
+
+    def _options(self, indent: bool = False) -> int:
+        # Fechas y dataclasses pasan por `default`, igual que con el proveedor por defecto
+        options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        if indent:
+            options |= orjson.OPT_INDENT_2
+        return options
+
+    def dumps_bytes(self, obj: Any, indent: bool = False) -> bytes:
+        """Serializa a bytes UTF-8 sin pasar por str"""
+        if orjson is not None:
+            try:
+                return orjson.dumps(obj, default=self.default, option=self._options(indent))
+            except TypeError as e:
+                logger.debug(f"orjson no pudo serializar la respuesta, se usa json: {e}")
+        separators = None if indent else (',', ':')
+        return super().dumps(obj, indent=2 if indent else None, separators=separators,
+                             ensure_ascii=False).encode('utf-8')
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        return self.dumps_bytes(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs: Any) -> Any:
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        return self._app.response_class(self.dumps_bytes(obj, indent=indent) + b'\n', mimetype=self.mimetype)
+
+
+def dumps_bytes(provider, obj: Any) -> bytes:
+    """Serializa con el proveedor de la aplicación, en forma compacta"""
+    if isinstance(provider, FastJSONProvider):
+        return provider.dumps_bytes(obj)
+    return provider.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+
+def iter_chunks(body: bytes, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Recorre un cuerpo ya serializado en fragmentos
+
+    Los servidores WSGI (gunicorn) exigen bytes, así que cada fragmento es una
+    copia acotada del cuerpo compartido.
+    """
+    for start in range(0, len(body), chunk_size):
+        yield body[start:start + chunk_size]
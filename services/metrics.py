@@ -0,0 +1,222 @@
+"""
+Métricas de rendimiento de la aplicación
+
+Histogramas de latencia por etapa (descarga de la hoja, procesamiento,
+gráficos, plantillas), latencia y tamaño de las respuestas por ruta y
+contadores de las cachés, en formato de texto de Prometheus. Las etapas
+medidas durante una petición se acumulan además para el encabezado
+Server-Timing.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# Límites superiores de los histogramas (segundos y bytes)
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+# Contadores de las cachés que solo aumentan: se exportan como counters con
+# sufijo _total; el resto (entradas, proporciones) como gauges
+CACHE_COUNTERS = frozenset({'hits', 'disk_hits', 'misses', 'evictions', 'issued', 'coalesced'})
+
+# Etapas de la petición en curso: {etapa: segundos}; None fuera de una petición
+_request_stages: ContextVar[Optional[Dict[str, float]]] = ContextVar('request_stages', default=None)
+# Etapas abiertas en el contexto actual, para no contar dos veces las anidadas
+_active_stages: ContextVar[Tuple[str, ...]] = ContextVar('active_stages', default=())
+
+
+
+class Histogram:
+    """
+    Histograma acumulativo con límites fijos
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """Pares (le, conteo acumulado) incluyendo '+Inf'"""
+        result = []
+        total = 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            result.append((_format_number(bound), total))
+        result.append(('+Inf', self.count))
+        return result
+
+
+class MetricsRegistry:
+    """
+    Registro de métricas del proceso
+
+    Las series se identifican por (nombre, etiquetas); las cachés se
+    registran con una función que retorna su dict de `stats()` y se leen al
+    exportar.
+    """
+
+    def __init__(self, prefix: str = 'dashboard'):
+        self.prefix = prefix
+        self._histograms: Dict[Tuple[str, Tuple], Histogram] = {}
+        self._help: Dict[str, str] = {}
+        self._caches: Dict[str, Callable[[], Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name: str, value: float, labels: Optional[Dict[str, str]] = None,
+                buckets: Tuple[float, ...] = LATENCY_BUCKETS, help_text: str = ''):
+        """Registra una observación en el histograma `name` con las etiquetas dadas"""
+        key = (name, tuple(sorted((labels or {}).items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(buckets)
+                if help_text:
+                    self._help.setdefault(name, help_text)
+            histogram.observe(value)
+
+    def observe_stage(self, stage: str, seconds: float):
+        """Registra la duración de una etapa y la suma al Server-Timing de la petición"""
+        self.observe('stage_duration_seconds', seconds, {'stage': stage},
+                     help_text='Duración de cada etapa del procesamiento')
+        stages = _request_stages.get()
+        if stages is not None:
+            stages[stage] = stages.get(stage, 0.0) + seconds
+
+    @contextmanager
+    def timer(self, stage: str) -> Iterator[None]:
+        """
+        Mide el bloque como la etapa `stage`
+
+        Si la etapa ya está abierta en el contexto actual (p. ej. un método
+        que llama a su versión de la clase base) solo se mide la externa.
+        """
+        active = _active_stages.get()
+        if stage in active:
+            yield
+            return
+        token = _active_stages.set(active + (stage,))
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe_stage(stage, time.perf_counter() - start)
+            _active_stages.reset(token)
+
+    def timed(self, stage: str) -> Callable:
+        """Decorador que mide cada llamada a la función como la etapa `stage`"""
+        def decorator(func: Callable) -> Callable:
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.timer(stage):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def register_cache(self, name: str, stats: Callable[[], Dict[str, Any]]):
+        """
+        Registra una caché cuyos valores numéricos se exportan en /metrics
+
+        Los de CACHE_COUNTERS se exportan como counters (`<nombre>_total`) y
+        los demás como gauges.
+        """
+        with self._lock:
+            self._caches[name] = stats
+
+    def begin_request(self):
+        """Inicia la acumulación de etapas de una petición; retorna el token para end_request"""
+        return _request_stages.set({})
+
+    def end_request(self, token) -> Dict[str, float]:
+        """Termina la petición y retorna sus etapas {etapa: segundos}"""
+        stages = _request_stages.get() or {}
+        _request_stages.reset(token)
+        return stages
+
+    def reset(self):
+        """Elimina las series observadas (las cachés registradas se conservan)"""
+        with self._lock:
+            self._histograms.clear()
+
+    def render_prometheus(self) -> str:
+        """Exporta las métricas en formato de texto de Prometheus"""
+        lines: List[str] = []
+        with self._lock:
+            series = sorted(self._histograms.items(), key=lambda item: item[0])
+            snapshots = [
+                (name, labels, histogram.cumulative(), histogram.sum, histogram.count)
+                for (name, labels), histogram in series
+            ]
+            caches = list(self._caches.items())
+
+        current = None
+        for name, labels, buckets, total, count in snapshots:
+            metric = f"{self.prefix}_{name}"
+            if name != current:
+                current = name
+                if name in self._help:
+                    lines.append(f"# HELP {metric} {self._help[name]}")
+                lines.append(f"# TYPE {metric} histogram")
+            for bound, cumulative in buckets:
+                lines.append(f"{metric}_bucket{_labels(labels + (('le', bound),))} {cumulative}")
+            lines.append(f"{metric}_sum{_labels(labels)} {_format_number(total)}")
+            lines.append(f"{metric}_count{_labels(labels)} {count}")
+
+        cache_series: Dict[Tuple[str, str], List[str]] = {}
+        for cache_name, stats in caches:
+            try:
+                values = stats()
+            except Exception:
+                continue
+            for key, value in values.items():
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                kind = 'counter' if key in CACHE_COUNTERS else 'gauge'
+                metric = f"{self.prefix}_cache_{key}" + ('_total' if kind == 'counter' else '')
+                cache_series.setdefault((metric, kind), []).append(
+                    f"{metric}{_labels((('cache', cache_name),))} {_format_number(value)}"
+                )
+        for (metric, kind), samples in cache_series.items():
+            lines.append(f"# TYPE {metric} {kind}")
+            lines.extend(samples)
+
+        return '\n'.join(lines) + '\n'
+
+
+def server_timing_header(stages: Dict[str, float], total: Optional[float] = None) -> str:
+    """
+    Valor del encabezado Server-Timing (duraciones en milisegundos)
+    """
+    parts = [f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in stages.items()]
+    if total is not None:
+        parts.append(f"total;dur={total * 1000:.1f}")
+    return ', '.join(parts)
+
+
+def _labels(labels: Tuple) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in labels) + '}'
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+# Registro compartido por los servicios del proceso
+metrics = MetricsRegistry()
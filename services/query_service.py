@@ -0,0 +1,191 @@
+"""
+Consultas paginadas, proyectadas y filtradas sobre los datos de actividades
+"""
+
+import logging
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from utils.date_utils import parse_date
+
+logger = logging.getLogger(__name__)
+
+ENTITY_FIELD = 'Entidad'
+DATE_FIELD = 'Fecha final de ejecución'
+
+
+def _day(value):
+    """Día calendario de una fecha (datetime o date)"""
+    return value.date() if isinstance(value, datetime) else value
+
+
+def normalize_entity(value: str) -> str:
+    """Normaliza el nombre de una entidad para compararlo"""
+    return str(value).strip().casefold()
+
+
+class ActivityIndex:
+    """
+    Índice en memoria de un snapshot procesado de actividades
+
+    Se construye una vez por versión de los datos: posiciones de los registros
+    por entidad y una lista ordenada de días para filtrar por rango con
+    búsqueda binaria. Los rangos se comparan por día, así que una fecha con
+    hora cae dentro del día que la contiene.
+    """
+
+    def __init__(self, processed_data: Dict[str, Any]):
+        self.records = [record['original'] for record in processed_data['data']]
+        self.statistics = processed_data['statistics']
+        self.columns = list(self.records[0].keys()) if self.records else []
+        self._column_keys = {name.strip(): name for name in self.columns}
+
+        entity_key = self._column_keys.get(ENTITY_FIELD)
+        date_key = self._column_keys.get(DATE_FIELD)
+        self._by_entity: Dict[str, List[int]] = {}
+        dated = []
+        for position, record in enumerate(self.records):
+            if entity_key is not None:
+                entity = normalize_entity(record.get(entity_key, ''))
+                self._by_entity.setdefault(entity, []).append(position)
+            if date_key is not None:
+                date_obj = parse_date(str(record.get(date_key, '')).strip())
+                if date_obj is not None:
+                    dated.append((date_obj, position))
+        dated.sort()
+        self._dates = [_day(date_obj) for date_obj, _ in dated]
+        self._date_positions = [position for _, position in dated]
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def resolve_fields(self, fields: List[str]) -> List[str]:
+        """
+        Traduce los nombres de campos pedidos a las columnas de la hoja
+
+        Raises:
+            ValueError: Si algún campo no existe
+        """
+        resolved = []
+        for field in fields:
+            key = field if field in self.columns else self._column_keys.get(field.strip())
+            if key is None:
+                raise ValueError(f"Campo desconocido: {field}")
+            resolved.append(key)
+        return resolved
+
+    def _filter(self, entidades: Optional[List[str]], date_from, date_to) -> Optional[List[int]]:
+        """Posiciones que cumplen los filtros, en orden; None si no hay filtros"""
+        positions = None
+        if entidades:
+            selected = set()
+            for entidad in entidades:
+                selected.update(self._by_entity.get(normalize_entity(entidad), ()))
+            positions = selected
+        if date_from is not None or date_to is not None:
+            start = bisect_left(self._dates, _day(date_from)) if date_from is not None else 0
+            stop = bisect_right(self._dates, _day(date_to)) if date_to is not None else len(self._dates)
+            in_range = set(self._date_positions[start:stop])
+            positions = in_range if positions is None else positions & in_range
+        return sorted(positions) if positions is not None else None
+
+    def query(self, offset: int = 0, limit: Optional[int] = None, fields: Optional[List[str]] = None,
+              entidades: Optional[List[str]] = None, date_from=None, date_to=None) -> Dict[str, Any]:
+        """
+        Retorna una página de registros
+
+        Args:
+            offset: Posición del primer registro de la página
+            limit: Tamaño de la página; None para todos los registros
+            fields: Columnas a incluir; None para todas
+            entidades: Entidades aceptadas (sin distinguir mayúsculas ni espacios)
+            date_from: Fecha mínima (inclusive, por día) de 'Fecha final de ejecución'
+            date_to: Fecha máxima (inclusive: incluye todo ese día)
+
+        Returns:
+            Dict con 'data', 'total', 'offset', 'columns_order' y 'next_cursor'
+        """
+        positions = self._filter(entidades, date_from, date_to)
+        total = len(self.records) if positions is None else len(positions)
+        stop = total if limit is None else min(offset + limit, total)
+
+        if positions is None:
+            page = self.records[offset:stop]
+        else:
+            records = self.records
+            page = [records[position] for position in positions[offset:stop]]
+
+        columns = self.resolve_fields(fields) if fields else self.columns
+        if fields:
+            page = [{key: record.get(key, '') for key in columns} for record in page]
+
+        return {
+            'data': page,
+            'total': total,
+            'offset': offset,
+            'columns_order': columns,
+            'next_cursor': str(stop) if stop < total else None
+        }
+
+
+def parse_query_args(args, default_page_size: int = 100, max_page_size: int = 1000) -> Optional[Dict[str, Any]]:
+    """
+    Interpreta los parámetros de consulta de /api/data
+
+    Args:
+        args: Parámetros de la petición (request.args)
+        default_page_size: Tamaño de página si solo se pide `page` o `cursor`
+        max_page_size: Tamaño máximo de página permitido
+
+    Returns:
+        Argumentos para ActivityIndex.query, o None si la petición no usa
+        paginación, proyección ni filtros (respuesta completa)
+
+    Raises:
+        ValueError: Si algún parámetro es inválido
+    """
+    names = ('page', 'page_size', 'cursor', 'fields', 'entidad', 'fecha_desde', 'fecha_hasta')
+    if not any(name in args for name in names):
+        return None
+
+    paginated = any(name in args for name in ('page', 'page_size', 'cursor'))
+    page_size = None
+    offset = 0
+    if paginated:
+        page_size = _positive_int(args.get('page_size', default_page_size), 'page_size')
+        page_size = min(page_size, max_page_size)
+        if args.get('cursor'):
+            offset = _positive_int(args['cursor'], 'cursor', minimum=0)
+        else:
+            offset = (_positive_int(args.get('page', 1), 'page') - 1) * page_size
+
+    fields = [field for field in args.get('fields', '').split(',') if field.strip()]
+    entidades = [entidad for entidad in args.getlist('entidad') if entidad.strip()]
+    return {
+        'offset': offset,
+        'limit': page_size,
+        'fields': fields or None,
+        'entidades': entidades or None,
+        'date_from': _date_arg(args.get('fecha_desde'), 'fecha_desde'),
+        'date_to': _date_arg(args.get('fecha_hasta'), 'fecha_hasta')
+    }
+
+
+def _positive_int(value, name: str, minimum: int = 1) -> int:
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Parámetro '{name}' inválido: {value}")
+    if number < minimum:
+        raise ValueError(f"Parámetro '{name}' debe ser mayor o igual a {minimum}")
+    return number
+
+
+def _date_arg(value: Optional[str], name: str):
+    if not value:
+        return None
+    date_obj = parse_date(value.strip())
+    if date_obj is None:
+        raise ValueError(f"Parámetro '{name}' no es una fecha válida: {value}")
+    return date_obj
@@ -0,0 +1,254 @@
+"""
+Programador de actualización en segundo plano de las hojas de Google Sheets
+"""
+
+import threading
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from services.cache_service import ResultCache
+from services.delta_sync import sheet_fingerprint
+
+logger = logging.getLogger(__name__)
+
+
+class PublishedSnapshot:
+    """
+    Datos listos para servir de una hoja: registros crudos y preprocesados
+    """
+
+    def __init__(self, name: str, raw: List[Dict], processed: Any, version: int, fingerprint: str):
+        self.name = name
+        self.raw = raw
+        self.processed = processed
+        self.version = version
+        # Huella del contenido: igual en todos los workers para los mismos datos
+        self.fingerprint = fingerprint
+        self.published_at = datetime.now()
+
+
+class SheetJob:
+    """
+    Definición de una hoja a pre-descargar periódicamente
+
+    Args:
+        name: Nombre con el que se publica el snapshot
+        sheet_id: ID de la hoja en Google Sheets
+        connector_factory: Función que retorna el conector a usar
+        interval_seconds: Intervalo entre actualizaciones
+        processor: Función opcional que preprocesa los registros crudos
+        cache_results: Memoizar el resultado del procesador por huella del
+            contenido; False para procesadores con estado (DeltaSync), cuyo
+            resultado depende de la sincronización anterior
+    """
+
+    def __init__(self, name: str, sheet_id: str, connector_factory: Callable,
+                 interval_seconds: float, processor: Optional[Callable[[List[Dict]], Any]] = None,
+                 cache_results: bool = True):
+        self.name = name
+        self.sheet_id = sheet_id
+        self.connector_factory = connector_factory
+        self.interval_seconds = interval_seconds
+        self.processor = processor
+        self.cache_results = cache_results
+        self.failures = 0
+        self.last_error = None
+
+
+class RefreshScheduler:
+    """
+    Pre-descarga y preprocesa cada hoja configurada con APScheduler
+
+    Cada hoja tiene su propio intervalo con jitter; los fallos se reintentan
+    con backoff exponencial. Las rutas leen el último snapshot publicado en
+    lugar de consultar Google durante la petición. El resultado del
+    procesamiento se memoriza por huella del contenido, así que datos ya
+    vistos (p. ej. releídos del almacén compartido) no se reprocesan.
+    """
+
+    def __init__(self, jitter_seconds: float = 30, base_backoff_seconds: float = 30,
+                 max_backoff_seconds: float = 1800, processed_cache_size: int = 8):
+        self.jitter_seconds = jitter_seconds
+        self.base_backoff_seconds = base_backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.processed_cache = ResultCache(max_entries=processed_cache_size)
+        self._jobs: Dict[str, SheetJob] = {}
+        self._snapshots: Dict[str, PublishedSnapshot] = {}
+        self._listeners: List[Callable[[PublishedSnapshot], None]] = []
+        self._lock = threading.Lock()
+        self._scheduler = None
+
+    def add_job(self, job: SheetJob):
+        """Registra una hoja para actualización periódica"""
+        self._jobs[job.name] = job
+        if self._scheduler is not None:
+            self._schedule(job)
+
+    def jobs(self) -> List[SheetJob]:
+        """Retorna las hojas registradas"""
+        return list(self._jobs.values())
+
+    def add_listener(self, listener: Callable[[PublishedSnapshot], None]):
+        """Registra una función que se llama con cada snapshot nuevo publicado"""
+        self._listeners.append(listener)
+
+    def start(self) -> bool:
+        """
+        Inicia el programador y lanza una primera descarga de cada hoja
+
+        Returns:
+            bool: True si el programador quedó en ejecución
+        """
+        if self._scheduler is not None:
+            return True
+        try:
+            from apscheduler.schedulers.background import BackgroundScheduler
+        except ImportError:
+            logger.warning("APScheduler no está instalado; los datos se obtendrán durante la petición")
+            return False
+
+        self._scheduler = BackgroundScheduler(daemon=True)
+        for job in self._jobs.values():
+            self._schedule(job)
+        self._scheduler.start()
+        logger.info(f"Programador de actualización iniciado con {len(self._jobs)} hojas")
+        return True
+
+    def _schedule(self, job: SheetJob):
+        """Agrega el trabajo de una hoja al programador de APScheduler"""
+        self._scheduler.add_job(
+            self.run_job,
+            trigger='interval',
+            args=[job.name],
+            id=job.name,
+            seconds=job.interval_seconds,
+            jitter=self.jitter_seconds,
+            next_run_time=datetime.now(),
+            max_instances=1,
+            coalesce=True,
+            replace_existing=True
+        )
+
+    def shutdown(self):
+        """Detiene el programador"""
+        if self._scheduler is not None:
+            self._scheduler.shutdown(wait=False)
+            self._scheduler = None
+
+    def run_job(self, name: str) -> Optional[PublishedSnapshot]:
+        """
+        Descarga, preprocesa y publica una hoja
+
+        Args:
+            name: Nombre del trabajo registrado
+
+        Returns:
+            Snapshot publicado o None si la descarga falló
+        """
+        job = self._jobs[name]
+        try:
+            connector = job.connector_factory()
+            raw_data = connector.reload(job.sheet_id, max_age=job.interval_seconds)
+            if not raw_data:
+                raise RuntimeError(f"No se obtuvieron datos de la hoja {job.sheet_id}")
+            snapshot = self.publish(name, raw_data)
+            job.failures = 0
+            job.last_error = None
+            return snapshot
+        except Exception as e:
+            job.failures += 1
+            job.last_error = str(e)
+            backoff = min(self.base_backoff_seconds * 2 ** (job.failures - 1), self.max_backoff_seconds)
+            logger.error(f"Error actualizando hoja '{name}' (intento {job.failures}), reintento en {backoff:.0f}s: {str(e)}")
+            if self._scheduler is not None:
+                try:
+                    self._scheduler.modify_job(name, next_run_time=datetime.now() + timedelta(seconds=backoff))
+                except Exception as modify_error:
+                    logger.error(f"No se pudo reprogramar la hoja '{name}': {str(modify_error)}")
+            return None
+
+    def publish(self, name: str, raw_data: List[Dict]) -> PublishedSnapshot:
+        """
+        Preprocesa los registros y los publica como snapshot listo para servir
+        """
+        job = self._jobs.get(name)
+        with self._lock:
+            current = self._snapshots.get(name)
+        if current is not None and current.raw is raw_data:
+            return current
+        fingerprint = sheet_fingerprint(raw_data)
+        if current is not None and current.fingerprint == fingerprint:
+            return current
+
+        processed = None
+        if job is not None and job.processor:
+            if job.cache_results:
+                processed = self.processed_cache.get_or_compute(
+                    (name, fingerprint), lambda: job.processor(raw_data)
+                )
+            else:
+                processed = job.processor(raw_data)
+        with self._lock:
+            version = (self._snapshots[name].version + 1) if name in self._snapshots else 1
+            snapshot = PublishedSnapshot(name, raw_data, processed, version, fingerprint)
+            self._snapshots[name] = snapshot
+        logger.info(f"Snapshot '{name}' publicado: versión {version}, {len(raw_data)} registros")
+        for listener in self._listeners:
+            try:
+                listener(snapshot)
+            except Exception as e:
+                logger.error(f"Error en listener del snapshot '{name}': {str(e)}")
+        return snapshot
+
+    def refresh(self, name: str) -> Optional[PublishedSnapshot]:
+        """
+        Fuerza la descarga inmediata de una hoja ignorando snapshots compartidos
+        """
+        job = self._jobs[name]
+        job.connector_factory().refresh_cache(job.sheet_id)
+        return self.run_job(name)
+
+    def get(self, name: str) -> Optional[PublishedSnapshot]:
+        """Retorna el último snapshot publicado de una hoja, o None"""
+        with self._lock:
+            return self._snapshots.get(name)
+
+    @property
+    def running(self) -> bool:
+        """Indica si el programador está en ejecución"""
+        return self._scheduler is not None
+
+    def current(self, name: str) -> Optional[PublishedSnapshot]:
+        """
+        Retorna el snapshot listo para servir de una hoja
+
+        Con el programador en ejecución se usa el último snapshot publicado.
+        Sin programador, o antes de la primera publicación, los datos se leen
+        a través de la caché del conector y se publican en ese momento.
+        """
+        snapshot = self.get(name)
+        if snapshot is not None and self.running:
+            return snapshot
+        job = self._jobs[name]
+        raw_data = job.connector_factory().get_data(job.sheet_id)
+        if not raw_data:
+            return snapshot
+        return self.publish(name, raw_data)
+
+    def status(self) -> Dict[str, Dict]:
+        """
+        Retorna el estado de cada hoja programada
+        """
+        status = {}
+        for name, job in self._jobs.items():
+            snapshot = self.get(name)
+            status[name] = {
+                'sheet_id': job.sheet_id,
+                'interval_seconds': job.interval_seconds,
+                'failures': job.failures,
+                'last_error': job.last_error,
+                'version': snapshot.version if snapshot else None,
+                'published_at': snapshot.published_at.isoformat() if snapshot else None
+            }
+        return status
@@ -0,0 +1,310 @@
+"""
+Fuentes de valores de hojas para GoogleSheetsConnector
+
+La fuente entrega la matriz de `get_all_values()` de la primera hoja de un
+documento. Además de Google Sheets (gspread) hay una fuente que reproduce
+snapshots grabados en archivos locales y otra que consulta un servidor HTTP
+con el subconjunto de la API de valores de Sheets v4 que usa la aplicación,
+para ejecutar la aplicación completa sin red ni credenciales.
+"""
+
+import csv
+import json
+import os
+import threading
+import logging
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Tuple
+from urllib.error import HTTPError, URLError
+from urllib.parse import quote
+from urllib.request import urlopen
+
+logger = logging.getLogger(__name__)
+
+# Formatos de los snapshots grabados, en orden de búsqueda
+RECORDED_FORMATS = ('json', 'csv', 'parquet')
+
+
+class SheetSource(ABC):
+    """
+    Interfaz para las fuentes de valores de las hojas
+    """
+
+    def connect(self) -> bool:
+        """Prepara la fuente; True si quedó lista para leer"""
+        return True
+
+    def is_connected(self) -> bool:
+        """Indica si la fuente está lista"""
+        return True
+
+    @abstractmethod
+    def get_all_values(self, sheet_id: str) -> Optional[List[List[str]]]:
+        """
+        Retorna las filas de la primera hoja del documento (la primera son los encabezados)
+
+        Returns:
+            Matriz de valores, [] si la hoja está vacía o None si no se pudo conectar
+        """
+
+    def refresh_token(self, margin_seconds: float = 600) -> bool:
+        """Renueva las credenciales si la fuente las usa"""
+        return True
+
+    def forget(self, sheet_id: str):
+        """Descarta lo que la fuente tenga abierto de una hoja (tras un error)"""
+
+
+class GspreadSource(SheetSource):
+    """
+    Valores desde Google Sheets con gspread y una cuenta de servicio
+
+    gspread y oauth2client se importan al conectar, de modo que las demás
+    fuentes no requieren las dependencias de Google.
+    """
+
+    def __init__(self, credentials_file: str, credentials_env_var: str, scopes: List[str]):
+        self.credentials_file = credentials_file
+        self.credentials_env_var = credentials_env_var
+        self.scopes = scopes
+        self.client = None
+        self._worksheets = {}
+        self._connect_lock = threading.RLock()
+
+    def connect(self) -> bool:
+        """
+        Conectar a Google Sheets usando credenciales de servicio
+        """
+        try:
+            import gspread
+            from oauth2client.service_account import ServiceAccountCredentials
+
+            logger.info("Intentando conectar a Google Sheets...")
+            logger.debug(f"Archivo de credenciales: {self.credentials_file}; scopes: {self.scopes}")
+
+            # Detectar si estamos en Railway
+            running_on_railway = os.environ.get("RAILWAY_STATIC_URL") or os.environ.get("RAILWAY_ENVIRONMENT")
+            credentials_json = os.environ.get(self.credentials_env_var)
+            if running_on_railway:
+                if not credentials_json:
+                    logger.error(f"No se encontró la variable de entorno {self.credentials_env_var} en Railway. Por favor, configúrala con el JSON de credenciales.")
+                    return False
+                logger.info(f"Usando credenciales desde variable de entorno {self.credentials_env_var} (Railway)")
+                creds_dict = json.loads(credentials_json)
+                creds = ServiceAccountCredentials.from_json_keyfile_dict(
+                    creds_dict, self.scopes
+                )
+            else:
+                if credentials_json:
+                    logger.info(f"Usando credenciales desde variable de entorno {self.credentials_env_var}")
+                    creds_dict = json.loads(credentials_json)
+                    creds = ServiceAccountCredentials.from_json_keyfile_dict(
+                        creds_dict, self.scopes
+                    )
+                else:
+                    if not os.path.exists(self.credentials_file):
+                        logger.error(f"El archivo de credenciales no existe: {self.credentials_file}")
+                        return False
+                    creds = ServiceAccountCredentials.from_json_keyfile_name(
+                        self.credentials_file, self.scopes
+                    )
+            self.client = gspread.authorize(creds)
+            logger.info("Conexión exitosa a Google Sheets")
+            return True
+        except Exception as e:
+            logger.error(f"Error conectando a Google Sheets: {e}")
+            return False
+
+    def is_connected(self) -> bool:
+        return self.client is not None
+
+    def get_all_values(self, sheet_id: str) -> Optional[List[List[str]]]:
+        sheet = self._get_worksheet(sheet_id)
+        if sheet is None:
+            return None
+        return sheet.get_all_values()
+
+    def _get_worksheet(self, sheet_id: str):
+        """
+        Retorna la primera hoja del documento, abriéndolo solo la primera vez
+        """
+        with self._connect_lock:
+            if not self.client:
+                if not self.connect():
+                    return None
+            worksheet = self._worksheets.get(sheet_id)
+            if worksheet is None:
+                worksheet = self.client.open_by_key(sheet_id).sheet1
+                self._worksheets[sheet_id] = worksheet
+            return worksheet
+
+    def forget(self, sheet_id: str):
+        self._worksheets.pop(sheet_id, None)
+
+    def refresh_token(self, margin_seconds: float = 600) -> bool:
+        """
+        Renueva el token de acceso si está vencido o por vencer
+
+        Args:
+            margin_seconds: Anticipación con la que se renueva el token
+
+        Returns:
+            bool: True si el cliente queda con un token válido
+        """
+        from datetime import datetime, timedelta
+        with self._connect_lock:
+            if not self.client:
+                return False
+            creds = getattr(self.client, 'auth', None)
+            if creds is None or not hasattr(creds, 'refresh'):
+                return False
+            expiry = getattr(creds, 'expiry', None)
+            if creds.valid and expiry and expiry - datetime.utcnow() > timedelta(seconds=margin_seconds):
+                return True
+            try:
+                from google.auth.transport.requests import Request
+                creds.refresh(Request())
+                return True
+            except Exception as e:
+                logger.error(f"Error renovando token de Google Sheets: {e}")
+                return False
+
+
+class RecordedSource(SheetSource):
+    """
+    Reproduce snapshots grabados de `get_all_values()` desde un directorio
+
+    Cada hoja se busca como `<sheet_id>.json`, `<sheet_id>.csv` o
+    `<sheet_id>.parquet`. El JSON puede ser la matriz de valores o la
+    respuesta de la API ({"values": [...]}); el CSV son las filas tal cual y
+    el Parquet una columna por encabezado (requiere pandas y pyarrow). Los
+    archivos se leen una vez y se vuelven a leer solo si cambian.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._loaded: Dict[str, Tuple[float, List[List[str]]]] = {}
+        self._lock = threading.Lock()
+
+    def path_for(self, sheet_id: str) -> Optional[str]:
+        """Archivo grabado de una hoja, o None si no existe"""
+        for fmt in RECORDED_FORMATS:
+            path = os.path.join(self.directory, f"{sheet_id}.{fmt}")
+            if os.path.exists(path):
+                return path
+        return None
+
+    def get_all_values(self, sheet_id: str) -> Optional[List[List[str]]]:
+        path = self.path_for(sheet_id)
+        if path is None:
+            logger.error(f"No hay snapshot grabado de la hoja {sheet_id} en {self.directory}")
+            return None
+        mtime = os.path.getmtime(path)
+        with self._lock:
+            loaded = self._loaded.get(path)
+            if loaded is not None and loaded[0] == mtime:
+                return loaded[1]
+        values = read_recorded_values(path)
+        with self._lock:
+            self._loaded[path] = (mtime, values)
+        return values
+
+
+class HttpValuesSource(SheetSource):
+    """
+    Valores desde un servidor con la API de Sheets v4 (p. ej. el servidor de fixtures local)
+
+    Igual que gspread, pide primero los metadatos del documento para conocer
+    el título de la primera hoja y luego sus valores.
+    """
+
+    def __init__(self, base_url: str, timeout: float = 10):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self._titles: Dict[str, str] = {}
+
+    def _get_json(self, path: str) -> Dict:
+        with urlopen(f"{self.base_url}{path}", timeout=self.timeout) as response:
+            return json.loads(response.read().decode('utf-8'))
+
+    def get_all_values(self, sheet_id: str) -> Optional[List[List[str]]]:
+        try:
+            title = self._titles.get(sheet_id)
+            if title is None:
+                metadata = self._get_json(f"/v4/spreadsheets/{quote(sheet_id)}")
+                title = metadata['sheets'][0]['properties']['title']
+                self._titles[sheet_id] = title
+            payload = self._get_json(f"/v4/spreadsheets/{quote(sheet_id)}/values/{quote(title)}")
+        except (HTTPError, URLError, OSError) as e:
+            logger.error(f"Error consultando {self.base_url} para la hoja {sheet_id}: {e}")
+            return None
+        return payload.get('values', [])
+
+    def forget(self, sheet_id: str):
+        self._titles.pop(sheet_id, None)
+
+
+def read_recorded_values(path: str) -> List[List[str]]:
+    """
+    Lee un snapshot grabado (JSON, CSV o Parquet) como matriz de valores
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.json':
+        with open(path, encoding='utf-8') as f:
+            payload = json.load(f)
+        values = payload.get('values', []) if isinstance(payload, dict) else payload
+        return [[str(value) for value in row] for row in values]
+    if extension == '.csv':
+        with open(path, encoding='utf-8', newline='') as f:
+            return [row for row in csv.reader(f)]
+    if extension == '.parquet':
+        import pandas as pd
+        frame = pd.read_parquet(path)
+        body = frame.astype(str).values.tolist()
+        return [list(frame.columns)] + body
+    raise ValueError(f"Formato de snapshot no soportado: {path}")
+
+
+def save_recorded_values(directory: str, sheet_id: str, values: List[List[str]], fmt: str = 'json') -> str:
+    """
+    Graba la matriz de valores de una hoja para reproducirla con RecordedSource
+
+    Returns:
+        Ruta del archivo escrito
+    """
+    if fmt not in RECORDED_FORMATS:
+        raise ValueError(f"Formato de snapshot no soportado: {fmt}")
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{sheet_id}.{fmt}")
+    if fmt == 'json':
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'values': values}, f, ensure_ascii=False)
+    elif fmt == 'csv':
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            csv.writer(f).writerows(values)
+    else:
+        import pandas as pd
+        headers = values[0] if values else []
+        width = len(headers)
+        body = [list(row[:width]) + [''] * (width - len(row)) for row in values[1:]]
+        pd.DataFrame(body, columns=headers).to_parquet(path, index=False)
+    return path
+
+
+def create_sheet_source(config) -> Optional[SheetSource]:
+    """
+    Crea la fuente de valores según la configuración
+
+    Args:
+        config: Mapeo de configuración (app.config)
+
+    Returns:
+        SheetSource compartida, o None para Google Sheets (cada conector crea
+        su GspreadSource con sus credenciales)
+    """
+    backend = (config.get('SHEETS_SOURCE') or 'google').lower()
+    if backend == 'recorded':
+        return RecordedSource(config.get('SHEETS_FIXTURE_DIR', 'data/fixtures'))
+    if backend == 'http':
+        return HttpValuesSource(config.get('SHEETS_HTTP_URL', 'http://127.0.0.1:8765'))
+    return None
@@ -0,0 +1,161 @@
+"""
+Representación columnar de hojas de Google Sheets
+"""
+
+from collections.abc import Sequence
+from typing import Any, Dict, Iterator, List, Optional
+
+
+class SheetTable:
+    """
+    Tabla compacta: índice de encabezados y una lista de valores por columna
+
+    Se construye directamente desde la salida de `get_all_values()` sin crear
+    un diccionario por fila. Los consumidores que esperan registros pueden
+    usar `rows()`, una vista que arma cada diccionario solo al accederlo.
+    """
+
+    def __init__(self, headers: List[str], columns: List[List[str]]):
+        self.headers = headers
+        self.columns = columns
+        # Igual que dict(zip(headers, row)): un encabezado repetido toma la última columna
+        self.index = {name: position for position, name in enumerate(headers)}
+        # Encabezados efectivos (sin repetidos) en el orden de las llaves de cada fila
+        self._keys = list(dict.fromkeys(headers))
+        self._key_positions = [self.index[name] for name in self._keys]
+        self._num_rows = len(columns[0]) if columns else 0
+
+    @classmethod
+    def from_values(cls, all_values: List[List[str]]) -> 'SheetTable':
+        """
+        Construye la tabla a partir de la matriz de valores de la hoja
+
+        Args:
+            all_values: Filas de la hoja; la primera contiene los encabezados
+
+        Returns:
+            SheetTable con las filas completadas con '' hasta el ancho de los encabezados
+        """
+        if not all_values:
+            return cls([], [])
+        headers = list(all_values[0])
+        width = len(headers)
+        body = [
+            row if len(row) == width else list(row[:width]) + [''] * (width - len(row))
+            for row in all_values[1:]
+        ]
+        if not body:
+            return cls(headers, [[] for _ in range(width)])
+        columns = [list(column) for column in zip(*body)]
+        return cls(headers, columns)
+
+    @classmethod
+    def from_records(cls, records: List[Dict], headers: Optional[List[str]] = None) -> 'SheetTable':
+        """
+        Construye la tabla a partir de una lista de diccionarios
+        """
+        if headers is None:
+            headers = list(records[0].keys()) if records else []
+        columns = [[record.get(name, '') for record in records] for name in headers]
+        return cls(list(headers), columns)
+
+    @classmethod
+    def from_dict(cls, payload: Dict[str, Any]) -> 'SheetTable':
+        """Reconstruye la tabla desde su forma serializable"""
+        return cls(payload['headers'], payload['columns'])
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Forma serializable en JSON de la tabla"""
+        return {'headers': self.headers, 'columns': self.columns}
+
+    def __len__(self) -> int:
+        return self._num_rows
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, SheetTable):
+            return NotImplemented
+        return self.headers == other.headers and self.columns == other.columns
+
+    def column(self, name: str) -> List[str]:
+        """
+        Retorna la lista de valores de una columna (vacía si no existe)
+        """
+        position = self.index.get(name)
+        if position is None:
+            return []
+        return self.columns[position]
+
+    def row(self, index: int) -> Dict[str, str]:
+        """Construye el diccionario de una fila"""
+        columns = self.columns
+        return {key: columns[position][index] for key, position in zip(self._keys, self._key_positions)}
+
+    def rows(self) -> 'RowView':
+        """Vista perezosa de las filas como diccionarios"""
+        return RowView(self)
+
+    def iter_row_values(self) -> Iterator[tuple]:
+        """Itera los valores de cada fila en el orden de las llaves de los registros"""
+        return zip(*[self.columns[position] for position in self._key_positions])
+
+    def to_records(self) -> List[Dict[str, str]]:
+        """Materializa todas las filas como lista de diccionarios"""
+        keys = self._keys
+        return [dict(zip(keys, values)) for values in self.iter_row_values()]
+
+    def value_counts(self, name: str, start: int = 0, stop: Optional[int] = None,
+                     strip: bool = True) -> Dict[str, int]:
+        """
+        Cuenta los valores no vacíos de una columna en un rango de filas
+        """
+        counts: Dict[str, int] = {}
+        for value in self.column(name)[start:stop]:
+            if strip:
+                value = value.strip()
+            if value:
+                counts[value] = counts.get(value, 0) + 1
+        return counts
+
+    def to_dataframe(self):
+        """
+        Convierte la tabla a un DataFrame de pandas (importado bajo demanda)
+        """
+        import pandas as pd
+        return pd.DataFrame({key: self.columns[position] for key, position in zip(self._keys, self._key_positions)})
+
+
+class RowView(Sequence):
+    """
+    Secuencia de filas de una SheetTable que crea los diccionarios al accederlos
+    """
+
+    def __init__(self, table: SheetTable):
+        self.table = table
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.table.row(i) for i in range(*index.indices(len(self.table)))]
+        if index < 0:
+            index += len(self.table)
+        if not 0 <= index < len(self.table):
+            raise IndexError('índice de fila fuera de rango')
+        return self.table.row(index)
+
+    def __iter__(self) -> Iterator[Dict[str, str]]:
+        keys = self.table._keys
+        for values in self.table.iter_row_values():
+            yield dict(zip(keys, values))
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, RowView):
+            return self.table == other.table
+        if isinstance(other, list):
+            return len(other) == len(self) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def to_list(self) -> List[Dict[str, str]]:
+        """Materializa las filas como lista (p. ej. para serializar a JSON)"""
+        return self.table.to_records()
@@ -0,0 +1,144 @@
+"""
+Servidor HTTP local que imita la API de valores de Google Sheets v4
+
+Atiende el subconjunto que usa la aplicación a partir de cualquier
+SheetSource (normalmente snapshots grabados):
+
+    GET /v4/spreadsheets/<id>                  metadatos (título de la primera hoja)
+    GET /v4/spreadsheets/<id>/values/<rango>   valores de la primera hoja
+
+Igual que la API real, omite las celdas vacías al final de cada fila y las
+filas vacías al final de la hoja. Uso:
+
+    python -m services.sheets_fixture_server --dir data/fixtures --port 8765
+"""
+
+import argparse
+import json
+import threading
+import logging
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+from urllib.parse import unquote, urlsplit
+
+from services.sheet_sources import RecordedSource, SheetSource
+
+logger = logging.getLogger(__name__)
+
+SHEET_TITLE = 'Hoja 1'
+
+
+def trim_values(values: List[List[str]]) -> List[List[str]]:
+    """Quita las celdas vacías al final de cada fila y las filas vacías al final"""
+    trimmed = []
+    for row in values:
+        end = len(row)
+        while end and row[end - 1] == '':
+            end -= 1
+        trimmed.append(list(row[:end]))
+    while trimmed and not trimmed[-1]:
+        trimmed.pop()
+    return trimmed
+
+
+class SheetsFixtureServer:
+    """
+    Servidor de la API de valores sobre una SheetSource
+
+    Args:
+        source: Fuente de los valores de cada hoja
+        host: Interfaz de escucha
+        port: Puerto; 0 elige uno libre
+    """
+
+    def __init__(self, source: SheetSource, host: str = '127.0.0.1', port: int = 0):
+        self.source = source
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _make_handler(self):
+        source = self.source
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                parts = [unquote(part) for part in urlsplit(self.path).path.split('/') if part]
+                if len(parts) < 3 or parts[:2] != ['v4', 'spreadsheets']:
+                    return self._send(404, _error(404, 'Requested entity was not found.', 'NOT_FOUND'))
+                sheet_id = parts[2]
+                values = source.get_all_values(sheet_id)
+                if values is None:
+                    return self._send(404, _error(404, 'Requested entity was not found.', 'NOT_FOUND'))
+                if len(parts) == 3:
+                    return self._send(200, {
+                        'spreadsheetId': sheet_id,
+                        'sheets': [{'properties': {'sheetId': 0, 'title': SHEET_TITLE, 'index': 0}}]
+                    })
+                if len(parts) == 5 and parts[3] == 'values':
+                    return self._send(200, {
+                        'range': f"'{SHEET_TITLE}'!A1:ZZ{max(len(values), 1)}",
+                        'majorDimension': 'ROWS',
+                        'values': trim_values(values)
+                    })
+                return self._send(400, _error(400, 'Unsupported request.', 'INVALID_ARGUMENT'))
+
+            def _send(self, status, payload):
+                body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json; charset=UTF-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug(f"{self.address_string()} {format % args}")
+
+        return Handler
+
+    def start(self) -> 'SheetsFixtureServer':
+        """Atiende peticiones en un hilo en segundo plano"""
+        self._thread = threading.Thread(target=self._server.serve_forever, name='sheets-fixture-server',
+                                        daemon=True)
+        self._thread.start()
+        logger.info(f"Servidor de fixtures de Sheets en {self.url}")
+        return self
+
+    def serve_forever(self):
+        """Atiende peticiones en el hilo actual"""
+        logger.info(f"Servidor de fixtures de Sheets en {self.url}")
+        self._server.serve_forever()
+
+    def stop(self):
+        """Detiene el servidor"""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+def _error(code: int, message: str, status: str):
+    return {'error': {'code': code, 'message': message, 'status': status}}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='API de valores de Sheets v4 local sobre snapshots grabados')
+    parser.add_argument('--dir', default='data/fixtures', help='Directorio de snapshots (<sheet_id>.json|csv|parquet)')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    server = SheetsFixtureServer(RecordedSource(args.dir), host=args.host, port=args.port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,253 @@
+"""
+Almacenes de snapshots de hojas compartidos entre workers
+"""
+
+import json
+import os
+import time
+import uuid
+import logging
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
+
+from services.sheet_table import SheetTable
+
+logger = logging.getLogger(__name__)
+
+
+def build_snapshot(table: SheetTable) -> Dict[str, Any]:
+    """
+    Construye el snapshot serializable (columnar) de una hoja descargada
+    """
+    snapshot = table.to_dict()
+    snapshot['fetched_at'] = time.time()
+    return snapshot
+
+
+def snapshot_table(snapshot: Dict[str, Any]) -> SheetTable:
+    """Reconstruye la tabla columnar de un snapshot"""
+    return SheetTable.from_dict(snapshot)
+
+
+def snapshot_age(snapshot: Dict[str, Any]) -> float:
+    """Segundos transcurridos desde que se descargó el snapshot"""
+    return time.time() - snapshot.get('fetched_at', 0)
+
+
+class SnapshotStore(ABC):
+    """
+    Interfaz para almacenes de snapshots compartidos
+
+    Además de guardar y leer snapshots, ofrece un candado de actualización
+    por llave para que un solo worker descargue cada hoja a la vez.
+    """
+
+    @abstractmethod
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        """Retorna el snapshot guardado o None"""
+
+    @abstractmethod
+    def save(self, key: str, snapshot: Dict[str, Any]):
+        """Guarda el snapshot de una llave"""
+
+    @abstractmethod
+    def delete(self, key: str):
+        """Elimina el snapshot de una llave"""
+
+    @abstractmethod
+    def acquire_refresh_lock(self, key: str, ttl_seconds: float) -> bool:
+        """Intenta tomar el candado de actualización; True si se obtuvo"""
+
+    @abstractmethod
+    def release_refresh_lock(self, key: str):
+        """Libera el candado de actualización tomado por este proceso"""
+
+    def wait_for(self, key: str, timeout: float, poll_interval: float = 0.2,
+                 newer_than: float = 0) -> Optional[Dict[str, Any]]:
+        """
+        Espera a que otro worker publique un snapshot de la llave
+
+        Args:
+            key: Llave del snapshot
+            timeout: Tiempo máximo de espera en segundos
+            poll_interval: Intervalo entre consultas
+            newer_than: Solo acepta snapshots descargados después de esta marca
+
+        Returns:
+            Snapshot publicado o None si se agotó el tiempo
+        """
+        deadline = time.time() + timeout
+        while True:
+            snapshot = self.load(key)
+            if snapshot is not None and snapshot.get('fetched_at', 0) > newer_than:
+                return snapshot
+            if time.time() >= deadline:
+                return None
+            time.sleep(poll_interval)
+
+
+class LocalFileSnapshotStore(SnapshotStore):
+    """
+    Snapshots en archivos JSON locales
+
+    Las escrituras son atómicas (archivo temporal + os.replace) y cada proceso
+    conserva el último snapshot leído mientras el archivo no cambie.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._loaded: Dict[str, tuple] = {}
+        self._lock_tokens: Dict[str, str] = {}
+
+    def _path(self, key: str, suffix: str = '.json') -> str:
+        safe_key = ''.join(c if c.isalnum() or c in '-_' else '_' for c in key)
+        return os.path.join(self.directory, safe_key + suffix)
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._path(key)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            self._loaded.pop(key, None)
+            return None
+
+        signature = (stat.st_mtime_ns, stat.st_size)
+        cached = self._loaded.get(key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        if stat.st_size == 0:
+            return None
+        try:
+            with open(path, 'rb') as f:
+                snapshot = json.loads(f.read())
+        except (OSError, ValueError) as e:
+            logger.error(f"Error leyendo snapshot {path}: {str(e)}")
+            return None
+
+        self._loaded[key] = (signature, snapshot)
+        return snapshot
+
+    def save(self, key: str, snapshot: Dict[str, Any]):
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def delete(self, key: str):
+        self._loaded.pop(key, None)
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def acquire_refresh_lock(self, key: str, ttl_seconds: float) -> bool:
+        lock_path = self._path(key, '.lock')
+        token = uuid.uuid4().hex
+        for _ in range(2):
+            try:
+                fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                # Robar el candado si quien lo tomó murió sin liberarlo
+                try:
+                    if time.time() - os.path.getmtime(lock_path) < ttl_seconds:
+                        return False
+                    os.remove(lock_path)
+                except FileNotFoundError:
+                    pass
+                continue
+            with os.fdopen(fd, 'w') as f:
+                f.write(token)
+            self._lock_tokens[key] = token
+            return True
+        return False
+
+    def release_refresh_lock(self, key: str):
+        token = self._lock_tokens.pop(key, None)
+        if token is None:
+            return
+        lock_path = self._path(key, '.lock')
+        try:
+            with open(lock_path) as f:
+                if f.read() != token:
+                    return
+            os.remove(lock_path)
+        except FileNotFoundError:
+            pass
+
+
+class RedisSnapshotStore(SnapshotStore):
+    """
+    Snapshots en un servidor compatible con el protocolo de Redis
+
+    Acepta cualquier cliente con la interfaz get/set/delete de redis-py, lo
+    que permite usar un sustituto local en pruebas.
+    """
+
+    def __init__(self, client=None, url: str = None, prefix: str = 'sheets:'):
+        if client is None:
+            import redis
+            client = redis.Redis.from_url(url or 'redis://localhost:6379/0')
+        self.client = client
+        self.prefix = prefix
+        self._lock_tokens: Dict[str, str] = {}
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}snapshot:{key}"
+
+    def _lock_key(self, key: str) -> str:
+        return f"{self.prefix}lock:{key}"
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        raw = self.client.get(self._key(key))
+        if raw is None:
+            return None
+        try:
+            return json.loads(raw)
+        except ValueError as e:
+            logger.error(f"Snapshot inválido en Redis para {key}: {str(e)}")
+            return None
+
+    def save(self, key: str, snapshot: Dict[str, Any]):
+        self.client.set(self._key(key), json.dumps(snapshot, ensure_ascii=False))
+
+    def delete(self, key: str):
+        self.client.delete(self._key(key))
+
+    def acquire_refresh_lock(self, key: str, ttl_seconds: float) -> bool:
+        token = uuid.uuid4().hex
+        acquired = self.client.set(self._lock_key(key), token, nx=True, px=int(ttl_seconds * 1000))
+        if acquired:
+            self._lock_tokens[key] = token
+            return True
+        return False
+
+    def release_refresh_lock(self, key: str):
+        token = self._lock_tokens.pop(key, None)
+        if token is None:
+            return
+        current = self.client.get(self._lock_key(key))
+        if isinstance(current, bytes):
+            current = current.decode('utf-8')
+        if current == token:
+            self.client.delete(self._lock_key(key))
+
+
+def create_snapshot_store(config) -> Optional[SnapshotStore]:
+    """
+    Crea el almacén de snapshots según la configuración
+
+    Args:
+        config: Mapeo de configuración (app.config)
+
+    Returns:
+        SnapshotStore o None si el backend es 'memory'
+    """
+    backend = (config.get('SNAPSHOT_BACKEND') or 'memory').lower()
+    if backend == 'file':
+        return LocalFileSnapshotStore(config.get('SNAPSHOT_DIR', 'cache/snapshots'))
+    if backend == 'redis':
+        return RedisSnapshotStore(url=config.get('REDIS_URL'))
+    return None
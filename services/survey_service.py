@@ -0,0 +1,175 @@
+"""
+Servicio de agregación declarativa de encuestas
+"""
+
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Respuestas válidas de las preguntas con escala de 1 a 5
+RATING_VALUES = ('1', '2', '3', '4', '5')
+NO_RESPONSE = 'No responde'
+
+
+def rating_or_no_response(value: str) -> str:
+    """
+    Normaliza una calificación de 1 a 5; cualquier otra respuesta cuenta como 'No responde'
+    """
+    return value if value in RATING_VALUES else NO_RESPONSE
+
+
+class SurveyQuestion:
+    """
+    Pregunta de la encuesta a contar
+
+    Args:
+        name: Llave del conteo en el resultado (p. ej. 'limpieza_counts')
+        column: Nombre exacto de la columna en la hoja
+        normalizer: Función opcional aplicada a cada respuesta no vacía
+        start: Primera fila (índice en los registros) incluida
+        stop: Fila final excluida; None para llegar al final
+    """
+
+    def __init__(self, name: str, column: str, normalizer: Optional[Callable[[str], str]] = None,
+                 start: int = 0, stop: Optional[int] = None):
+        self.name = name
+        self.column = column
+        self.normalizer = normalizer
+        self.start = start
+        self.stop = stop
+
+
+# Filas O2 a O440 de la hoja (registros 0 a 441)
+CONSUELO_ROW_LIMIT = 442
+
+EL_CONSUELO_SURVEY = [
+    # Gráficas de torta (todas las filas)
+    SurveyQuestion('sexo_counts', 'Sexo'),
+    SurveyQuestion('nivel_educativo_counts', 'Nivel educativo'),
+    SurveyQuestion('tiempo_reside_counts', '¿Hace cuanto tiempo reside en el barrio?'),
+    # Columna O (limpieza general)
+    SurveyQuestion('limpieza_counts', 'Como calificaria la limpieza general del barrio',
+                   normalizer=rating_or_no_response, stop=CONSUELO_ROW_LIMIT),
+    # Columnas P a AF
+    SurveyQuestion('residuos_counts', '¿Con qué frecuencia observa residuos en las calles o zonas comunes?',
+                   stop=CONSUELO_ROW_LIMIT),
+    SurveyQuestion('tiempo_counts', '¿Considera que la acumulación de residuos afecta la imagen del barrio?',
+                   stop=CONSUELO_ROW_LIMIT),
+    SurveyQuestion('seguridad_counts', '¿Considera que el tema de residuos esta relacionado con el tema de seguridad del barrio?',
+                   stop=CONSUELO_ROW_LIMIT),
+    SurveyQuestion('calidad_vida_counts', '¿Considera que la acumulación de residuos afecta su calidad de vida?',
+                   stop=CONSUELO_ROW_LIMIT),
+    SurveyQuestion('separacion_counts', '¿Separa los residuos en su casa (orgánicos, reciclables, no reciclables)?',
+                   stop=CONSUELO_ROW_LIMIT),
+    SurveyQuestion('horario_counts', '¿Conoce el horario de recolección de residuos en el barrio?',
+                   stop=CONSUELO_ROW_LIMIT),
+    SurveyQuestion('saca_horarios_counts', '¿Saca los residuos en los horarios establecidos?',
+                   stop=CONSUELO_ROW_LIMIT),
+    SurveyQuestion('recuperador_counts', '¿Entrega sus residuos aprovechables a un recuperador de oficio?',
+                   stop=CONSUELO_ROW_LIMIT),
+    SurveyQuestion('lugar_counts', '¿En que lugar dispone los residuos?',
+                   stop=CONSUELO_ROW_LIMIT),
+    SurveyQuestion('servicio_counts', '¿Cómo calificaría la operación del servicio de aseo de Promoambiental Distrito S.A.S?',
+                   stop=CONSUELO_ROW_LIMIT),
+    SurveyQuestion('frecuencia_camion_counts', '¿Con qué frecuencia pasa el camión recolector de residuos?',
+                   stop=CONSUELO_ROW_LIMIT),
+    SurveyQuestion('participacion_counts', '¿Ha participado en alguna campaña de limpieza o educación ambiental en su barrio?',
+                   stop=CONSUELO_ROW_LIMIT),
+    SurveyQuestion('iniciativas_counts', ' ¿Le gustaría participar en iniciativas comunitarias de limpieza?',
+                   stop=CONSUELO_ROW_LIMIT),
+    SurveyQuestion('educacion_counts', '¿Considera que hace falta más educación ambiental en el barrio?',
+                   stop=CONSUELO_ROW_LIMIT),
+    SurveyQuestion('punto_critico_counts', '¿Sabe que es un punto critico?',
+                   stop=CONSUELO_ROW_LIMIT),
+    SurveyQuestion('identifica_counts', '¿Identifica puntos críticos en el barrio?',
+                   stop=CONSUELO_ROW_LIMIT),
+    SurveyQuestion('tiempo_puntos_counts', '¿Cada cuanto tiempo ve estos puntos en el barrio?',
+                   stop=CONSUELO_ROW_LIMIT),
+]
+
+
+class SurveyAggregator:
+    """
+    Calcula los conteos de respuestas de todas las preguntas de una encuesta
+
+    Sobre una tabla columnar recorre cada columna una sola vez; sobre una
+    lista de registros hace una única pasada por las filas.
+    """
+
+    def __init__(self, questions: List[SurveyQuestion]):
+        self.questions = questions
+
+    def aggregate(self, raw_data) -> Dict[str, Any]:
+        """
+        Cuenta las respuestas de cada pregunta
+
+        Args:
+            raw_data: Registros de la encuesta (lista de dicts o vista de SheetTable)
+
+        Returns:
+            Dict con 'num_encuestas' y un conteo por pregunta
+        """
+        table = getattr(raw_data, 'table', None)
+        if table is not None:
+            result = self._aggregate_columns(table)
+        else:
+            result = self._aggregate_rows(raw_data)
+        result['num_encuestas'] = len(raw_data)
+        return result
+
+    def _aggregate_columns(self, table) -> Dict[str, Any]:
+        result = {}
+        for question in self.questions:
+            counts = {}
+            normalizer = question.normalizer
+            for value in table.column(question.column)[question.start:question.stop]:
+                value = value.strip()
+                if value:
+                    if normalizer is not None:
+                        value = normalizer(value)
+                    counts[value] = counts.get(value, 0) + 1
+            result[question.name] = counts
+        return result
+
+    def _aggregate_rows(self, raw_data: List[Dict]) -> Dict[str, Any]:
+        result = {question.name: {} for question in self.questions}
+        plan = [
+            (result[q.name], q.column, q.normalizer, q.start, q.stop if q.stop is not None else len(raw_data))
+            for q in self.questions
+        ]
+        for index, row in enumerate(raw_data):
+            for counts, column, normalizer, start, stop in plan:
+                if index < start or index >= stop:
+                    continue
+                value = str(row.get(column, '')).strip()
+                if value:
+                    if normalizer is not None:
+                        value = normalizer(value)
+                    counts[value] = counts.get(value, 0) + 1
+        return result
+
+
+el_consuelo_aggregator = SurveyAggregator(EL_CONSUELO_SURVEY)
+
+# Conteos para las gráficas de la página: todas las filas, llave = nombre de la columna
+el_consuelo_chart_aggregator = SurveyAggregator([
+    SurveyQuestion(question.column, question.column) for question in EL_CONSUELO_SURVEY
+])
+
+
+def build_el_consuelo_summary(raw_data) -> Dict[str, Any]:
+    """
+    Construye el resumen de El Consuelo: conteos de la plantilla y de las gráficas
+
+    Args:
+        raw_data: Registros de la encuesta
+
+    Returns:
+        Dict con 'num_encuestas', los '*_counts' y 'charts' (conteos por columna)
+    """
+    summary = el_consuelo_aggregator.aggregate(raw_data)
+    charts = el_consuelo_chart_aggregator.aggregate(raw_data)
+    charts.pop('num_encuestas', None)
+    summary['charts'] = charts
+    return summary
@@ -0,0 +1,58 @@
+"""
+Tests para la suite de rendimiento con hojas sintéticas
+"""
+
+import json
+
+from benchmarks.suite import compare_results, run_suite, save_results
+from benchmarks.synthetic import ACTIVITY_HEADERS, FakeSheetsConnector, activity_values, survey_values
+
+
+class TestSyntheticSheets:
+    """Tests para los generadores de hojas y el conector falso"""
+
+    def test_sheets_are_deterministic(self):
+        """Test que la misma semilla produce la misma hoja"""
+        values = activity_values(50)
+        assert values == activity_values(50)
+        assert values[0] == ACTIVITY_HEADERS
+        assert len(values) == 51
+        assert len(survey_values(20)) == 21
+
+    def test_fake_connector_returns_rows_and_headers(self):
+        """Test que el conector falso entrega filas como el conector real"""
+        connector = FakeSheetsConnector({'actividades': activity_values(10)})
+        data, headers = connector.get_sheet_data('actividades')
+        assert headers == ACTIVITY_HEADERS
+        assert len(data) == 10
+        assert set(data[0].keys()) == set(ACTIVITY_HEADERS)
+        assert connector.get_data('otra') == []
+
+
+class TestSuite:
+    """Tests para run_suite y compare_results"""
+
+    def test_run_suite_reports_every_case(self, tmp_path):
+        """Test que cada caso registra tiempo, rendimiento y memoria y se guarda en JSON"""
+        report = run_suite(sizes=[30], repeat=1)
+        cases = {result['case'] for result in report['results']}
+        assert {'process_raw_data', 'validate_required_fields', 'parse_date',
+                'el_consuelo_summary', 'generate_participacion_chart', 'generate_diario_chart'} <= cases
+        for result in report['results']:
+            assert result['rows'] == 30
+            assert result['best_seconds'] >= 0
+            assert result['peak_memory_mb'] >= 0
+
+        path = save_results(report, str(tmp_path / 'resultados.json'))
+        with open(path, encoding='utf-8') as f:
+            assert json.load(f)['meta']['sizes'] == [30]
+
+    def test_compare_flags_regressions(self):
+        """Test que un aumento mayor al umbral se marca como regresión"""
+        baseline = {'results': [{'case': 'a', 'rows': 10, 'best_seconds': 1.0},
+                                {'case': 'b', 'rows': 10, 'best_seconds': 1.0}]}
+        current = {'results': [{'case': 'a', 'rows': 10, 'best_seconds': 1.5},
+                               {'case': 'b', 'rows': 10, 'best_seconds': 1.05},
+                               {'case': 'c', 'rows': 10, 'best_seconds': 1.0}]}
+        comparison = compare_results(baseline, current, threshold=0.1)
+        assert [(item['case'], item['regression']) for item in comparison] == [('a', True), ('b', False)]
@@ -0,0 +1,188 @@
+"""
+Tests para el servicio de caché
+"""
+
+import threading
+import time
+
+import pytest
+
+from services.cache_service import ResultCache, SheetCache, SingleFlight
+
+
+class TestSheetCache:
+    """Tests para la caché con TTL y stale-while-revalidate"""
+    
+    def test_fresh_entry_is_served_from_memory(self):
+        """Test que una llave vigente no vuelve a cargarse"""
+        cache = SheetCache(ttl_seconds=60)
+        calls = []
+        loader = lambda: calls.append(1) or ['fila']
+        
+        assert cache.get_or_load('hoja', loader) == ['fila']
+        assert cache.get_or_load('hoja', loader) == ['fila']
+        assert len(calls) == 1
+    
+    def test_stale_entry_returns_old_value_and_refreshes_once(self):
+        """Test que una llave vencida entrega la copia anterior y refresca una vez"""
+        cache = SheetCache(ttl_seconds=0)
+        cache.set('hoja', 'viejo')
+        release = threading.Event()
+        calls = []
+        
+        def loader():
+            calls.append(1)
+            release.wait(2)
+            return 'nuevo'
+        
+        assert cache.get_or_load('hoja', loader) == 'viejo'
+        assert cache.get_or_load('hoja', loader) == 'viejo'
+        release.set()
+        
+        deadline = time.time() + 2
+        while cache.get('hoja') != 'nuevo' and time.time() < deadline:
+            time.sleep(0.01)
+        
+        assert cache.get('hoja') == 'nuevo'
+        assert len(calls) == 1
+    
+    def test_refresh_in_flight_does_not_undo_invalidate(self):
+        """Test que un refresco en curso no vuelve a guardar una llave invalidada"""
+        cache = SheetCache(ttl_seconds=0)
+        cache.set('hoja', 'viejo')
+        started, release = threading.Event(), threading.Event()
+        
+        def loader():
+            started.set()
+            release.wait(2)
+            return 'cargado antes de invalidar'
+        
+        assert cache.get_or_load('hoja', loader) == 'viejo'
+        assert started.wait(2)
+        cache.invalidate('hoja')
+        release.set()
+        
+        deadline = time.time() + 2
+        while 'hoja' in cache._refreshing and time.time() < deadline:
+            time.sleep(0.01)
+        assert cache.get('hoja') is None
+        
+        cache.set('hoja', 'nuevo')
+        assert cache.get('hoja') == 'nuevo'
+    
+    def test_none_results_are_not_cached(self):
+        """Test que los errores de carga (None) no se guardan"""
+        cache = SheetCache(ttl_seconds=60)
+        
+        assert cache.get_or_load('hoja', lambda: None) is None
+        assert cache.get_or_load('hoja', lambda: 'datos') == 'datos'
+    
+    def test_invalidate_only_affects_one_key(self):
+        """Test que invalidar una llave conserva las demás"""
+        cache = SheetCache(ttl_seconds=60)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        
+        cache.invalidate('a')
+        
+        assert cache.get('a') is None
+        assert cache.get('b') == 2
+
+
+class TestSingleFlight:
+    """Tests para la agrupación de llamadas concurrentes"""
+    
+    def test_concurrent_calls_share_one_execution(self):
+        """Test que llamadas simultáneas a la misma llave ejecutan una sola vez"""
+        flight = SingleFlight()
+        release = threading.Event()
+        calls = []
+        results = []
+        
+        def fetch():
+            calls.append(1)
+            release.wait(2)
+            return 'datos'
+        
+        threads = [
+            threading.Thread(target=lambda: results.append(flight.do('hoja', fetch)))
+            for _ in range(5)
+        ]
+        for t in threads:
+            t.start()
+        deadline = time.time() + 2
+        while flight.stats()['coalesced'] < 4 and time.time() < deadline:
+            time.sleep(0.01)
+        release.set()
+        for t in threads:
+            t.join()
+        
+        assert len(calls) == 1
+        assert results == ['datos'] * 5
+        stats = flight.stats()
+        assert stats['issued'] == 1
+        assert stats['coalesced'] == 4
+        assert stats['in_flight'] == 0
+    
+    def test_errors_are_propagated_and_not_retained(self):
+        """Test que un error se propaga y la siguiente llamada vuelve a ejecutar"""
+        flight = SingleFlight()
+        
+        def fail():
+            raise RuntimeError('sin conexión')
+        
+        with pytest.raises(RuntimeError):
+            flight.do('hoja', fail)
+        assert flight.do('hoja', lambda: 'ok') == 'ok'
+        assert flight.stats()['issued'] == 2
+
+
+class TestResultCache:
+    """Tests para la caché LRU de resultados procesados"""
+    
+    def test_computes_once_per_key(self):
+        """Test que una llave repetida se sirve desde memoria"""
+        cache = ResultCache(max_entries=2)
+        calls = []
+        compute = lambda: calls.append(1) or {'data': []}
+        
+        first = cache.get_or_compute('v1', compute)
+        assert cache.get_or_compute('v1', compute) is first
+        assert len(calls) == 1
+        assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 1
+    
+    def test_evicts_least_recently_used(self):
+        """Test que se respeta el máximo de entradas"""
+        cache = ResultCache(max_entries=2)
+        for key in ('v1', 'v2', 'v1', 'v3'):
+            cache.get_or_compute(key, lambda: key)
+        
+        assert cache.stats()['entries'] == 2
+        calls = []
+        cache.get_or_compute('v1', lambda: calls.append('v1'))
+        cache.get_or_compute('v2', lambda: calls.append('v2'))
+        assert calls == ['v2']
+    
+    def test_concurrent_misses_share_one_computation(self):
+        """Test que fallos concurrentes de la misma llave calculan una vez"""
+        cache = ResultCache()
+        calls = []
+        release = threading.Event()
+        
+        def compute():
+            calls.append(1)
+            release.wait(timeout=5)
+            return 'resultado'
+        
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.get_or_compute('v1', compute)))
+                   for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.1)
+        release.set()
+        for thread in threads:
+            thread.join()
+        
+        assert results == ['resultado'] * 4
+        assert len(calls) == 1
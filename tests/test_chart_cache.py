@@ -0,0 +1,55 @@
+"""
+Tests para la caché de gráficos serializados
+"""
+
+import json
+
+from services.chart_cache import ChartCache
+
+
+class TestChartCache:
+    """Tests para ChartCache"""
+    
+    def test_renders_once_per_data_version(self):
+        """Test que el gráfico se genera una vez por versión de los datos"""
+        cache = ChartCache(max_entries=4)
+        calls = []
+        render = lambda: calls.append(1) or {'chart_json': '{}', 'top_entities': []}
+        
+        body = cache.get_or_render('participacion', 'v1', render)
+        assert cache.get_or_render('participacion', 'v1', render) is body
+        assert json.loads(body) == {'chart_json': '{}', 'top_entities': []}
+        
+        cache.get_or_render('participacion', 'v2', render)
+        cache.get_or_render('participacion', 'v2', render, params={'entidad': 'IDRD'})
+        assert len(calls) == 3
+        assert cache.stats()['hits'] == 1
+    
+    def test_lru_eviction(self):
+        """Test que se descarta el gráfico usado hace más tiempo"""
+        cache = ChartCache(max_entries=2)
+        for chart_type in ('participacion', 'diario', 'participacion', 'mensual'):
+            cache.get_or_render(chart_type, 'v1', lambda: {})
+        
+        calls = []
+        cache.get_or_render('participacion', 'v1', lambda: calls.append('participacion') or {})
+        cache.get_or_render('diario', 'v1', lambda: calls.append('diario') or {})
+        assert calls == ['diario']
+    
+    def test_disk_persistence_survives_new_instance(self, tmp_path):
+        """Test que un proceso nuevo lee el gráfico persistido en disco"""
+        ChartCache(directory=str(tmp_path)).get_or_render('diario', 'v1', lambda: {'legend_data': []})
+        
+        cache = ChartCache(directory=str(tmp_path))
+        body = cache.get_or_render('diario', 'v1', lambda: {'legend_data': ['no debería generarse']})
+        assert json.loads(body) == {'legend_data': []}
+        assert cache.stats()['disk_hits'] == 1
+    
+    def test_format_version_invalidates_disk_entries(self, tmp_path, monkeypatch):
+        """Test que al cambiar la versión del formato no se sirven gráficos viejos del disco"""
+        from services import chart_cache
+        ChartCache(directory=str(tmp_path)).get_or_render('diario', 'v1', lambda: {'formato': 'viejo'})
+        
+        monkeypatch.setattr(chart_cache, 'CHART_FORMAT_VERSION', chart_cache.CHART_FORMAT_VERSION + 1)
+        body = ChartCache(directory=str(tmp_path)).get_or_render('diario', 'v1', lambda: {'formato': 'nuevo'})
+        assert json.loads(body) == {'formato': 'nuevo'}
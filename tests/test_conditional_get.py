@@ -0,0 +1,67 @@
+"""
+Tests de ETag y respuestas 304 en las APIs de datos
+"""
+
+import pytest
+
+pytest.importorskip('flask')
+
+from benchmarks.loadtest import offline_config, write_fixtures
+
+DATA_ROUTES = [
+    '/api/data',
+    '/api/data?page=2&page_size=10',
+    '/api/charts/participacion',
+    '/api/charts/diario',
+    '/api/el-consuelo/data',
+    '/api/el-consuelo/summary'
+]
+
+
+@pytest.fixture(scope='module')
+def client(tmp_path_factory):
+    from app_modular import create_app
+    fixture_dir = write_fixtures(str(tmp_path_factory.mktemp('fixtures')), activity_rows=120, survey_rows=30)
+    return create_app(offline_config(fixture_dir)).test_client()
+
+
+class TestConditionalGet:
+    """Tests de peticiones condicionales"""
+
+    @pytest.mark.parametrize('route', DATA_ROUTES)
+    def test_not_modified_when_etag_matches(self, client, route):
+        """Test que con el ETag vigente se responde 304 sin cuerpo"""
+        response = client.get(route)
+        etag = response.headers['ETag']
+        assert response.status_code == 200
+        assert 'no-cache' in response.headers['Cache-Control']
+
+        cached = client.get(route, headers={'If-None-Match': etag})
+        assert cached.status_code == 304
+        assert cached.data == b''
+        assert cached.headers['ETag'] == etag
+
+        assert client.get(route, headers={'If-None-Match': '"otra-version"'}).status_code == 200
+
+    def test_queries_have_their_own_etag(self, client):
+        """Test que cada consulta de /api/data tiene un ETag distinto al de la respuesta completa"""
+        etags = {client.get(route).headers['ETag']
+                 for route in ('/api/data', '/api/data?page=1', '/api/data?page=2')}
+        assert len(etags) == 3
+    
+    def test_weak_etag_when_body_has_worker_fields(self, client):
+        """Test que /api/data (hora de publicación del worker) usa ETag débil y el resto fuerte"""
+        assert client.get('/api/data').headers['ETag'].startswith('W/')
+        assert client.get('/api/data?page=1').headers['ETag'].startswith('W/')
+        summary = client.get('/api/el-consuelo/summary')
+        assert not summary.headers['ETag'].startswith('W/')
+        assert 'version' not in summary.get_json()
+    
+    def test_chart_etag_follows_format_version(self, client, monkeypatch):
+        """Test que un cambio de formato de los gráficos invalida el ETag"""
+        from services import chart_cache
+        etag = client.get('/api/charts/participacion').headers['ETag']
+        monkeypatch.setattr(chart_cache, 'CHART_FORMAT_VERSION', chart_cache.CHART_FORMAT_VERSION + 1)
+        response = client.get('/api/charts/participacion', headers={'If-None-Match': etag})
+        assert response.status_code == 200
+        assert response.headers['ETag'] != etag
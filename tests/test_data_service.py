@@ -0,0 +1,99 @@
+"""
+Tests para el procesamiento de datos de actividades
+"""
+
+import pytest
+
+from services.data_service import DataService, VectorizedDataService, create_data_service
+from services.sheet_table import SheetTable
+from utils.data_utils import validate_required_fields
+
+
+def make_rows(n):
+    return [
+        {
+            'Entidad ': 'IDRD' if i % 4 else '',
+            'Actividad': f'Actividad {i}',
+            'Fecha final de ejecución': '2025-03-12' if i % 3 else '12/13/2025x',
+            'Población impactada': f'{i * 10} personas'
+        }
+        for i in range(n)
+    ]
+
+
+class TestDataService:
+    """Tests para DataService.process_raw_data"""
+    
+    def test_validation_matches_validate_required_fields(self):
+        """Test que la pasada única produce la misma validación que la función original"""
+        service = DataService()
+        rows = make_rows(40) + [{'Entidad': 'Alcaldía', 'Actividad': 'Sin fecha'}]
+        
+        result = service.process_raw_data(rows)
+        
+        assert result['validation'] == validate_required_fields(rows, service.required_fields)
+    
+    def test_records_and_statistics(self):
+        """Test de registros procesados y estadísticas"""
+        service = DataService()
+        rows = make_rows(12)
+        
+        for data in (rows, SheetTable.from_records(rows).rows()):
+            result = service.process_raw_data(data)
+            valid = [record for record in result['data'] if record['is_valid']]
+            
+            assert result['statistics']['total_records'] == 12
+            assert result['statistics']['valid_records'] == len(valid) == 9
+            assert result['statistics']['total_population'] == sum(r['population_impacted'] for r in valid)
+            assert result['data'][1]['original'] == rows[1]
+            assert result['data'][0]['errors'] == ['Campo faltante: Entidad']
+            assert result['data'][3]['has_valid_date'] is False
+    
+    def test_empty_data(self):
+        """Test de datos vacíos"""
+        service = DataService()
+        result = service.process_raw_data([])
+        
+        assert result['validation']['valid'] is False
+        assert result['validation']['missing_fields'] == service.required_fields
+        assert result['data'] == []
+
+
+class TestVectorizedDataService:
+    """Tests de paridad del motor por columnas"""
+    
+    def test_matches_row_engine(self):
+        """Test que el motor vectorizado produce el mismo resultado que el motor por filas"""
+        pytest.importorskip('pandas')
+        poblaciones = ['1,5', '20 personas', '', 'N/A', '1.234.5', '7', '.', '3.']
+        fechas = ['2025-03-12', '12/03/2025', '03/25/2025', '2025-03-12 14:30:00', '12-03-2025',
+                  '2025-3-5', '0001-01-01', '31/02/2025', 'None', '', ' 2025-03-12']
+        rows = [
+            {
+                'Entidad ': '' if i % 7 == 0 else 'IDRD',
+                'Actividad': '' if i % 5 == 0 else f'Actividad {i}',
+                'Fecha final de ejecución': fechas[i % len(fechas)],
+                'Población impactada': poblaciones[i % len(poblaciones)]
+            }
+            for i in range(200)
+        ]
+        
+        for data in (rows, SheetTable.from_records(rows).rows()):
+            expected = DataService().process_raw_data(data)
+            result = VectorizedDataService().process_raw_data(data)
+            
+            for key in ('data', 'validation', 'statistics'):
+                assert result[key] == expected[key]
+    
+    def test_missing_columns_and_selection(self):
+        """Test de columnas requeridas ausentes y selección por configuración"""
+        pytest.importorskip('pandas')
+        rows = [{'Entidad': 'IDRD', 'Actividad': 'Taller'}, {'Entidad': '', 'Actividad': 'Taller'}]
+        
+        expected = DataService().process_raw_data(rows)
+        result = VectorizedDataService().process_raw_data(rows)
+        
+        assert result['data'] == expected['data']
+        assert result['validation'] == expected['validation']
+        assert isinstance(create_data_service({'DATA_ENGINE': 'pandas'}), VectorizedDataService)
+        assert type(create_data_service({})) is DataService
@@ -0,0 +1,83 @@
+"""
+Tests para el parser de fechas
+"""
+
+import itertools
+from datetime import datetime
+
+from utils.date_utils import DATE_FORMATS, DateNormalizer, date_cache_info, parse_date, parse_dates
+
+
+def strptime_parse(date_string):
+    """Parser original: prueba cada formato con datetime.strptime"""
+    if not date_string or date_string == 'None':
+        return None
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(date_string, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+class TestParseDate:
+    """Tests para parse_date y parse_dates"""
+    
+    def test_matches_strptime_on_generated_strings(self):
+        """Test de equivalencia con strptime sobre combinaciones de partes de fechas"""
+        parts = ['2025', '1', '01', '12', '13', '29', '31', '32', ' 5', '0', '']
+        samples = set()
+        for a, b, c in itertools.product(parts, repeat=3):
+            for sep in ('-', '/', '.'):
+                samples.add(f'{a}{sep}{b}{sep}{c}')
+        for time_part in ('14:30:00', '9:5:7', '24:00:00', '23:59:61', '23:59:60'):
+            samples.update({f'2025-03-12 {time_part}', f'2024-02-29  {time_part}'})
+        samples.update({'None', '', '2025-03-12x', ' 2025-03-12', '12/03/25'})
+        
+        for sample in samples:
+            assert parse_date(sample) == strptime_parse(sample), sample
+    
+    def test_parse_dates_batch_uses_cache(self):
+        """Test que las fechas repetidas se resuelven desde el caché"""
+        before = date_cache_info()
+        column = ['2025-03-12', '12/03/2025', '', None, 'texto'] * 200
+        
+        result = parse_dates(column)
+        
+        assert result[:5] == [datetime(2025, 3, 12), datetime(2025, 3, 12), None, None, None]
+        assert result == [parse_date(value) for value in column]
+        assert date_cache_info()['misses'] - before['misses'] <= 3
+
+
+class TestDateNormalizer:
+    """Tests para la normalización de fechas a ISO"""
+    
+    def test_supported_formats(self):
+        """Test de cada regla de la tabla y del respaldo con strptime"""
+        normalizer = DateNormalizer()
+        cases = {
+            ' 2024-03-15 ': '2024-03-15',
+            '5/3/2024': '2024-03-05',
+            '2024/3/5': '2024-03-05',
+            '15 de Marzo de 2024': '2024-03-15',
+            'dic 1, 2024': '2024-12-01',
+            '15 mar 2024': '2024-03-15',
+            '15/03/99': '1999-03-15',
+            '15.03.2024': '2024-03-15',
+            '15 / 03 / 2024': '2024-03-15',
+            '2024.03.15': '2024-03-15',
+            '15 March 2024': None,
+            '15/03-2024': None,
+            '': None,
+            None: None,
+        }
+        for value, expected in cases.items():
+            assert normalizer.normalize(value) == expected, value
+    
+    def test_column_and_counters(self):
+        """Test de normalización por columna y contadores por regla"""
+        normalizer = DateNormalizer()
+        column = ['2024-03-15', '15/03/2024', '2024-03-15', 'sin fecha', '']
+        
+        assert normalizer.normalize_column(column) == ['2024-03-15', '2024-03-15', '2024-03-15', None, None]
+        assert normalizer.stats() == {'iso': 2, 'dd/mm/yyyy': 1, 'sin formato': 1}
@@ -0,0 +1,122 @@
+"""
+Tests para la sincronización incremental de hojas
+"""
+
+from services.data_service import DataService
+from services.delta_sync import DeltaSync, row_fingerprint, row_fingerprints
+from services.sheet_table import SheetTable
+
+
+def make_row(entidad, poblacion='10', fecha='2025-03-12'):
+    return {
+        'Entidad': entidad,
+        'Actividad': 'Jornada',
+        'Fecha final de ejecución': fecha,
+        'Población impactada': poblacion
+    }
+
+
+def comparable(result):
+    """Quita los campos que dependen de la hora o de la sincronización"""
+    return {k: v for k, v in result.items() if k not in ('processed_at', 'version', 'changes')}
+
+
+class CountingDataService(DataService):
+    """DataService que cuenta los registros procesados"""
+    
+    def __init__(self):
+        super().__init__()
+        self.processed_count = 0
+    
+    def _process_record(self, record):
+        self.processed_count += 1
+        return super()._process_record(record)
+
+
+class TestDeltaSync:
+    """Tests para DeltaSync"""
+    
+    def test_row_fingerprint_changes_with_content(self):
+        """Test que la huella cambia solo si cambia el contenido"""
+        assert row_fingerprint(make_row('A')) == row_fingerprint(make_row('A'))
+        assert row_fingerprint(make_row('A')) != row_fingerprint(make_row('B'))
+    
+    def test_only_changed_rows_are_processed(self):
+        """Test que solo se reprocesan las filas agregadas o modificadas"""
+        service = CountingDataService()
+        sync = DeltaSync(service)
+        rows = [make_row('A'), make_row('B'), make_row('C')]
+        
+        first = sync.sync(rows)
+        assert first['changes'] == {'appended': 3, 'modified': 0, 'deleted': 0}
+        assert service.processed_count == 3
+        
+        rows = rows + [make_row('D', poblacion='5')]
+        second = sync.sync(rows)
+        assert second['changes'] == {'appended': 1, 'modified': 0, 'deleted': 0}
+        assert second['version'] == first['version'] + 1
+        assert service.processed_count == 4
+        
+        unchanged = sync.sync(rows)
+        assert unchanged['version'] == second['version']
+        assert service.processed_count == 4
+    
+    def test_result_matches_full_processing(self):
+        """Test que el resultado incremental coincide con el procesamiento completo"""
+        service = DataService()
+        sync = DeltaSync(service)
+        rows = [make_row('A'), make_row('B', poblacion=''), make_row('C', fecha='sin fecha')]
+        sync.sync(rows)
+        
+        rows = [make_row('A', poblacion='1.500'), make_row('B', poblacion='')]
+        result = sync.sync(rows)
+        
+        assert result['changes'] == {'appended': 0, 'modified': 1, 'deleted': 1}
+        assert comparable(result) == comparable(service.process_raw_data(rows))
+    
+    def test_fingerprints_over_sheet_table_match_row_dicts(self):
+        """Test que las huellas sobre la tabla columnar coinciden con las de los diccionarios"""
+        rows = [make_row('A'), make_row('B', poblacion='')]
+        table = SheetTable.from_records(rows)
+        
+        assert row_fingerprints(table.rows()) == [row_fingerprint(row) for row in rows]
+    
+    def test_concurrent_syncs_keep_state_consistent(self):
+        """Test que sincronizaciones simultáneas con datos distintos no corrompen el estado"""
+        import threading
+        service = DataService()
+        sync = DeltaSync(service)
+        versions = [[make_row(f'E{i}') for i in range(size)] for size in (50, 80, 20, 65)]
+        
+        threads = [threading.Thread(target=lambda rows=rows: [sync.sync(rows) for _ in range(20)])
+                   for rows in versions]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        rows = versions[0]
+        assert comparable(sync.sync(rows)) == comparable(service.process_raw_data(rows))
+    
+    def test_uses_the_configured_engine(self):
+        """Test que con DATA_ENGINE='pandas' las filas cambiadas pasan por el motor por columnas"""
+        import pytest
+        pytest.importorskip('pandas')
+        from services.data_service import VectorizedDataService
+        
+        class CountingVectorized(VectorizedDataService):
+            batches = []
+            
+            def process_raw_data(self, raw_data):
+                self.batches.append(len(raw_data))
+                return super().process_raw_data(raw_data)
+        
+        service = CountingVectorized()
+        sync = DeltaSync(service)
+        rows = [make_row('A'), make_row('B', poblacion=''), make_row('C', fecha='sin fecha')]
+        sync.sync(rows)
+        rows = [make_row('A', poblacion='7'), rows[1], rows[2], make_row('D')]
+        result = sync.sync(rows)
+        
+        assert service.batches == [3, 2]
+        assert comparable(result) == comparable(DataService().process_raw_data(rows))
@@ -0,0 +1,101 @@
+"""
+Tests para el constructor ligero de figuras de Plotly
+"""
+
+import json
+
+import pytest
+
+from services import figure_builder as fb
+
+HOVER = '<b>%{label}</b><br>Actividades: %{customdata}<br><extra></extra>'
+
+
+def build_pie():
+    return fb.figure([fb.pie_trace(
+        labels=['Alcaldía', 'IDRD'],
+        values=[62.5, 37.5],
+        hole=0.4,
+        textinfo='percent',
+        textposition='inside',
+        marker=dict(colors=['#FF6B6B', '#4ECDC4']),
+        hovertemplate=HOVER,
+        customdata=[5, 3]
+    )], dict(showlegend=False, margin=dict(l=0, r=0, t=0, b=0), height=400))
+
+
+def build_bar():
+    return fb.figure([fb.bar_trace(
+        x=['2025-03-01', '2025-04-02'],
+        y=[2, 7],
+        marker=dict(color=['#FF6B6B', '#4ECDC4']),
+        hovertemplate='<b>Fecha: %{x}</b><br><extra></extra>'
+    )], dict(
+        title=fb.title('Actividades por Día'),
+        xaxis=dict(title=fb.title('Fecha')),
+        yaxis=dict(title=fb.title('Número de Actividades')),
+        height=400,
+        margin=dict(l=50, r=50, t=50, b=50)
+    ))
+
+
+class TestFigureBuilder:
+    """Tests para figure_builder"""
+    
+    def test_plain_json_shape(self):
+        """Test que la figura es JSON plano con el tipo de cada traza"""
+        fig = json.loads(fb.to_json(build_pie()))
+        
+        assert fig['data'][0]['type'] == 'pie'
+        assert fig['data'][0]['labels'] == ['Alcaldía', 'IDRD']
+        assert fig['layout']['height'] == 400
+    
+    def test_matches_plotly_to_json(self):
+        """Test que la salida coincide con go.Figure(...).to_json()"""
+        go = pytest.importorskip('plotly.graph_objects')
+        
+        pie = go.Figure(data=[go.Pie(
+            labels=['Alcaldía', 'IDRD'],
+            values=[62.5, 37.5],
+            hole=0.4,
+            textinfo='percent',
+            textposition='inside',
+            marker=dict(colors=['#FF6B6B', '#4ECDC4']),
+            hovertemplate=HOVER,
+            customdata=[5, 3]
+        )])
+        pie.update_layout(showlegend=False, margin=dict(l=0, r=0, t=0, b=0), height=400)
+        
+        bar = go.Figure(data=[go.Bar(
+            x=['2025-03-01', '2025-04-02'],
+            y=[2, 7],
+            marker_color=['#FF6B6B', '#4ECDC4'],
+            hovertemplate='<b>Fecha: %{x}</b><br><extra></extra>'
+        )])
+        bar.update_layout(
+            title='Actividades por Día',
+            xaxis_title='Fecha',
+            yaxis_title='Número de Actividades',
+            height=400,
+            margin=dict(l=50, r=50, t=50, b=50)
+        )
+        
+        assert json.loads(fb.to_json(build_pie())) == json.loads(pie.to_json())
+        assert json.loads(fb.to_json(build_bar())) == json.loads(bar.to_json())
+    
+    def test_template_without_importing_plotly(self):
+        """Test que la plantilla se lee del JSON incluido sin importar plotly"""
+        import subprocess
+        import sys
+        code = ("import sys; from services import figure_builder as fb; "
+                "assert fb.default_template()['layout']; assert 'plotly' not in sys.modules")
+        subprocess.run([sys.executable, '-c', code], check=True)
+    
+    def test_template_version_must_match_installed_plotly(self, monkeypatch):
+        """Test que una plantilla exportada con otra versión de plotly falla al cargarse"""
+        pytest.importorskip('plotly')
+        monkeypatch.setattr(fb, '_templates', {})
+        monkeypatch.setattr(fb.metadata, 'version', lambda name: '0.0.1')
+        with pytest.raises(RuntimeError, match='export_default_template'):
+            fb.default_template()
+        assert 'default' not in fb._templates
@@ -0,0 +1,32 @@
+"""
+Tests para el reporte de tiempos de importación
+"""
+
+from utils.import_report import build_report, parse_importtime
+
+SAMPLE = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:      2000 |       2000 |     plotly.io
+import time:      3000 |       5000 |   plotly
+import time:       500 |        500 | services.chart_service
+"""
+
+
+class TestImportReport:
+    """Tests para utils.import_report"""
+    
+    def test_parse_importtime(self):
+        """Test que se leen los tiempos y la profundidad de cada módulo"""
+        entries = parse_importtime(SAMPLE)
+        
+        assert [entry['module'] for entry in entries] == ['_io', 'plotly.io', 'plotly', 'services.chart_service']
+        assert entries[1]['depth'] == 2
+        assert entries[2]['cumulative_us'] == 5000
+    
+    def test_build_report_groups_packages(self):
+        """Test que el reporte agrupa por paquete y detecta dependencias pesadas"""
+        report = build_report(parse_importtime(SAMPLE), top=2)
+        
+        assert report['total_ms'] == 5.62
+        assert report['top'][0] == {'package': 'plotly', 'ms': 5.0}
+        assert report['heavy_loaded'] == ['plotly']
@@ -0,0 +1,100 @@
+"""
+Tests para el proveedor JSON con orjson y los cuerpos serializados
+"""
+
+import json
+from datetime import date, datetime
+
+import pytest
+
+pytest.importorskip('flask')
+pytest.importorskip('orjson')
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from services.json_provider import FastJSONProvider, dumps_bytes, iter_chunks
+
+
+@pytest.fixture
+def providers():
+    app = Flask(__name__)
+    return app, DefaultJSONProvider(app), FastJSONProvider(app)
+
+
+@pytest.fixture(scope='module')
+def apps(tmp_path_factory):
+    from app_modular import create_app
+    from benchmarks.loadtest import offline_config, write_fixtures
+    config = offline_config(write_fixtures(str(tmp_path_factory.mktemp('fixtures')), activity_rows=80, survey_rows=20))
+
+    class StdlibJSONConfig(config):
+        FAST_JSON = False
+
+    return create_app(config), create_app(StdlibJSONConfig)
+
+
+class TestFastJSONProvider:
+    """Tests de equivalencia con DefaultJSONProvider"""
+
+    def test_same_json_as_default_provider(self, providers):
+        """Test que fechas, claves no str y texto con tildes decodifican igual"""
+        _, default, fast = providers
+        payload = {
+            'b': [1, 2.5, None, True],
+            'a': {'nombre': 'Bogotá', 'cantidad': 3},
+            'por_dia': {1: 'uno', 2: 'dos'},
+            'fecha': datetime(2025, 3, 4, 5, 6, 7),
+            'dia': date(2025, 3, 4)
+        }
+        assert json.loads(fast.dumps(payload)) == json.loads(default.dumps(payload))
+
+    def test_output_is_utf8_and_sorted(self, providers):
+        """Test que las claves salen ordenadas y sin escapar caracteres no ASCII"""
+        _, _, fast = providers
+        body = fast.dumps_bytes({'b': 'ñ', 'a': 1})
+        assert body == '{"a":1,"b":"ñ"}'.encode('utf-8')
+
+    def test_falls_back_to_json_for_unsupported_objects(self, providers):
+        """Test que los enteros fuera de rango de orjson se serializan con json"""
+        _, default, fast = providers
+        payload = {'grande': 2 ** 70}
+        assert json.loads(fast.dumps_bytes(payload)) == json.loads(default.dumps(payload))
+
+    def test_dumps_bytes_with_default_provider(self, providers):
+        """Test que dumps_bytes también sirve con el proveedor por defecto"""
+        _, default, fast = providers
+        payload = {'x': [1, 2], 'y': 'texto'}
+        assert json.loads(dumps_bytes(default, payload)) == json.loads(dumps_bytes(fast, payload))
+
+    def test_iter_chunks_rebuilds_body(self):
+        """Test que los fragmentos son bytes y reconstruyen el cuerpo"""
+        body = bytes(range(256)) * 10
+        chunks = list(iter_chunks(body, chunk_size=300))
+        assert all(isinstance(chunk, bytes) and len(chunk) <= 300 for chunk in chunks)
+        assert b''.join(chunks) == body
+        assert list(iter_chunks(b'')) == []
+
+
+class TestSerializedPayloads:
+    """Tests de los cuerpos de /api/data serializados una vez por versión"""
+
+    @pytest.mark.parametrize('route', ['/api/data', '/api/el-consuelo/data', '/api/el-consuelo/summary'])
+    def test_same_payload_with_and_without_orjson(self, apps, route):
+        """Test que la respuesta decodificada no cambia al usar orjson (salvo la hora de publicación)"""
+        fast, slow = apps
+        assert isinstance(fast.json, FastJSONProvider)
+        fast_payload = json.loads(fast.test_client().get(route).data)
+        slow_payload = json.loads(slow.test_client().get(route).data)
+        fast_payload.pop('last_update', None)
+        slow_payload.pop('last_update', None)
+        assert fast_payload == slow_payload
+
+    def test_body_is_serialized_once_per_version(self, apps):
+        """Test que peticiones repetidas reutilizan el cuerpo con Content-Length"""
+        client = apps[0].test_client()
+        first = client.get('/api/data')
+        second = client.get('/api/data')
+        assert first.data == second.data
+        assert first.headers['Content-Length'] == str(len(first.data))
+        assert client.get('/api/sheets/stats').get_json()['payload_cache']['hits'] >= 1
@@ -0,0 +1,60 @@
+"""
+Tests para la prueba de carga HTTP
+"""
+
+import pytest
+
+from benchmarks.loadtest import compare_reports, percentile, summarize_route
+
+
+class TestLoadTestReport:
+    """Tests para los resúmenes y la comparación de reportes"""
+
+    def test_percentile_nearest_rank(self):
+        """Test del percentil por rango más cercano"""
+        values = list(range(1, 101))
+        assert percentile(values, 50) == 50
+        assert percentile(values, 95) == 95
+        assert percentile(values, 99) == 99
+        assert percentile([7.0], 99) == 7.0
+        assert percentile([], 50) is None
+
+    def test_summarize_route_counts_errors(self):
+        """Test que las respuestas >= 400 y los fallos de conexión cuentan como errores"""
+        samples = [(0.010, 200, 100), (0.020, 304, 0), (0.030, 500, 50), (0.040, 0, 0)]
+        summary = summarize_route(samples, wall_seconds=2.0)
+        assert summary['requests'] == 4
+        assert summary['errors'] == 2
+        assert summary['error_rate'] == 0.5
+        assert summary['throughput_rps'] == 2.0
+        assert summary['p50_ms'] == pytest.approx(20.0)
+        assert summary['max_ms'] == pytest.approx(40.0)
+
+    def test_compare_flags_p95_and_error_regressions(self):
+        """Test que se marca regresión si sube el p95 o la tasa de errores"""
+        baseline = {'routes': {'/a': {'p95_ms': 10.0, 'error_rate': 0.0},
+                               '/b': {'p95_ms': 10.0, 'error_rate': 0.0}}}
+        current = {'routes': {'/a': {'p95_ms': 12.0, 'error_rate': 0.0},
+                              '/b': {'p95_ms': 10.5, 'error_rate': 0.1}}}
+        comparison = {item['route']: item['regression'] for item in compare_reports(baseline, current)}
+        assert comparison == {'/a': True, '/b': True}
+
+
+class TestOfflineLoadTest:
+    """Prueba de carga corta contra la aplicación con fixtures sintéticos"""
+
+    def test_routes_respond_without_errors(self, tmp_path):
+        """Test que todas las rutas responden con la fuente sin conexión"""
+        pytest.importorskip('flask')
+        from benchmarks.loadtest import DEFAULT_ROUTES, AppServer, offline_config, run_load, write_fixtures
+
+        write_fixtures(str(tmp_path), activity_rows=200, survey_rows=50)
+        server = AppServer(offline_config(str(tmp_path))).start()
+        try:
+            result = run_load(server.url, DEFAULT_ROUTES, concurrency=2, requests_per_route=2)
+        finally:
+            server.stop()
+
+        assert set(result['routes']) == set(DEFAULT_ROUTES)
+        assert result['total']['requests'] == 2 * len(DEFAULT_ROUTES)
+        assert result['total']['errors'] == 0
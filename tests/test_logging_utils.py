@@ -0,0 +1,57 @@
+"""
+Tests para la configuración del logging
+"""
+
+import logging
+
+from utils.logging_utils import RateLimitFilter, configure_logging, shutdown_logging
+
+
+def make_record(level=logging.DEBUG, lineno=10, msg='mensaje'):
+    return logging.LogRecord('test', level, 'modulo.py', lineno, msg, None, None)
+
+
+class TestRateLimitFilter:
+    """Tests para RateLimitFilter"""
+
+    def test_limits_repeated_debug_messages(self):
+        """Test que solo pasan `burst` mensajes por ventana y se informa lo omitido"""
+        now = [0.0]
+        rate_filter = RateLimitFilter(burst=2, interval_seconds=60, clock=lambda: now[0])
+
+        passed = [rate_filter.filter(make_record()) for _ in range(5)]
+        assert passed == [True, True, False, False, False]
+        assert rate_filter.suppressed == 3
+
+        now[0] = 61.0
+        record = make_record()
+        assert rate_filter.filter(record)
+        assert record.getMessage() == 'mensaje (3 mensajes similares omitidos)'
+
+    def test_call_sites_and_errors_are_independent(self):
+        """Test que cada línea tiene su propio límite y los errores siempre pasan"""
+        rate_filter = RateLimitFilter(burst=1, interval_seconds=60)
+        assert rate_filter.filter(make_record(lineno=1))
+        assert rate_filter.filter(make_record(lineno=2))
+        assert not rate_filter.filter(make_record(lineno=1))
+        assert all(rate_filter.filter(make_record(level=logging.ERROR)) for _ in range(3))
+
+
+class TestConfigureLogging:
+    """Tests para configure_logging"""
+
+    def test_writes_log_file_from_listener(self, tmp_path):
+        """Test que los registros llegan al archivo a través de la cola"""
+        log_file = tmp_path / 'logs' / 'app.log'
+        root = logging.getLogger()
+        previous_level = root.level
+        try:
+            configure_logging(level='INFO', log_file=str(log_file))
+            configure_logging(level='INFO', log_file=str(log_file))
+            logging.getLogger('tests.logging').info('hola')
+        finally:
+            shutdown_logging()
+            root.setLevel(previous_level)
+
+        content = log_file.read_text(encoding='utf-8')
+        assert content.count('tests.logging - INFO - hola') == 1
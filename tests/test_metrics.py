@@ -0,0 +1,68 @@
+"""
+Tests para las métricas de rendimiento
+"""
+
+from services.metrics import MetricsRegistry, server_timing_header
+
+
+class TestMetricsRegistry:
+    """Tests para MetricsRegistry"""
+
+    def test_timed_records_stage_and_request_breakdown(self):
+        """Test que las etapas se registran en el histograma y en la petición en curso"""
+        registry = MetricsRegistry()
+
+        @registry.timed('process')
+        def process(depth):
+            # La llamada anidada a la misma etapa no se cuenta dos veces
+            return process(depth - 1) if depth else 'ok'
+
+        token = registry.begin_request()
+        assert process(2) == 'ok'
+        stages = registry.end_request(token)
+
+        assert list(stages) == ['process']
+        text = registry.render_prometheus()
+        assert 'dashboard_stage_duration_seconds_count{stage="process"} 1' in text
+        assert 'dashboard_stage_duration_seconds_bucket{stage="process",le="+Inf"} 1' in text
+
+        # Fuera de una petición solo se alimenta el histograma
+        process(0)
+        assert 'dashboard_stage_duration_seconds_count{stage="process"} 2' in registry.render_prometheus()
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Test que los buckets acumulan las observaciones menores o iguales al límite"""
+        registry = MetricsRegistry(prefix='app')
+        for size in (100, 2000, 2000, 10 ** 9):
+            registry.observe('response_size_bytes', size, {'endpoint': 'api_data'}, buckets=(1024, 4096))
+
+        text = registry.render_prometheus()
+        assert 'app_response_size_bytes_bucket{endpoint="api_data",le="1024"} 1' in text
+        assert 'app_response_size_bytes_bucket{endpoint="api_data",le="4096"} 3' in text
+        assert 'app_response_size_bytes_bucket{endpoint="api_data",le="+Inf"} 4' in text
+        assert 'app_response_size_bytes_sum{endpoint="api_data"} 1000004100.0' in text
+
+    def test_exports_cache_stats(self):
+        """Test que aciertos y fallos se exportan como counters y el resto como gauges"""
+        registry = MetricsRegistry()
+        registry.register_cache('chart', lambda: {'hits': 3, 'misses': 1, 'entries': 2,
+                                                  'hit_ratio': 0.75, 'name': 'x'})
+
+        text = registry.render_prometheus()
+        assert '# TYPE dashboard_cache_hits_total counter' in text
+        assert 'dashboard_cache_hits_total{cache="chart"} 3' in text
+        assert 'dashboard_cache_misses_total{cache="chart"} 1' in text
+        assert '# TYPE dashboard_cache_hit_ratio gauge' in text
+        assert 'dashboard_cache_hit_ratio{cache="chart"} 0.75' in text
+        assert 'dashboard_cache_entries{cache="chart"} 2' in text
+        assert 'dashboard_cache_hits{' not in text
+        assert 'name' not in text
+
+
+class TestServerTiming:
+    """Tests para server_timing_header"""
+
+    def test_formats_stages_in_milliseconds(self):
+        """Test del formato del encabezado Server-Timing"""
+        header = server_timing_header({'sheets_fetch': 0.25, 'render': 0.0012}, total=0.3)
+        assert header == 'sheets_fetch;dur=250.0, render;dur=1.2, total;dur=300.0'
@@ -0,0 +1,118 @@
+"""
+Tests para las consultas paginadas de /api/data
+"""
+
+from datetime import datetime
+
+import pytest
+
+from services.data_service import DataService
+from services.query_service import ActivityIndex, parse_query_args
+
+
+class QueryArgs(dict):
+    """Sustituto mínimo de request.args con valores repetibles"""
+
+    def get(self, key, default=None):
+        values = super().get(key)
+        return values[0] if values else default
+
+    def getlist(self, key):
+        return list(super().get(key, []))
+
+
+def make_index():
+    entidades = ['Alcaldía', ' IDRD ', 'alcaldía', 'Policía']
+    rows = [
+        {
+            'Entidad': entidades[i % len(entidades)],
+            'Actividad': f'Actividad {i}',
+            'Fecha final de ejecución ': f'2025-0{1 + i % 6}-15',
+            'Población impactada': str(i)
+        }
+        for i in range(24)
+    ]
+    return ActivityIndex(DataService().process_raw_data(rows)), rows
+
+
+class TestActivityIndex:
+    """Tests para ActivityIndex"""
+    
+    def test_pagination_and_cursor(self):
+        """Test que las páginas cubren todos los registros con cursor"""
+        index, rows = make_index()
+        
+        first = index.query(offset=0, limit=10)
+        assert first['total'] == 24
+        assert first['data'] == rows[:10]
+        assert first['next_cursor'] == '10'
+        
+        last = index.query(offset=20, limit=10)
+        assert last['data'] == rows[20:]
+        assert last['next_cursor'] is None
+    
+    def test_entity_filter_ignores_case_and_spaces(self):
+        """Test de filtro por entidad"""
+        index, rows = make_index()
+        
+        result = index.query(entidades=['ALCALDÍA'])
+        assert result['total'] == 12
+        assert all(row['Entidad'].strip().lower() == 'alcaldía' for row in result['data'])
+    
+    def test_date_range_and_projection(self):
+        """Test de rango de fechas combinado con proyección de columnas"""
+        index, rows = make_index()
+        
+        result = index.query(fields=['Actividad', 'Fecha final de ejecución'],
+                             date_from=datetime(2025, 2, 1), date_to=datetime(2025, 3, 15),
+                             entidades=['idrd'])
+        expected = [row for row in rows
+                    if row['Entidad'] == ' IDRD ' and row['Fecha final de ejecución '][5:7] in ('02', '03')]
+        assert result['total'] == len(expected)
+        assert result['columns_order'] == ['Actividad', 'Fecha final de ejecución ']
+        assert [row['Actividad'] for row in result['data']] == [row['Actividad'] for row in expected]
+        
+        with pytest.raises(ValueError):
+            index.query(fields=['No existe'])
+    
+    def test_date_to_includes_the_whole_day(self):
+        """Test que fecha_hasta incluye las filas de ese día que tienen hora"""
+        rows = [
+            {'Entidad': 'IDRD', 'Actividad': 'Mañana', 'Fecha final de ejecución': '2025-03-15 09:30:00',
+             'Población impactada': '1'},
+            {'Entidad': 'IDRD', 'Actividad': 'Día', 'Fecha final de ejecución': '2025-03-15',
+             'Población impactada': '1'},
+            {'Entidad': 'IDRD', 'Actividad': 'Siguiente', 'Fecha final de ejecución': '2025-03-16 00:00:00',
+             'Población impactada': '1'},
+        ]
+        index = ActivityIndex(DataService().process_raw_data(rows))
+        query = parse_query_args(QueryArgs(fecha_desde=['2025-03-15'], fecha_hasta=['2025-03-15']))
+        
+        result = index.query(**query)
+        assert sorted(row['Actividad'] for row in result['data']) == ['Día', 'Mañana']
+
+
+class TestParseQueryArgs:
+    """Tests para parse_query_args"""
+    
+    def test_no_params_keeps_full_response(self):
+        """Test que sin parámetros no hay consulta"""
+        assert parse_query_args(QueryArgs()) is None
+    
+    def test_page_and_filters(self):
+        """Test de conversión de página, campos y fechas"""
+        args = QueryArgs(page=['3'], page_size=['5000'], fields=['Entidad, Actividad'],
+                         entidad=['IDRD', 'Policía'], fecha_desde=['2025-01-01'])
+        query = parse_query_args(args, max_page_size=50)
+        
+        assert (query['offset'], query['limit']) == (100, 50)
+        assert query['fields'] == ['Entidad', ' Actividad']
+        assert query['entidades'] == ['IDRD', 'Policía']
+        assert query['date_from'] == datetime(2025, 1, 1)
+    
+    def test_invalid_values(self):
+        """Test de parámetros inválidos"""
+        with pytest.raises(ValueError):
+            parse_query_args(QueryArgs(page=['0']))
+        with pytest.raises(ValueError):
+            parse_query_args(QueryArgs(fecha_hasta=['ayer']))
@@ -0,0 +1,64 @@
+"""
+Tests para el programador de actualización de hojas
+"""
+
+from services.delta_sync import DeltaSync
+from services.refresh_scheduler import RefreshScheduler, SheetJob
+
+
+def make_rows(*entidades):
+    return [{'Entidad': entidad, 'Actividad': 'Jornada', 'Fecha final de ejecución': '2025-03-12',
+             'Población impactada': '10'} for entidad in entidades]
+
+
+class TestPublish:
+    """Tests para RefreshScheduler.publish"""
+
+    def test_stateful_processor_is_not_memoized(self):
+        """Test que al volver a datos anteriores DeltaSync vuelve a sincronizar (A→B→A)"""
+        scheduler = RefreshScheduler()
+        sync = DeltaSync()
+        scheduler.add_job(SheetJob('actividades', 'hoja', lambda: None, 300,
+                                   processor=sync.sync, cache_results=False))
+        first, second = make_rows('A', 'B'), make_rows('A', 'B', 'C')
+
+        scheduler.publish('actividades', first)
+        scheduler.publish('actividades', second)
+        back = scheduler.publish('actividades', make_rows('A', 'B'))
+
+        assert back.processed['version'] == sync.version == 3
+        assert back.processed['changes'] == {'appended': 0, 'modified': 0, 'deleted': 1}
+
+    def test_stateless_processor_is_memoized_by_content(self):
+        """Test que un procesador sin estado se ejecuta una vez por contenido"""
+        scheduler = RefreshScheduler()
+        calls = []
+        scheduler.add_job(SheetJob('actividades', 'hoja', lambda: None, 300,
+                                   processor=lambda rows: calls.append(len(rows)) or len(rows)))
+        for rows in (make_rows('A'), make_rows('A', 'B'), make_rows('A')):
+            scheduler.publish('actividades', rows)
+        assert calls == [1, 2]
+
+
+class TestRefreshEndpoint:
+    """Tests para /api/refresh"""
+
+    def test_failed_refresh_returns_502_and_keeps_snapshot(self, tmp_path):
+        """Test que un refresco fallido responde 502 y se siguen sirviendo los datos anteriores"""
+        import os
+        import pytest
+        pytest.importorskip('flask')
+        from app_modular import create_app
+        from benchmarks.loadtest import offline_config, write_fixtures
+        from services.google_sheets_service import DEFAULT_SHEET_ID
+
+        app = create_app(offline_config(write_fixtures(str(tmp_path), activity_rows=20, survey_rows=5)))
+        client = app.test_client()
+        assert client.get('/api/refresh').get_json()['success'] is True
+        assert 'convenio_302' not in app.extensions['refresh_scheduler'].status()
+
+        os.remove(tmp_path / f'{DEFAULT_SHEET_ID}.json')
+        response = client.get('/api/refresh')
+        assert response.status_code == 502
+        assert response.get_json()['success'] is False
+        assert len(client.get('/api/data').get_json()['data']) == 20
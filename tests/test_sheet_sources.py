@@ -0,0 +1,109 @@
+"""
+Tests para las fuentes de valores de las hojas y el servidor de fixtures
+"""
+
+import pytest
+
+from services.google_sheets_service import GoogleSheetsConnector
+from services.sheet_sources import (
+    HttpValuesSource,
+    RecordedSource,
+    create_sheet_source,
+    save_recorded_values
+)
+from services.sheets_fixture_server import SheetsFixtureServer, trim_values
+
+VALUES = [
+    ['Entidad', 'Actividad', 'Población impactada'],
+    ['IDRD', 'Jornada "deportiva", barrio', '120'],
+    ['UAESP', 'Limpieza', ''],
+]
+
+
+class TestRecordedSource:
+    """Tests para RecordedSource"""
+
+    @pytest.mark.parametrize('fmt', ['json', 'csv'])
+    def test_replays_recorded_values(self, tmp_path, fmt):
+        """Test que los valores grabados se reproducen tal cual"""
+        path = save_recorded_values(str(tmp_path), 'hoja', VALUES, fmt)
+        assert path.endswith(f'hoja.{fmt}')
+        source = RecordedSource(str(tmp_path))
+        assert source.get_all_values('hoja') == VALUES
+        assert source.get_all_values('otra') is None
+
+    def test_replays_parquet(self, tmp_path):
+        """Test de snapshots grabados en Parquet"""
+        pytest.importorskip('pyarrow')
+        save_recorded_values(str(tmp_path), 'hoja', VALUES, 'parquet')
+        assert RecordedSource(str(tmp_path)).get_all_values('hoja') == VALUES
+
+    def test_connector_reads_from_source(self, tmp_path):
+        """Test que el conector arma las filas desde la fuente configurada"""
+        save_recorded_values(str(tmp_path), 'hoja', VALUES)
+        connector = GoogleSheetsConnector(source=RecordedSource(str(tmp_path)), cache_ttl=60)
+        data, headers = connector.get_sheet_data('hoja')
+        assert headers == VALUES[0]
+        assert data[1] == {'Entidad': 'UAESP', 'Actividad': 'Limpieza', 'Población impactada': ''}
+        assert connector.get_data('falta') == []
+
+
+class TestSheetsFixtureServer:
+    """Tests para el servidor local de la API de valores"""
+
+    def test_http_source_round_trip(self, tmp_path):
+        """Test que la fuente HTTP obtiene los valores del servidor local"""
+        save_recorded_values(str(tmp_path), 'hoja', VALUES)
+        server = SheetsFixtureServer(RecordedSource(str(tmp_path))).start()
+        try:
+            source = HttpValuesSource(server.url)
+            # La API omite las celdas vacías finales; SheetTable las completa
+            assert source.get_all_values('hoja') == trim_values(VALUES)
+            assert source.get_all_values('otra') is None
+
+            connector = GoogleSheetsConnector(source=source, cache_ttl=60)
+            data, _ = connector.get_sheet_data('hoja')
+            assert data[1]['Población impactada'] == ''
+        finally:
+            server.stop()
+
+    def test_trim_values(self):
+        """Test que se quitan celdas y filas vacías al final"""
+        assert trim_values([['a', '', 'b', ''], ['', ''], ['c'], [''], []]) == [['a', '', 'b'], [], ['c']]
+
+
+class TestCreateSheetSource:
+    """Tests para create_sheet_source"""
+
+    def test_source_by_config(self):
+        """Test de la fuente según la configuración"""
+        assert create_sheet_source({'SHEETS_SOURCE': 'google'}) is None
+        assert isinstance(create_sheet_source({'SHEETS_SOURCE': 'recorded', 'SHEETS_FIXTURE_DIR': 'x'}),
+                          RecordedSource)
+        assert isinstance(create_sheet_source({'SHEETS_SOURCE': 'http'}), HttpValuesSource)
+
+
+class TestConnectorRegistry:
+    """Tests de los conectores compartidos al cambiar de fuente"""
+
+    def test_connectors_follow_the_configured_source(self, tmp_path):
+        """Test que un conector creado con otra fuente no se reutiliza"""
+        from services.connector_registry import ConnectorRegistry
+
+        first, second = tmp_path / 'a', tmp_path / 'b'
+        save_recorded_values(str(first), 'hoja', VALUES)
+        save_recorded_values(str(second), 'hoja', VALUES[:2])
+        registry = ConnectorRegistry(token_refresh_interval=0)
+
+        registry.configure(sheet_source=RecordedSource(str(first)))
+        old = registry.get(cache_ttl=60)
+        assert len(old.get_data('hoja')) == 2
+
+        source = RecordedSource(str(second))
+        registry.configure(sheet_source=source)
+        new = registry.get(cache_ttl=60)
+        assert new is not old and new.source is source
+        assert len(new.get_data('hoja')) == 1
+        assert registry.connectors() == [new]
+        # Una fuente explícita tiene su propio conector
+        assert registry.get(cache_ttl=60, sheet_source=old.source) is not new
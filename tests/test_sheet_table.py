@@ -0,0 +1,52 @@
+"""
+Tests para la representación columnar de hojas
+"""
+
+from services.sheet_table import SheetTable
+
+
+def legacy_records(all_values):
+    """Construcción original de registros: un diccionario por fila"""
+    headers = all_values[0]
+    data = []
+    for row in all_values[1:]:
+        row = list(row) + [''] * (len(headers) - len(row))
+        data.append(dict(zip(headers, row)))
+    return data
+
+
+class TestSheetTable:
+    """Tests para SheetTable y su vista de filas"""
+    
+    values = [
+        ['Entidad', 'Actividad', 'Población impactada'],
+        ['Alcaldía', 'Jornada', '20'],
+        ['IDRD', 'Taller'],
+        ['Alcaldía', 'Recorrido', '5', 'columna extra']
+    ]
+    
+    def test_rows_match_legacy_dicts(self):
+        """Test que la vista de filas coincide con los diccionarios originales"""
+        table = SheetTable.from_values(self.values)
+        rows = table.rows()
+        
+        assert len(rows) == 3
+        assert rows == legacy_records(self.values)
+        assert rows[1] == {'Entidad': 'IDRD', 'Actividad': 'Taller', 'Población impactada': ''}
+        assert rows[0:2] == legacy_records(self.values)[0:2]
+        assert table.to_records() == legacy_records(self.values)
+    
+    def test_column_access_and_value_counts(self):
+        """Test de acceso por columna y conteo de valores"""
+        table = SheetTable.from_values(self.values)
+        
+        assert table.column('Entidad') == ['Alcaldía', 'IDRD', 'Alcaldía']
+        assert table.column('No existe') == []
+        assert table.value_counts('Entidad') == {'Alcaldía': 2, 'IDRD': 1}
+        assert table.value_counts('Población impactada', stop=2) == {'20': 1}
+    
+    def test_serializable_roundtrip(self):
+        """Test que la forma serializable reconstruye la misma tabla"""
+        table = SheetTable.from_values(self.values)
+        
+        assert SheetTable.from_dict(table.to_dict()) == table
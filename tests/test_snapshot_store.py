@@ -0,0 +1,113 @@
+"""
+Tests para los almacenes de snapshots compartidos
+"""
+
+import time
+
+import pytest
+
+from services.snapshot_store import (
+    LocalFileSnapshotStore,
+    RedisSnapshotStore,
+    SnapshotStore,
+    build_snapshot
+)
+from services.sheet_table import SheetTable
+
+
+class LocalRedisStandIn:
+    """Sustituto local con el subconjunto de comandos de Redis que se usa"""
+    
+    def __init__(self):
+        self.values = {}
+        self.expires = {}
+    
+    def _expire(self, key):
+        if key in self.expires and time.time() >= self.expires[key]:
+            self.values.pop(key, None)
+            self.expires.pop(key, None)
+    
+    def get(self, key):
+        self._expire(key)
+        value = self.values.get(key)
+        return value.encode('utf-8') if isinstance(value, str) else value
+    
+    def set(self, key, value, nx=False, px=None):
+        self._expire(key)
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        if px is not None:
+            self.expires[key] = time.time() + px / 1000
+        return True
+    
+    def delete(self, key):
+        self.values.pop(key, None)
+        self.expires.pop(key, None)
+
+
+class TestSnapshotStore:
+    """Tests para la interfaz SnapshotStore"""
+    
+    def test_incomplete_store_cannot_be_created(self):
+        """Test que un almacén sin todos los métodos de la interfaz no se puede instanciar"""
+        class LoadOnlyStore(SnapshotStore):
+            def load(self, key):
+                return None
+        
+        with pytest.raises(TypeError):
+            LoadOnlyStore()
+
+
+class TestLocalFileSnapshotStore:
+    """Tests para el almacén en archivos locales"""
+    
+    def test_save_and_load_roundtrip(self, tmp_path):
+        """Test que un snapshot guardado se lee desde otro proceso/instancia"""
+        writer = LocalFileSnapshotStore(str(tmp_path))
+        reader = LocalFileSnapshotStore(str(tmp_path))
+        snapshot = build_snapshot(SheetTable(['Entidad'], [['Alcaldía']]))
+        
+        writer.save('hoja', snapshot)
+        
+        assert reader.load('hoja') == snapshot
+        writer.delete('hoja')
+        assert reader.load('hoja') is None
+    
+    def test_only_one_worker_gets_the_refresh_lock(self, tmp_path):
+        """Test que el candado de actualización es exclusivo entre workers"""
+        worker_a = LocalFileSnapshotStore(str(tmp_path))
+        worker_b = LocalFileSnapshotStore(str(tmp_path))
+        
+        assert worker_a.acquire_refresh_lock('hoja', ttl_seconds=60) is True
+        assert worker_b.acquire_refresh_lock('hoja', ttl_seconds=60) is False
+        worker_a.release_refresh_lock('hoja')
+        assert worker_b.acquire_refresh_lock('hoja', ttl_seconds=60) is True
+    
+    def test_expired_lock_can_be_taken_over(self, tmp_path):
+        """Test que un candado abandonado se recupera al vencer"""
+        worker_a = LocalFileSnapshotStore(str(tmp_path))
+        worker_b = LocalFileSnapshotStore(str(tmp_path))
+        
+        assert worker_a.acquire_refresh_lock('hoja', ttl_seconds=0) is True
+        assert worker_b.acquire_refresh_lock('hoja', ttl_seconds=0) is True
+
+
+class TestRedisSnapshotStore:
+    """Tests para el almacén con protocolo Redis"""
+    
+    def test_save_load_and_lock(self):
+        """Test de snapshot y candado compartidos sobre el sustituto local"""
+        server = LocalRedisStandIn()
+        worker_a = RedisSnapshotStore(client=server)
+        worker_b = RedisSnapshotStore(client=server)
+        snapshot = build_snapshot(SheetTable(['Entidad'], [['IDRD']]))
+        
+        assert worker_a.acquire_refresh_lock('hoja', ttl_seconds=60) is True
+        assert worker_b.acquire_refresh_lock('hoja', ttl_seconds=60) is False
+        worker_a.save('hoja', snapshot)
+        worker_a.release_refresh_lock('hoja')
+        
+        assert worker_b.load('hoja') == snapshot
+        assert worker_b.wait_for('hoja', timeout=0) == snapshot
+        assert worker_b.acquire_refresh_lock('hoja', ttl_seconds=60) is True
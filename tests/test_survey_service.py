@@ -0,0 +1,100 @@
+"""
+Tests para la agregación declarativa de encuestas
+"""
+
+from services.sheet_table import SheetTable
+from services.survey_service import (
+    EL_CONSUELO_SURVEY,
+    SurveyAggregator,
+    SurveyQuestion,
+    build_el_consuelo_summary,
+    el_consuelo_aggregator,
+    rating_or_no_response
+)
+
+LIMPIEZA = 'Como calificaria la limpieza general del barrio'
+RESIDUOS = '¿Con qué frecuencia observa residuos en las calles o zonas comunes?'
+
+
+def make_rows(n):
+    respuestas = ['1', '5', ' 3 ', 'NS/NR', '', '4']
+    frecuencias = ['Siempre', 'Nunca', '', 'A veces']
+    return [
+        {
+            'Sexo': 'Mujer' if i % 3 else 'Hombre',
+            LIMPIEZA: respuestas[i % len(respuestas)],
+            RESIDUOS: frecuencias[i % len(frecuencias)]
+        }
+        for i in range(n)
+    ]
+
+
+def legacy_counts(raw_data):
+    """Conteos como los calculaba la ruta original de El Consuelo"""
+    limpieza_counts = {}
+    for row in raw_data[0:442]:
+        valor = row.get(LIMPIEZA, '').strip()
+        if valor in ['1', '2', '3', '4', '5']:
+            limpieza_counts[valor] = limpieza_counts.get(valor, 0) + 1
+        elif valor:
+            limpieza_counts['No responde'] = limpieza_counts.get('No responde', 0) + 1
+    residuos_counts = {}
+    for row in raw_data[0:442]:
+        valor = row.get(RESIDUOS, '').strip()
+        if valor:
+            residuos_counts[valor] = residuos_counts.get(valor, 0) + 1
+    sexo_counts = {}
+    for row in raw_data:
+        sexo = row.get('Sexo', '').strip()
+        if sexo:
+            sexo_counts[sexo] = sexo_counts.get(sexo, 0) + 1
+    return limpieza_counts, residuos_counts, sexo_counts
+
+
+class TestSurveyAggregator:
+    """Tests para SurveyAggregator"""
+    
+    def test_rating_normalizer(self):
+        """Test de la regla 1–5 / 'No responde'"""
+        assert rating_or_no_response('3') == '3'
+        assert rating_or_no_response('NS/NR') == 'No responde'
+    
+    def test_matches_legacy_loops_for_records_and_tables(self):
+        """Test que los conteos coinciden con los ciclos originales sobre listas y tablas"""
+        rows = make_rows(500)
+        expected = legacy_counts(rows)
+        
+        for data in (rows, SheetTable.from_records(rows).rows()):
+            summary = el_consuelo_aggregator.aggregate(data)
+            assert summary['num_encuestas'] == 500
+            assert (summary['limpieza_counts'], summary['residuos_counts'], summary['sexo_counts']) == expected
+            assert summary['seguridad_counts'] == {}
+    
+    def test_spec_covers_all_template_counts(self):
+        """Test que la especificación produce todos los conteos de la plantilla"""
+        names = {question.name for question in EL_CONSUELO_SURVEY}
+        
+        assert len(names) == len(EL_CONSUELO_SURVEY) == 21
+        assert {'limpieza_counts', 'tiempo_counts', 'tiempo_puntos_counts'} <= names
+    
+    def test_row_range_is_respected(self):
+        """Test que solo se cuentan las filas dentro del rango configurado"""
+        aggregator = SurveyAggregator([SurveyQuestion('sexo_counts', 'Sexo', start=1, stop=3)])
+        rows = [{'Sexo': 'Hombre'}, {'Sexo': 'Mujer'}, {'Sexo': 'Mujer'}, {'Sexo': 'Hombre'}]
+        
+        assert aggregator.aggregate(rows)['sexo_counts'] == {'Mujer': 2}
+    
+    def test_summary_chart_counts_cover_all_rows(self):
+        """Test que los conteos de las gráficas usan todas las filas sin normalizar"""
+        rows = make_rows(500)
+        summary = build_el_consuelo_summary(SheetTable.from_records(rows).rows())
+        
+        expected = {}
+        for row in rows:
+            valor = row[LIMPIEZA].strip()
+            if valor:
+                expected[valor] = expected.get(valor, 0) + 1
+        assert summary['charts'][LIMPIEZA] == expected
+        assert summary['charts']['Nivel educativo'] == {}
+        assert 'num_encuestas' not in summary['charts']
+        assert summary['limpieza_counts'] == legacy_counts(rows)[0]
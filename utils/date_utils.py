@@ -3,12 +3,73 @@ Utilidades para manejo de fechas
 """
 
 from datetime import datetime, date
+from functools import lru_cache
 import re
 
+# Formatos aceptados, en orden de prioridad
+DATE_FORMATS = [
+    '%Y-%m-%d',      # 2025-03-12
+    '%d/%m/%Y',      # 12/03/2025
+    '%m/%d/%Y',      # 03/12/2025
+    '%Y-%m-%d %H:%M:%S',  # 2025-03-12 14:30:00
+    '%d-%m-%Y',      # 12-03-2025
+]
+
+# Mismas expresiones que usa datetime.strptime para cada directiva
+_DIRECTIVES = {
+    'Y': r'(?P<Y>\d\d\d\d)',
+    'm': r'(?P<m>1[0-2]|0[1-9]|[1-9])',
+    'd': r'(?P<d>3[01]|[12]\d|0[1-9]|[1-9]| [1-9])',
+    'H': r'(?P<H>2[0-3]|[0-1]\d|\d)',
+    'M': r'(?P<M>[0-5]\d|\d)',
+    'S': r'(?P<S>6[0-1]|[0-5]\d|\d)',
+}
+
+# Tamaño máximo del caché de fechas ya parseadas
+DATE_CACHE_SIZE = 4096
+
+
+def _compile_format(fmt):
+    """Traduce un formato de strptime a una expresión regular precompilada"""
+    def translate(match):
+        directive, space, literal = match.groups()
+        if directive:
+            return _DIRECTIVES[directive]
+        if space:
+            return r'\s+'
+        return re.escape(literal)
+    return re.compile(re.sub(r'%(\w)|(\s+)|(.)', translate, fmt), re.IGNORECASE)
+
+
+_COMPILED_FORMATS = [_compile_format(fmt) for fmt in DATE_FORMATS]
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def _parse_date_cached(date_string):
+    for pattern in _COMPILED_FORMATS:
+        match = pattern.fullmatch(date_string)
+        if match is None:
+            continue
+        parts = match.groupdict()
+        try:
+            return datetime(
+                int(parts['Y']), int(parts['m']), int(parts['d']),
+                int(parts.get('H') or 0), int(parts.get('M') or 0), int(parts.get('S') or 0)
+            )
+        except ValueError:
+            # Fecha inexistente (p. ej. 31/02): probar el siguiente formato
+            continue
+    return None
+
+
 def parse_date(date_string):
     """
     Parsea una fecha en formato string a objeto datetime
     
+    Cada formato se revisa con una expresión precompilada (sin excepciones
+    por formato) y los resultados se memorizan, porque las columnas de las
+    hojas repiten las mismas fechas.
+    
     Args:
         date_string (str): Fecha en formato string
         
@@ -17,23 +78,44 @@ def parse_date(date_string):
     """
     if not date_string or date_string == 'None' or date_string == '':
         return None
+    if not isinstance(date_string, str):
+        # Mismo error que datetime.strptime con valores no textuales
+        return datetime.strptime(date_string, DATE_FORMATS[0])
     
-    # Intentar diferentes formatos de fecha
-    formats = [
-        '%Y-%m-%d',      # 2025-03-12
-        '%d/%m/%Y',      # 12/03/2025
-        '%m/%d/%Y',      # 03/12/2025
-        '%Y-%m-%d %H:%M:%S',  # 2025-03-12 14:30:00
-        '%d-%m-%Y',      # 12-03-2025
-    ]
+    return _parse_date_cached(date_string)
+
+def parse_dates(date_strings):
+    """
+    Parsea una secuencia de fechas
     
-    for fmt in formats:
+    Args:
+        date_strings: Iterable de fechas en formato string
+        
+    Returns:
+        list: Objetos datetime (o None) en el mismo orden
+    """
+    parsed = {}
+    result = []
+    for date_string in date_strings:
         try:
-            return datetime.strptime(date_string, fmt)
-        except ValueError:
-            continue
+            date_obj = parsed[date_string]
+        except KeyError:
+            date_obj = parsed[date_string] = parse_date(date_string)
+        except TypeError:
+            # Valores no hashables
+            date_obj = parse_date(date_string)
+        result.append(date_obj)
+    return result
+
+def date_cache_info():
+    """
+    Estadísticas del caché de fechas parseadas
     
-    return None
+    Returns:
+        dict: Aciertos, fallos y tamaño actual del caché
+    """
+    info = _parse_date_cached.cache_info()
+    return {'hits': info.hits, 'misses': info.misses, 'size': info.currsize, 'max_size': info.maxsize}
 
 def is_valid_date(date_string):
     """
@@ -102,4 +184,150 @@ def is_date_in_range(date_obj, start_date, end_date):
     if not all([date_obj, start_date, end_date]):
         return False
     
-    return start_date <= date_obj <= end_date 
\ No newline at end of file
+    return start_date <= date_obj <= end_date 
+
+# Mapeo de meses en español (nombre completo y abreviatura)
+MESES_ES = {
+    'enero': 1, 'febrero': 2, 'marzo': 3, 'abril': 4, 'mayo': 5, 'junio': 6,
+    'julio': 7, 'agosto': 8, 'septiembre': 9, 'octubre': 10, 'noviembre': 11, 'diciembre': 12,
+    'ene': 1, 'feb': 2, 'mar': 3, 'abr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'ago': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dic': 12
+}
+
+# Formatos de strptime que se intentan cuando ninguna regla coincide
+NORMALIZE_FALLBACK_FORMATS = [
+    '%d/%m/%Y', '%d-%m-%Y', '%Y/%m/%d', '%Y-%m-%d',
+    '%d/%m/%y', '%d-%m-%y',
+    '%d %B %Y', '%d %b %Y', '%B %d, %Y', '%b %d, %Y',
+    '%d.%m.%Y', '%d.%m.%y', '%Y.%m.%d'
+]
+
+
+def _iso(year, month, day):
+    return f"{year}-{int(month):02d}-{int(day):02d}"
+
+
+def _split_parts(date_str, order):
+    """Fecha cuyas partes se separan con '/' (o '-' si no hay '/'), en el orden indicado"""
+    separator = '/' if '/' in date_str else '-'
+    day_month_year = date_str.split(separator)
+    if len(day_month_year) != 3:
+        raise ValueError(f"Separadores mezclados en '{date_str}'")
+    parts = dict(zip(order, day_month_year))
+    return _iso(parts['y'], parts['m'], parts['d'])
+
+
+def _spanish_month(match):
+    """Regla para fechas con el nombre del mes en español; None si el mes no existe"""
+    parts = match.groupdict()
+    month = MESES_ES.get(parts['month'].lower())
+    if month is None:
+        return None
+    return f"{parts['year']}-{month:02d}-{int(parts['day']):02d}"
+
+
+def _two_digit_year(match):
+    day, month, year = match.groups()
+    # Asumir años 20xx para años de 2 dígitos
+    full_year = f"20{year}" if int(year) < 50 else f"19{year}"
+    return _iso(full_year, month, day)
+
+
+_LETTERS = '[a-zA-Záéíóúñ]+'
+
+# Reglas en orden: (nombre, patrón precompilado, función que arma la fecha ISO)
+DATE_NORMALIZATION_RULES = [
+    ('iso', re.compile(r'^\d{4}-\d{2}-\d{2}$'),
+     lambda date_str, match: date_str),
+    ('dd/mm/yyyy', re.compile(r'^\d{1,2}[/-]\d{1,2}[/-]\d{4}$'),
+     lambda date_str, match: _split_parts(date_str, 'dmy')),
+    ('yyyy/mm/dd', re.compile(r'^\d{4}[/-]\d{1,2}[/-]\d{1,2}$'),
+     lambda date_str, match: _split_parts(date_str, 'ymd')),
+    ('dd de mes de yyyy', re.compile(rf'^(?P<day>\d{{1,2}})\s+de\s+(?P<month>{_LETTERS})\s+de\s+(?P<year>\d{{4}})$', re.IGNORECASE),
+     lambda date_str, match: _spanish_month(match)),
+    ('mes dd, yyyy', re.compile(rf'^(?P<month>{_LETTERS})\s+(?P<day>\d{{1,2}}),\s*(?P<year>\d{{4}})$', re.IGNORECASE),
+     lambda date_str, match: _spanish_month(match)),
+    ('dd mes yyyy', re.compile(rf'^(?P<day>\d{{1,2}})\s+(?P<month>{_LETTERS})\s+(?P<year>\d{{4}})$', re.IGNORECASE),
+     lambda date_str, match: _spanish_month(match)),
+    ('dd/mm/yy', re.compile(r'^(\d{1,2})/(\d{1,2})/(\d{2})$'),
+     lambda date_str, match: _two_digit_year(match)),
+    ('dd.mm.yyyy', re.compile(r'^(\d{1,2})\.(\d{1,2})\.(\d{4})$'),
+     lambda date_str, match: _iso(match.group(3), match.group(2), match.group(1))),
+    ('dd / mm / yyyy', re.compile(r'^(\d{1,2})\s*/\s*(\d{1,2})\s*/\s*(\d{4})$'),
+     lambda date_str, match: _iso(match.group(3), match.group(2), match.group(1))),
+]
+
+
+class DateNormalizer:
+    """
+    Normaliza fechas en los formatos comunes de las hojas a ISO (YYYY-MM-DD)
+    
+    Recorre una tabla de reglas con patrones precompilados; la primera regla
+    cuyo patrón coincide decide el resultado. Si ninguna coincide se intentan
+    los formatos de strptime. Cuenta cuántas fechas resolvió cada regla y
+    memoriza los resultados de textos repetidos.
+    """
+    
+    def __init__(self, cache_size=DATE_CACHE_SIZE):
+        self.counters = {}
+        self._normalize_cached = lru_cache(maxsize=cache_size)(self._normalize_text)
+    
+    @staticmethod
+    def _normalize_text(date_str):
+        """Retorna (nombre de la regla, fecha ISO o None) para un texto sin espacios extremos"""
+        try:
+            for name, pattern, build in DATE_NORMALIZATION_RULES:
+                match = pattern.match(date_str)
+                if match is not None:
+                    return name, build(date_str, match)
+            for fmt in NORMALIZE_FALLBACK_FORMATS:
+                try:
+                    return fmt, datetime.strptime(date_str, fmt).strftime('%Y-%m-%d')
+                except ValueError:
+                    continue
+            return 'sin formato', None
+        except Exception:
+            # Partes incompatibles (p. ej. separadores mezclados)
+            return 'error', None
+    
+    def normalize(self, date_str):
+        """
+        Normaliza una fecha a formato ISO
+        
+        Args:
+            date_str: Fecha en cualquiera de los formatos soportados
+            
+        Returns:
+            str: Fecha ISO o None si no se pudo normalizar
+        """
+        if not date_str or str(date_str).strip() == '':
+            return None
+        rule, result = self._normalize_cached(str(date_str).strip())
+        if result is None and rule not in ('sin formato', 'error'):
+            rule = 'mes desconocido'
+        self.counters[rule] = self.counters.get(rule, 0) + 1
+        return result
+    
+    def normalize_column(self, values):
+        """
+        Normaliza una columna completa en una sola pasada
+        
+        Args:
+            values: Iterable de fechas
+            
+        Returns:
+            list: Fechas ISO (o None) en el mismo orden
+        """
+        normalize = self.normalize
+        return [normalize(value) for value in values]
+    
+    def stats(self):
+        """Fechas resueltas por cada regla desde el último reinicio"""
+        return dict(self.counters)
+    
+    def reset_counters(self):
+        """Reinicia los contadores por regla"""
+        self.counters = {}
+
+
+date_normalizer = DateNormalizer()
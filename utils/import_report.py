@@ -0,0 +1,104 @@
+"""
+Reporte del tiempo de importación de los módulos de la aplicación
+
+Ejecuta `python -X importtime` en un intérprete nuevo y resume qué paquetes
+pesan más en el arranque de un worker.
+"""
+
+import subprocess
+import sys
+from typing import Dict, List, Optional
+
+# Dependencias pesadas que no deberían cargarse al arrancar un worker
+HEAVY_MODULES = ('plotly', 'pandas', 'numpy')
+
+
+def parse_importtime(output: str) -> List[Dict]:
+    """
+    Interpreta la salida de `-X importtime`
+
+    Args:
+        output: Texto de stderr con líneas 'import time: self | cumulative | módulo'
+
+    Returns:
+        Lista de dicts con 'module', 'self_us', 'cumulative_us' y 'depth'
+    """
+    entries = []
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3:
+            continue
+        try:
+            self_us = int(parts[0])
+            cumulative_us = int(parts[1])
+        except ValueError:
+            # Encabezado de la tabla
+            continue
+        name = parts[2].rstrip()
+        module = name.lstrip()
+        entries.append({
+            'module': module,
+            'self_us': self_us,
+            'cumulative_us': cumulative_us,
+            'depth': (len(name) - len(module)) // 2
+        })
+    return entries
+
+
+def build_report(entries: List[Dict], top: int = 15) -> Dict:
+    """
+    Resume las entradas de importación
+
+    Returns:
+        Dict con 'total_ms', 'top' (paquetes de primer nivel más lentos) y
+        'heavy_loaded' (dependencias pesadas cargadas al arrancar)
+    """
+    total_us = sum(entry['self_us'] for entry in entries)
+    packages: Dict[str, int] = {}
+    for entry in entries:
+        package = entry['module'].split('.')[0]
+        packages[package] = packages.get(package, 0) + entry['self_us']
+    ranked = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]
+    loaded = {entry['module'].split('.')[0] for entry in entries}
+    return {
+        'total_ms': total_us / 1000,
+        'top': [{'package': name, 'ms': us / 1000} for name, us in ranked],
+        'heavy_loaded': [name for name in HEAVY_MODULES if name in loaded]
+    }
+
+
+def run_import_report(target: str = 'app_modular', top: int = 15,
+                      python: Optional[str] = None) -> Dict:
+    """
+    Importa `target` en un intérprete nuevo con -X importtime y resume el resultado
+    """
+    completed = subprocess.run(
+        [python or sys.executable, '-X', 'importtime', '-c', f'import {target}'],
+        capture_output=True,
+        text=True
+    )
+    report = build_report(parse_importtime(completed.stderr), top=top)
+    report['target'] = target
+    report['ok'] = completed.returncode == 0
+    if not report['ok']:
+        report['error'] = completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else ''
+    return report
+
+
+def format_report(report: Dict) -> str:
+    """Texto legible del reporte para la consola"""
+    lines = [f"Importación de '{report['target']}': {report['total_ms']:.1f} ms"]
+    if not report.get('ok', True):
+        lines.append(f"  Error al importar: {report.get('error', '')}")
+    for item in report['top']:
+        lines.append(f"  {item['ms']:9.1f} ms  {item['package']}")
+    heavy = report['heavy_loaded']
+    lines.append(f"Dependencias pesadas cargadas: {', '.join(heavy) if heavy else 'ninguna'}")
+    return '\n'.join(lines)
+
+
+if __name__ == '__main__':
+    target = sys.argv[1] if len(sys.argv) > 1 else 'app_modular'
+    print(format_report(run_import_report(target)))
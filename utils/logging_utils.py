@@ -0,0 +1,125 @@
+"""
+Configuración del logging de la aplicación
+
+Los registros se encolan en el hilo de la petición (QueueHandler) y un hilo
+aparte (QueueListener) los escribe en logs/app.log y en la consola. Los
+mensajes repetidos de depuración se limitan por punto de llamada.
+"""
+
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional, Tuple
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[QueueHandler] = None
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Limita los mensajes repetidos de un mismo punto de llamada
+
+    Por cada (logger, nivel, archivo, línea) deja pasar `burst` registros por
+    ventana de `interval_seconds`; el resto se descarta y se cuenta. El primer
+    registro de la ventana siguiente indica cuántos se omitieron. Solo se
+    limitan los niveles hasta `max_level` (DEBUG por defecto): advertencias y
+    errores siempre pasan.
+    """
+
+    def __init__(self, burst: int = 5, interval_seconds: float = 60, max_level: int = logging.DEBUG,
+                 clock=time.monotonic):
+        super().__init__()
+        self.burst = burst
+        self.interval_seconds = interval_seconds
+        self.max_level = max_level
+        self._clock = clock
+        self._windows: Dict[Tuple, list] = {}
+        self._lock = threading.Lock()
+        self.suppressed = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > self.max_level or self.burst <= 0:
+            return True
+        key = (record.name, record.levelno, record.pathname, record.lineno)
+        now = self._clock()
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= self.interval_seconds:
+                omitted = window[2] if window is not None else 0
+                self._windows[key] = [now, 1, 0]
+                if omitted:
+                    record.msg = f"{record.getMessage()} ({omitted} mensajes similares omitidos)"
+                    record.args = None
+                return True
+            if window[1] < self.burst:
+                window[1] += 1
+                return True
+            window[2] += 1
+            self.suppressed += 1
+            return False
+
+
+def configure_logging(level='INFO', log_file: Optional[str] = 'logs/app.log',
+                      rate_limit_burst: int = 5, rate_limit_seconds: float = 60) -> QueueListener:
+    """
+    Configura el logger raíz con escritura asíncrona
+
+    Si se llama de nuevo (p. ej. al crear otra aplicación) se detiene el
+    listener anterior y se reemplaza su handler.
+
+    Args:
+        level: Nivel del logger raíz (nombre o número)
+        log_file: Archivo de log; None para escribir solo en consola
+        rate_limit_burst: Mensajes de depuración por punto de llamada y ventana
+        rate_limit_seconds: Duración de la ventana del límite
+
+    Returns:
+        QueueListener: Listener en ejecución
+    """
+    global _listener, _queue_handler
+
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers = [logging.StreamHandler()]
+    if log_file:
+        directory = os.path.dirname(log_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        handlers.append(logging.FileHandler(log_file, encoding='utf-8'))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.addFilter(RateLimitFilter(rate_limit_burst, rate_limit_seconds))
+
+    root = logging.getLogger()
+    shutdown_logging()
+    root.addHandler(queue_handler)
+    root.setLevel(level.upper() if isinstance(level, str) else level)
+
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    _listener, _queue_handler = listener, queue_handler
+    return listener
+
+
+def shutdown_logging():
+    """Vacía la cola, detiene el listener y cierra sus handlers"""
+    global _listener, _queue_handler
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(shutdown_logging)